@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import deque
+
+from Stats import percentile
+
+try:
+    from config import ASSISTANT_SESSION_IDLE_TIMEOUT, ASSISTANT_MAX_SESSIONS
+except ImportError:
+    ASSISTANT_SESSION_IDLE_TIMEOUT, ASSISTANT_MAX_SESSIONS = 3600, 16
+
+DEFAULT_SESSION = "default"
+
+# The driver locks the command running on this thread holds, released when it ends.
+_scope = threading.local()
+
+
+class SharedDriver:
+    """One browser driver shared by every session, driven by one command at a time.
+
+    A command takes the driver's lock the first time it touches the driver,
+    whatever lane it runs in, and holds it until ``driver_scope`` ends, so
+    two sessions never interleave their clicks and page loads. Outside a
+    scope (startup, the server quitting the browser) calls go straight
+    through.
+    """
+    def __init__(self, driver):
+        self.__dict__["_driver"] = driver
+        self.__dict__["_lock"] = threading.RLock()
+    def __getattr__(self, name):
+        held = getattr(_scope, "held", None)
+        if held is not None and self._lock not in held:
+            self._lock.acquire()
+            held.append(self._lock)
+        return getattr(self._driver, name)
+    def __setattr__(self, name, value):
+        setattr(self._driver, name, value)
+
+
+def share_driver(driver):
+    return SharedDriver(driver) if driver is not None and not isinstance(driver, SharedDriver) else driver
+
+
+class driver_scope:
+    # A command: driver locks taken inside are held to the end; nested scopes join the outer one.
+    def __enter__(self):
+        self._outer = getattr(_scope, "held", None) is not None
+        if not self._outer:
+            _scope.held = []
+        return self
+    def __exit__(self, *exc):
+        if not self._outer:
+            held, _scope.held = _scope.held, None
+            for lock in reversed(held):
+                lock.release()
+        return False
+
+
+class AssistantSession:
+    """One warm SmartAssistant and the state it carries between commands.
+
+    The classifier, Gemini client, application controller and browser
+    automation are built once, and the app context and pending
+    confirmations survive from one command to the next. Commands in a
+    session run one at a time, whichever lane they were sent to, so
+    commands only run in parallel across sessions; ``lock_waits`` shows
+    how long they queue behind each other here. ``bind`` points the
+    assistant at the current browser driver and rebuilds the browser layer
+    only when the driver has been recreated.
+    """
+    def __init__(self, session_id, assistant):
+        self.session_id = session_id
+        self.assistant = assistant
+        self.lock = threading.RLock()
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.commands = 0
+        self.driver_rebinds = 0
+        self.lock_waits = deque(maxlen=200)
+    def bind(self, driver, system_controller=None):
+        with self.lock:
+            if system_controller is not None:
+                self.assistant.system_controller = system_controller
+            if self.assistant.bind_driver(driver):
+                self.driver_rebinds += 1
+        return self
+    def process(self, transcription):
+        with self.lock, driver_scope():
+            self.last_used = time.time()
+            self.commands += 1
+            return self.assistant.process_command(transcription)
+    def execute(self, transcription):
+        # process() plus what the command was understood as, read before another command can run.
+        waiting = time.perf_counter()
+        with self.lock:
+            self.lock_waits.append(time.perf_counter() - waiting)
+            success, message = self.process(transcription)
+            return success, message, self.assistant.last_action, self.assistant.last_parser
+    def state(self):
+        assistant = self.assistant
+        return {
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            "last_used": self.last_used,
+            "commands": self.commands,
+            "driver_rebinds": self.driver_rebinds,
+            "lock_wait_p95_ms": percentile(list(self.lock_waits), 95) * 1000,
+            "browser_bound": assistant.browser is not None,
+            "gemini_available": assistant.gemini_available,
+            "context": assistant.context_manager.get_context_info(),
+            "pending_confirmation": assistant.confirmation_manager.has_pending(),
+            "last_action": assistant.last_action,
+        }
+
+
+class SessionRegistry:
+    """Owns the warm assistants, one per session id, created on first use.
+
+    Sessions unused for ``idle_timeout`` seconds are dropped, and past
+    ``max_sessions`` the least recently used goes first.
+    """
+    def __init__(self, factory=None, idle_timeout=ASSISTANT_SESSION_IDLE_TIMEOUT, max_sessions=ASSISTANT_MAX_SESSIONS):
+        self._factory = factory
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.counts = {"created": 0, "expired": 0, "evicted": 0, "closed": 0}
+    def _create(self, driver, system_controller):
+        if self._factory is not None:
+            return self._factory(driver, system_controller)
+        from SmartAssistant import SmartAssistant
+        return SmartAssistant(driver, system_controller)
+    def get(self, session_id=DEFAULT_SESSION, driver=None, system_controller=None):
+        # Building an assistant takes a while, so it happens outside the registry lock.
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+        if session is not None:
+            return session.bind(driver, system_controller)
+        created = AssistantSession(session_id, self._create(driver, system_controller))
+        with self._lock:
+            session = self._sessions.setdefault(session_id, created)
+            if session is created:
+                self.counts["created"] += 1
+                while len(self._sessions) > self.max_sessions:
+                    oldest = min(self._sessions.values(), key=lambda s: s.last_used)
+                    del self._sessions[oldest.session_id]
+                    self.counts["evicted"] += 1
+        return session.bind(driver, system_controller)
+    def peek(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
+    def close(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self.counts["closed"] += 1
+        return session is not None
+    def rebind_driver(self, driver):
+        # After the browser is closed or replaced; sessions in use pick it up on their next command.
+        for session in self.sessions():
+            if session.lock.acquire(blocking=False):
+                try:
+                    session.bind(driver)
+                finally:
+                    session.lock.release()
+    def sessions(self):
+        with self._lock:
+            return list(self._sessions.values())
+    def _expire(self):
+        if not self.idle_timeout:
+            return
+        cutoff = time.time() - self.idle_timeout
+        for session_id, session in list(self._sessions.items()):
+            if session.last_used < cutoff:
+                del self._sessions[session_id]
+                self.counts["expired"] += 1
+    def stats(self):
+        with self._lock:
+            return dict(self.counts, active=len(self._sessions), max_sessions=self.max_sessions,
+                        idle_timeout=self.idle_timeout)
+
+
+assistant_sessions = SessionRegistry()
@@ -0,0 +1,81 @@
+import tracemalloc
+
+import numpy as np
+
+from bench_utils import time_per_item, print_header
+from STT.AudioBuffer import AudioRingBuffer
+
+FS = 16000
+BLOCKSIZE = 1024
+PRE_ROLL_BLOCKS = int(3 * FS / BLOCKSIZE)
+
+
+def legacy_capture(blocks, speech):
+    """Previous loop bookkeeping: per-block copy, list pre-roll with pop(0),
+    list copy at onset, and np.concatenate at the endpoint."""
+    buffer, speech_buffer, speaking, utterances = [], [], False, 0
+    for block, is_speech in zip(blocks, speech):
+        block = block.copy()
+        buffer.append(block)
+        if len(buffer) > PRE_ROLL_BLOCKS:
+            buffer.pop(0)
+        if is_speech and not speaking:
+            speaking, speech_buffer = True, buffer.copy()
+        elif speaking and is_speech:
+            speech_buffer.append(block)
+        elif speaking:
+            speech_buffer.append(block)
+            speaking = False
+            utterances += len(np.concatenate(speech_buffer, axis=0).flatten())
+            speech_buffer = []
+    return utterances
+
+
+def ring_capture(blocks, speech, ring):
+    speaking, utterances = False, 0
+    for block, is_speech in zip(blocks, speech):
+        ring.write(block.reshape(-1))
+        if is_speech and not speaking:
+            speaking = True
+            ring.start_capture(PRE_ROLL_BLOCKS * BLOCKSIZE)
+        elif speaking and not is_speech:
+            speaking = False
+            utterances += len(ring.stop_capture())
+    return utterances
+
+
+def main():
+    rng = np.random.default_rng(0)
+    seconds = 120
+    count = seconds * FS // BLOCKSIZE
+    blocks = [rng.standard_normal((BLOCKSIZE, 1)).astype(np.float32) * 0.01 for _ in range(count)]
+    # Four seconds of speech followed by six of silence, repeating.
+    period = int(10 * FS / BLOCKSIZE)
+    speech = [(i % period) < int(4 * FS / BLOCKSIZE) for i in range(count)]
+    ring = AudioRingBuffer((PRE_ROLL_BLOCKS + int(30 * FS / BLOCKSIZE)) * BLOCKSIZE)
+
+    assert legacy_capture(blocks, speech) == ring_capture(blocks, speech, ring)
+    legacy_cost = time_per_item(lambda _: legacy_capture(blocks, speech), [None]) / count
+    ring_cost = time_per_item(lambda _: ring_capture(blocks, speech, ring), [None]) / count
+
+    peaks = {}
+    for label, fn in (("legacy", lambda: legacy_capture(blocks, speech)),
+                      ("ring", lambda: ring_capture(blocks, speech, ring))):
+        tracemalloc.start()
+        fn()
+        peaks[label] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print_header("AUDIO CAPTURE BUFFER BENCHMARK")
+    print(f"Stream: {seconds}s, {count} blocks of {BLOCKSIZE} samples, 3s pre-roll, 4s utterances\n")
+    print(f"{'Path':<12}{'µs / block':>12}{'peak alloc KiB':>18}")
+    print("-"*42)
+    print(f"{'legacy':<12}{legacy_cost * 1e6:>12.2f}{peaks['legacy'] / 1024:>18.1f}")
+    print(f"{'ring':<12}{ring_cost * 1e6:>12.2f}{peaks['ring'] / 1024:>18.1f}")
+    print(f"\nSpeedup: {legacy_cost / ring_cost:.1f}x (ring storage is preallocated: "
+          f"{ring._data.nbytes / 1024:.0f} KiB)")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import time
+
+from bench_utils import load_corpus, print_header
+from gemini_stub import start_stub
+import GeminiAPI
+from GeminiAPI import GeminiAssistant
+from CircuitBreaker import CircuitBreaker
+
+# Every call should reach the stub and wait for it; the other Gemini benchmarks
+# measure the cache and the speculative budget.
+GeminiAPI.PARSE_CACHE_ENABLED = False
+GeminiAPI.SPECULATIVE_PARSE = False
+
+
+class FixedTimeoutAssistant(GeminiAssistant):
+    """The previous transport: every call waits up to its full timeout."""
+    def _post(self, payload, timeout, kind="command"):
+        return self.session.post(self.api_url, headers=self.headers, data=self._encode(payload), timeout=timeout)
+
+
+def phase(assistant, commands):
+    latencies = []
+    for command in commands:
+        started = time.perf_counter()
+        assistant.parse_command_to_json(command)
+        latencies.append(time.perf_counter() - started)
+    return sum(latencies), max(latencies)
+
+
+def scenario(assistant, server, commands, args):
+    results = []
+    server.latency, server.status = args.latency, 200
+    results.append(("healthy", *phase(assistant, commands[:args.healthy])))
+    server.latency = args.hang
+    results.append(("Gemini hangs", *phase(assistant, commands[:args.outage])))
+    server.latency, server.status = args.latency, 503
+    results.append(("Gemini 503s", *phase(assistant, commands[:args.outage])))
+    server.status = 200
+    time.sleep(args.reset)
+    results.append(("recovered", *phase(assistant, commands[:args.healthy])))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command latency through a Gemini outage, with and without the breaker")
+    parser.add_argument("--latency", type=float, default=0.2, help="healthy seconds per request")
+    parser.add_argument("--hang", type=float, default=12.0, help="seconds a hung request takes (timeout is 10)")
+    parser.add_argument("--healthy", type=int, default=25)
+    parser.add_argument("--outage", type=int, default=6)
+    parser.add_argument("--reset", type=float, default=3.0, help="breaker reset timeout for the run")
+    args = parser.parse_args()
+
+    commands = load_corpus()
+    server, base_url = start_stub(connect_delay=0.0)
+    GeminiAPI.gemini_breaker = breaker = CircuitBreaker("Gemini", reset_timeout=args.reset)
+    rows = {}
+    for label, assistant in (("fixed timeout", FixedTimeoutAssistant(api_base=base_url)),
+                             ("breaker", GeminiAssistant(api_base=base_url))):
+        rows[label] = scenario(assistant, server, commands, args)
+
+    print_header("GEMINI CIRCUIT BREAKER BENCHMARK (local stub)")
+    print(f"Healthy {args.latency * 1000:.0f} ms per request; outage of {args.outage} commands each "
+          f"(hung {args.hang:.0f} s, then HTTP 503); breaker reset {args.reset:.0f} s\n")
+    print(f"{'Phase':<16}{'fixed total s':>15}{'fixed max s':>13}{'breaker total s':>17}{'breaker max s':>15}")
+    print("-"*76)
+    for (name, fixed_total, fixed_max), (_, total, worst) in zip(rows["fixed timeout"], rows["breaker"]):
+        print(f"{name:<16}{fixed_total:>15.2f}{fixed_max:>13.2f}{total:>17.2f}{worst:>15.2f}")
+    stats = breaker.stats()
+    print(f"\nBreaker: opened {stats['opened']}x, {stats['short_circuited']} calls short-circuited, "
+          f"state now {stats['state']}; adaptive command timeout "
+          f"{breaker.timeout('command', 10):.1f} s (p95 {stats['latency']['command']['p95_ms']:.0f} ms)")
+    print("="*70 + "\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
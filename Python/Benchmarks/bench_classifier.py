@@ -0,0 +1,120 @@
+import re
+
+from bench_utils import load_corpus, time_per_item, print_header
+from CommandClassifier import CommandClassifier, CommandType
+
+
+class LegacyClassifier(CommandClassifier):
+    """Reference for the old hot path: each pattern string goes through
+    ``re.search`` on every call and the contextual scorers loop over plain
+    keyword lists. Used for the timing baseline and to check the compiled
+    classifier returns identical results."""
+    def classify(self, text):
+        text = text.lower().strip()
+        scores = {
+            CommandType.SYSTEM: self._legacy_patterns(text, self.system_patterns) + self._legacy_system(text),
+            CommandType.WEB: self._legacy_patterns(text, self.web_patterns) + self._legacy_web(text),
+            CommandType.CONVERSATION: self._legacy_patterns(text, self.conversation_patterns) + self._legacy_conversation(text),
+        }
+        max_score = max(scores.values())
+        if max_score < 1.0:
+            return CommandType.CONVERSATION, 0.5, "Ambiguous input, defaulting to conversation"
+        command_type = max(scores, key=scores.get)
+        return command_type, min(max_score / 5.0, 1.0), self._get_reasoning(text, command_type, scores)
+    def _legacy_patterns(self, text, patterns):
+        return sum(1 for pattern in patterns if re.search(pattern, text, re.IGNORECASE))
+    def _legacy_system(self, text):
+        if text.startswith(('search ', 'google ', 'find ', 'lookup ', 'look up ')):
+            return -10
+        score = 3 if text.startswith(('open ', 'launch ', 'start ', 'run ', 'execute ', 'close ', 'quit ')) else 0
+        score += sum(2 for app in ['chrome', 'firefox', 'brave', 'edge', 'safari', 'notepad',
+                                   'calculator', 'terminal', 'cmd', 'settings', 'explorer',
+                                   'finder', 'spotify', 'discord', 'steam', 'vlc', 'code', 'vscode',
+                                   'visual', 'studio', 'tool', 'app', 'application'] if app in text)
+        score += sum(1 for k in ['file', 'folder', 'directory', 'volume', 'brightness',
+                                 'screenshot', 'taskbar', 'desktop', 'window'] if k in text)
+        score += sum(10 for i in ['on computer', 'in computer', 'on pc', 'in pc',
+                                  'on system', 'in system', 'from system', 'on my computer', 'on this computer',
+                                  'my pc', 'this pc', 'on laptop', 'in laptop',
+                                  'computer me', 'pc me', 'system me', 'system se', 'mere computer',
+                                  'meri pc', 'is computer'] if i in text)
+        return score
+    def _legacy_web(self, text):
+        score = 10 if text.startswith(('search ', 'google ', 'find ', 'lookup ', 'look up ')) else 0
+        if re.search(r'\b(search|find|lookup|google)\s+(for|about|on)\s+', text):
+            score += 8
+        has_question_word = False
+        for word in ['what', 'who', 'when', 'where', 'why', 'how',
+                     'kya', 'kaun', 'kab', 'kahan', 'kaise', 'kyun']:
+            if word in text.split():
+                score += 1.5
+                has_question_word = True
+        score += sum(1 for w in ['information', 'details', 'about', 'regarding',
+                                 'jankari', 'bare mein', 'ke bare'] if w in text)
+        if re.search(r'\.(com|org|net|in|co)', text):
+            score += 3
+        score += sum(5 for i in ['google', 'search on internet', 'search online',
+                                 'internet pe', 'web pe', 'online search',
+                                 'google karo', 'internet par'] if i in text)
+        if len(text.split()) <= 2 and not has_question_word:
+            score -= 5
+        score -= sum(8 for i in ['thank', 'thanks', 'bye', 'hello', 'hi', 'sorry',
+                                 'ok', 'okay', 'watching', 'listening'] if i in text)
+        score -= sum(10 for c in ['on computer', 'in computer', 'computer me', 'pc me',
+                                  'system me', 'from system', 'system se', 'on my pc', 'my computer'] if c in text)
+        return score
+    def _legacy_conversation(self, text):
+        score = 2 if len(text.split()) <= 3 else 0
+        score += sum(5 for i in ['thank you', 'thanks', 'thank', 'thankyou', 'thx',
+                                 'bye', 'goodbye', 'see you', 'take care',
+                                 'hello', 'hi', 'hey', 'sorry', 'apologies',
+                                 'ok', 'okay', 'alright', 'sure', 'got it',
+                                 'wow', 'cool', 'nice', 'great'] if i in text)
+        if any(w in text for w in ['watching', 'listening', 'viewing']):
+            if not any(q in text for q in ['what', 'who', 'when', 'where', 'why', 'how']):
+                score += 5
+        score += sum(2 for p in ['you', 'your', 'yourself', 'tum', 'tumhara', 'aap', 'aapka'] if p in text.split())
+        score += sum(1 for w in ['please', 'kindly', 'kripa', 'meherbani'] if w in text)
+        if text.endswith(('!', '.')):
+            score += 1
+        return score
+
+
+def main():
+    corpus = load_corpus()
+    legacy = LegacyClassifier()
+    compiled = CommandClassifier()
+    tables = compiled._tables
+
+    mismatches = [text for text in corpus if legacy.classify(text) != compiled.classify(text)]
+
+    def classify_cold(text):
+        tables.results.clear()
+        compiled.classify(text)
+
+    legacy_cost = time_per_item(legacy.classify, corpus)
+    cold_cost = time_per_item(classify_cold, corpus)
+    compiled.classify(corpus[0])
+    replay_cost = time_per_item(compiled.classify, corpus)
+
+    print_header("COMMAND CLASSIFIER BENCHMARK")
+    print(f"Corpus: {len(corpus)} utterances ({len(set(corpus))} unique)")
+    print(f"Result mismatches vs legacy: {len(mismatches)}")
+    for text in mismatches:
+        print(f"  ✗ {text}")
+    print(f"\n{'Path':<34}{'µs / utterance':>16}{'speedup':>12}")
+    print("-"*62)
+    for label, cost in [
+        ("legacy (re.search per pattern)", legacy_cost),
+        ("compiled, cold (no result cache)", cold_cost),
+        ("compiled, replay (warm LRU)", replay_cost),
+    ]:
+        print(f"{label:<34}{cost * 1e6:>16.1f}{legacy_cost / cost:>11.1f}x")
+    print(f"\nResult: {legacy_cost / cold_cost:.1f}x faster per new utterance (cold path); "
+          f"the warm LRU only helps repeats")
+    print("="*70 + "\n")
+    return not mismatches
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Load test: /status latency while /command requests are in flight.
+
+Start the API server first (python api_server.py), then:
+
+    python bench_command_load.py
+    python bench_command_load.py --concurrency 16 --rounds 4
+    python bench_command_load.py --command "what is the capital of france"
+
+/status is probed on its own, then again while ``concurrency`` clients
+keep posting commands. With commands on the lane executor the two should
+look alike; when a command blocks the event loop, /status waits for it.
+The default commands are questions, answered by Gemini, so nothing is
+opened or clicked on this machine.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bench_utils import percentile, print_header
+
+QUESTIONS = [
+    "what is the capital of france",
+    "how far away is the moon",
+    "who wrote pride and prejudice",
+    "what is the boiling point of water",
+]
+
+
+def probe_status(base_url, stop=None, count=None, interval=0.02):
+    latencies = []
+    session = requests.Session()
+    while (stop is None or not stop.is_set()) and (count is None or len(latencies) < count):
+        started = time.perf_counter()
+        session.get(f"{base_url}/status", timeout=30).raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        time.sleep(interval)
+    return latencies
+
+
+def post_commands(base_url, commands, session_id):
+    session = requests.Session()
+    results = []
+    for command in commands:
+        started = time.perf_counter()
+        response = session.post(f"{base_url}/command", json={"command": command, "session_id": session_id},
+                                timeout=120)
+        body = response.json()
+        results.append((time.perf_counter() - started, body.get("success"), body.get("message", "")))
+    return results
+
+
+def summary(latencies):
+    return (f"p50 {percentile(latencies, 50) * 1000:7.1f} ms   p95 {percentile(latencies, 95) * 1000:7.1f} ms   "
+            f"max {max(latencies) * 1000:7.1f} ms   ({len(latencies)} probes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/status latency under /command load")
+    parser.add_argument("--url", default="http://localhost:8000", help="API server base URL")
+    parser.add_argument("--concurrency", type=int, default=8, help="clients posting commands at once")
+    parser.add_argument("--rounds", type=int, default=2, help="commands each client posts")
+    parser.add_argument("--command", action="append", help="command to post (repeatable); default: questions")
+    args = parser.parse_args()
+    commands = args.command or QUESTIONS
+
+    idle = probe_status(args.url, count=50)
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=args.concurrency + 1) as pool:
+        loaded_future = pool.submit(probe_status, args.url, stop)
+        started = time.perf_counter()
+        clients = [pool.submit(post_commands, args.url,
+                               [commands[(client + i) % len(commands)] for i in range(args.rounds)],
+                               f"load-{client}")
+                   for client in range(args.concurrency)]
+        results = [result for client in clients for result in client.result()]
+        elapsed = time.perf_counter() - started
+        stop.set()
+        loaded = loaded_future.result()
+    command_latencies = [latency for latency, _, _ in results]
+    busy = [message for _, success, message in results if not success and message.startswith("Busy")]
+
+    print_header("/status LATENCY UNDER /command LOAD")
+    print(f"Server: {args.url}   clients: {args.concurrency}   commands: {len(results)} in {elapsed:.1f} s")
+    print(f"\n/status idle:       {summary(idle)}")
+    print(f"/status under load: {summary(loaded)}")
+    print(f"/command:           {summary(command_latencies).replace('probes', 'commands')}")
+    print(f"Commands succeeded: {sum(1 for _, success, _ in results if success)}/{len(results)}"
+          f"   turned away busy: {len(busy)}")
+    ratio = percentile(loaded, 95) / max(percentile(idle, 95), 1e-9)
+    print(f"\n/status p95 under load is {ratio:.1f}x idle")
+    print("="*70 + "\n")
+    return ratio
+
+
+if __name__ == "__main__":
+    main()
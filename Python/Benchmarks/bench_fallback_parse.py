@@ -0,0 +1,62 @@
+from bench_utils import load_corpus, time_per_item, print_header
+from FallbackParser import FallbackParser, FALLBACK_RULES
+from TextNormalizer import preprocess_command
+
+# Commands with a known right answer, on top of the indexed-vs-linear comparison.
+EXPECTED = [
+    ("youtube pe gaane chalao", {"action": "play_media", "query": "gaane", "platform": "youtube"}),
+    ("spotify pe music bajao", {"action": "play_media", "query": "music", "platform": "spotify"}),
+    ("kesariya bajao", {"action": "play_media", "query": "kesariya", "platform": "youtube"}),
+]
+
+
+class LinearFallbackParser(FallbackParser):
+    """Reference for the old if/elif chain: every rule's keywords are tested
+    with ``in`` and every rule is considered, in order. Same rules and
+    extractors, so results must be identical."""
+    def candidates(self, text):
+        return {keyword for keyword in self.matcher.keywords if keyword in text}, range(len(self.rules))
+
+
+def with_extra_actions(count):
+    # Actions whose keywords never occur, spread through the table.
+    rules = list(FALLBACK_RULES)
+    for index in range(count):
+        rules.insert(index * len(rules) // count, (((f"extraaction{index}",),), None, lambda t, text: None))
+    return rules
+
+
+def main():
+    corpus = load_corpus() + load_corpus("hinglish_commands.txt")
+    pairs = [(text, preprocess_command(text)) for text in corpus]
+    indexed = FallbackParser()
+    linear = LinearFallbackParser()
+
+    mismatches = [text for text, cleaned in pairs if indexed.parse(text, cleaned) != linear.parse(text, cleaned)]
+    tried = sum(len(indexed.candidates(cleaned.lower().strip())[1]) for _, cleaned in pairs) / len(pairs)
+
+    print_header("FALLBACK PARSER DISPATCH BENCHMARK")
+    print(f"Corpus: {len(corpus)} commands, English + Hinglish; {len(indexed.rules)} rules, "
+          f"{len(indexed.matcher.keywords)} trigger keywords")
+    print(f"Result mismatches vs linear scan: {len(mismatches)}")
+    for text in mismatches:
+        print(f"  ✗ {text}")
+    wrong = [(text, expected) for text, expected in EXPECTED
+             if indexed.parse(text, preprocess_command(text)) != expected]
+    print(f"Known answers wrong: {len(wrong)}/{len(EXPECTED)}")
+    for text, expected in wrong:
+        print(f"  ✗ {text}: expected {expected}")
+    print(f"Rules considered per command: {tried:.1f} (linear: {len(indexed.rules)})")
+    print(f"\n{'Extra actions':<16}{'linear µs':>12}{'keyword scan µs':>18}{'speedup':>10}")
+    print("-"*56)
+    for extra in (0, 50, 200, 1000):
+        rules = with_extra_actions(extra) if extra else FALLBACK_RULES
+        costs = [time_per_item(lambda pair: parser.parse(*pair), pairs)
+                 for parser in (LinearFallbackParser(rules), FallbackParser(rules))]
+        print(f"{extra:<16}{costs[0] * 1e6:>12.1f}{costs[1] * 1e6:>18.1f}{costs[0] / costs[1]:>9.1f}x")
+    print("="*70 + "\n")
+    return not mismatches and not wrong
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import json
+import time
+
+import requests
+
+from bench_utils import load_corpus, percentile, print_header
+from gemini_stub import start_stub
+import GeminiAPI
+from GeminiAPI import GeminiAssistant, AsyncGeminiAssistant, HTTPX_AVAILABLE
+
+# Every call should reach the stub; bench_parse_cache.py measures the cache
+# and bench_speculative_parse.py the budget.
+GeminiAPI.PARSE_CACHE_ENABLED = False
+GeminiAPI.SPECULATIVE_PARSE = False
+
+
+class UnpooledGeminiAssistant(GeminiAssistant):
+    """The previous transport: a bare requests.post, new connection per call."""
+    def _post(self, payload, timeout, kind="command"):
+        return requests.post(self.api_url, headers=self.headers, data=json.dumps(payload), timeout=timeout)
+
+
+def time_calls(fn, commands):
+    latencies = []
+    for command in commands:
+        started = time.perf_counter()
+        fn(command)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def time_async(base_url, commands, concurrent):
+    assistant = AsyncGeminiAssistant(api_base=base_url)
+    latencies = []
+
+    async def one(command):
+        started = time.perf_counter()
+        await assistant.parse_command_to_json(command)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    if concurrent:
+        await asyncio.gather(*(one(command) for command in commands))
+    else:
+        for command in commands:
+            await one(command)
+    wall = time.perf_counter() - started
+    await assistant.aclose()
+    return latencies, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini transport latency against a local stub")
+    parser.add_argument("--commands", type=int, default=40)
+    parser.add_argument("--connect-delay", type=float, default=0.05, help="seconds per new connection")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per request")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    commands = [corpus[i % len(corpus)] for i in range(args.commands)]
+    server, base_url = start_stub(connect_delay=args.connect_delay, latency=args.latency)
+
+    rows = []
+    for label, assistant in (("requests.post per call", UnpooledGeminiAssistant(api_base=base_url)),
+                             ("pooled Session", GeminiAssistant(api_base=base_url))):
+        before = server.connections
+        started = time.perf_counter()
+        latencies = time_calls(assistant.parse_command_to_json, commands)
+        rows.append((label, latencies, time.perf_counter() - started, server.connections - before))
+    if HTTPX_AVAILABLE:
+        for label, concurrent in (("httpx async, sequential", False), ("httpx async, gather", True)):
+            before = server.connections
+            latencies, wall = asyncio.run(time_async(base_url, commands, concurrent))
+            rows.append((label, latencies, wall, server.connections - before))
+
+    print_header("GEMINI HTTP TRANSPORT BENCHMARK (local stub)")
+    print(f"{len(commands)} parse_command_to_json calls; stub: {args.connect_delay * 1000:.0f} ms per new "
+          f"connection, {args.latency * 1000:.0f} ms per request\n")
+    print(f"{'Transport':<26}{'p50 ms':>9}{'p95 ms':>9}{'wall s':>9}{'connections':>13}")
+    print("-"*66)
+    for label, latencies, wall, connections in rows:
+        print(f"{label:<26}{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 95) * 1000:>9.1f}"
+              f"{wall:>9.2f}{connections:>13}")
+    print("="*70 + "\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import json
+import time
+
+from bench_utils import load_corpus, percentile, print_header, time_per_item
+from gemini_stub import start_stub
+import GeminiAPI
+from GeminiAPI import GeminiAssistant, command_instruction
+
+# Every call should reach the stub; bench_parse_cache.py measures the cache
+# and bench_speculative_parse.py the budget.
+GeminiAPI.PARSE_CACHE_ENABLED = False
+GeminiAPI.SPECULATIVE_PARSE = False
+
+
+class LegacyPromptAssistant(GeminiAssistant):
+    """The previous request: the full catalogue rebuilt into the user turn on
+    every call, ASCII-escaped JSON, free-text output that needed ```json stripping."""
+    def _encode(self, payload):
+        return json.dumps(payload).encode()
+    def _command_payload(self, text):
+        cleaned_text = self._preprocess_text(text)
+        prompt = command_instruction.__wrapped__("full", self.os_name, self.default_browser)
+        return {
+            "contents": [{"parts": [{"text": f"{prompt}\n\nUser Input: {cleaned_text}\nJSON Output:"}]}],
+            "generationConfig": {"temperature": 0.1, "maxOutputTokens": 100, "topK": 1, "topP": 0.1},
+        }
+
+
+def make(style, base_url):
+    assistant = (LegacyPromptAssistant if style == "legacy" else GeminiAssistant)(api_base=base_url)
+    if style != "legacy":
+        assistant.prompt_style = style
+    return assistant
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command prompt size and latency per prompt style")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per Gemini request")
+    parser.add_argument("--latency-per-kb", type=float, default=0.004, help="prefill seconds per KB of request")
+    args = parser.parse_args()
+
+    commands = load_corpus()
+    server, base_url = start_stub(connect_delay=0.0, latency=args.latency, latency_per_kb=args.latency_per_kb)
+    rows = []
+    for style, label in (("legacy", "legacy inline prompt"), ("full", "full, system instr."),
+                         ("compact", "compact, system instr.")):
+        assistant = make(style, base_url)
+        sizes = [len(assistant._encode(assistant._command_payload(command))) for command in commands]
+        build_us = time_per_item(assistant._command_payload, commands) * 1e6
+        latencies = []
+        for command in commands:
+            started = time.perf_counter()
+            assistant.parse_command_to_json(command)
+            latencies.append(time.perf_counter() - started)
+        rows.append((label, sum(sizes) / len(sizes), build_us, latencies))
+
+    print_header("GEMINI COMMAND PROMPT BENCHMARK (local stub)")
+    print(f"{len(commands)} corpus commands; stub: {args.latency * 1000:.0f} ms per request + "
+          f"{args.latency_per_kb * 1000:.1f} ms per KB of request\n")
+    print(f"{'Prompt':<24}{'bytes':>8}{'~tokens':>9}{'build us':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    print("-"*69)
+    for label, size, build_us, latencies in rows:
+        print(f"{label:<24}{size:>8.0f}{size / 4:>9.0f}{build_us:>10.1f}"
+              f"{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 95) * 1000:>9.1f}")
+    print("\n~tokens is bytes / 4. Build us includes _preprocess_text. The system instruction is")
+    print("identical on every call, so the API's implicit prefix caching can reuse it.")
+    print("="*70 + "\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
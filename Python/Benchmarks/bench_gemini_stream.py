@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import time
+
+from bench_utils import percentile, print_header
+from gemini_stub import start_stub
+from GeminiAPI import GeminiAssistant, AsyncGeminiAssistant, HTTPX_AVAILABLE
+
+
+def time_sync(assistant, prompts, stream):
+    first, total = [], []
+    for prompt in prompts:
+        started = time.perf_counter()
+        seen = []
+        on_chunk = (lambda chunk: seen or seen.append(time.perf_counter() - started)) if stream else None
+        assistant.query(prompt, on_chunk)
+        total.append(time.perf_counter() - started)
+        first.append(seen[0] if seen else total[-1])
+    return first, total
+
+
+async def time_async(base_url, prompts):
+    assistant = AsyncGeminiAssistant(api_base=base_url)
+    first, total = [], []
+    for prompt in prompts:
+        started = time.perf_counter()
+        seen = []
+
+        async def on_chunk(chunk):
+            if not seen:
+                seen.append(time.perf_counter() - started)
+
+        await assistant.query(prompt, on_chunk)
+        total.append(time.perf_counter() - started)
+        first.append(seen[0] if seen else total[-1])
+    await assistant.aclose()
+    return first, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first token, blocking vs streamed Gemini answers")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.4, help="seconds to the first piece")
+    parser.add_argument("--chunk-interval", type=float, default=0.15, help="seconds between pieces")
+    args = parser.parse_args()
+
+    prompts = [f"Answer this question concisely and clearly: question {i}" for i in range(args.queries)]
+    server, base_url = start_stub(connect_delay=0.0, latency=args.latency, chunk_interval=args.chunk_interval)
+    assistant = GeminiAssistant(api_base=base_url)
+    rows = [("blocking query", *time_sync(assistant, prompts, False)),
+            ("streamed (requests)", *time_sync(assistant, prompts, True))]
+    if HTTPX_AVAILABLE:
+        rows.append(("streamed (httpx)", *asyncio.run(time_async(base_url, prompts))))
+
+    print_header("GEMINI ANSWER STREAMING BENCHMARK (local stub)")
+    print(f"{args.queries} answers of 7 pieces; stub: {args.latency * 1000:.0f} ms to the first piece, "
+          f"{args.chunk_interval * 1000:.0f} ms between pieces\n")
+    print(f"{'Mode':<22}{'first text p50':>16}{'first text p95':>16}{'complete p50':>14}")
+    print("-"*68)
+    for label, first, total in rows:
+        print(f"{label:<22}{percentile(first, 50) * 1000:>13.0f} ms{percentile(first, 95) * 1000:>13.0f} ms"
+              f"{percentile(total, 50) * 1000:>11.0f} ms")
+    print("\nFirst text is when the frontend can show (or TTS speak) the start of the answer.")
+    print("="*70 + "\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
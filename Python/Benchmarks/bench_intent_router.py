@@ -0,0 +1,62 @@
+import argparse
+import time
+
+from bench_utils import load_corpus, percentile, print_header
+from gemini_stub import start_stub
+import GeminiAPI
+from GeminiAPI import GeminiAssistant
+from IntentRouter import IntentRouter
+
+# Measure the router alone; bench_parse_cache.py measures the cache
+# and bench_speculative_parse.py the budget.
+GeminiAPI.PARSE_CACHE_ENABLED = False
+GeminiAPI.SPECULATIVE_PARSE = False
+
+
+def run(parse, commands):
+    latencies = []
+    for command in commands:
+        started = time.perf_counter()
+        parse(command)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local-first intent routing against a local Gemini stub")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per Gemini request")
+    args = parser.parse_args()
+
+    commands = load_corpus()
+    reference = GeminiAssistant()
+    server, base_url = start_stub(connect_delay=0.0, latency=args.latency, parse=reference._fallback_parse)
+    assistant = GeminiAssistant(api_base=base_url)
+    router = IntentRouter(enabled=True)
+
+    remote_only = run(assistant.parse_command_to_json, commands)
+    before = server.requests
+    routed = run(lambda command: router.route(command, assistant), commands)
+    requests_sent = server.requests - before
+    stats = router.stats()
+    local_only = [latency for latency, command in zip(routed, commands)
+                  if router.local_parse(command, assistant)[0] is not None]
+
+    print_header("LOCAL-FIRST INTENT ROUTER BENCHMARK (local stub)")
+    print(f"{len(commands)} corpus commands; stub: {args.latency * 1000:.0f} ms per request\n")
+    print(f"{'Mode':<22}{'p50 ms':>9}{'p95 ms':>9}{'total s':>9}{'requests':>10}")
+    print("-"*59)
+    for label, latencies, sent in (("always Gemini", remote_only, len(commands)),
+                                   ("local-first", routed, requests_sent),
+                                   ("  local answers only", local_only, 0)):
+        print(f"{label:<22}{percentile(latencies, 50) * 1000:>9.2f}{percentile(latencies, 95) * 1000:>9.2f}"
+              f"{sum(latencies):>9.2f}{sent:>10}")
+    print(f"\nStayed local: {stats['local']}/{stats['local'] + stats['remote']} "
+          f"({stats['local_fraction']:.0%}) at threshold {stats['threshold']}")
+    print("Local actions: " + ", ".join(f"{action} {count}" for action, count in
+                                         sorted(stats['local_actions'].items(), key=lambda item: -item[1])))
+    print("="*70 + "\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
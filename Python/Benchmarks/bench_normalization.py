@@ -0,0 +1,101 @@
+import re
+
+from bench_utils import load_corpus, time_per_item, print_header
+from GeminiAPI import GeminiAssistant
+
+
+class LegacyNormalizer(GeminiAssistant):
+    """Reference for the old normalisation: pattern strings handed to
+    ``re.sub`` on every call, ten filler patterns run twice in a loop. Used
+    for the timing baseline and to check the compiled pipeline returns
+    identical results."""
+    def _preprocess_text(self, text):
+        cleaned = text
+        if 'research' in cleaned.lower() and ('download' in cleaned.lower() or 'fetch' in cleaned.lower()):
+            if re.search(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', cleaned, flags=re.IGNORECASE):
+                return re.sub(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', '',
+                              cleaned, flags=re.IGNORECASE).strip()
+        browser_search = re.search(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+(go to|search|find|lookup)?\s*(.+)',
+                                   cleaned, flags=re.IGNORECASE)
+        if browser_search:
+            return f"search {browser_search.group(6).strip()}"
+        cleaned = re.sub(r',\s+', ' and ', cleaned, flags=re.IGNORECASE)
+        if ('create' in cleaned.lower() or 'make' in cleaned.lower()) and 'file' in cleaned.lower():
+            cleaned = re.sub(r'^(i\s+want\s+you\s+to|i\s+want|please|can\s+you|could\s+you|would\s+you)\s+', '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'^(hello|hi|hey|good morning|good afternoon|good evening|namaste)\s+', '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'\b(bot|chatbot|assistant|either)\b', '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'\b(what i want you to do is|i want you to|i need you to)\b', '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'\bi would say\b', '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = re.sub(r'^[,\s]+', '', cleaned).strip()
+        return cleaned if len(cleaned) > 2 else text
+    def _regex_parse_command(self, text):
+        removal_patterns = [
+            r'\b(hello|hi|hey|good morning|good afternoon|good evening|namaste|namaskar)\b',
+            r'\b(bot|assistant|either|either assistant|alexa|siri)\b',
+            r'\b(how are you|what\'s up|kaise ho|kya hal hai)\??',
+            r'\b(what i want you to do is|i want you to do is|i want you to|i need you to|i would like you to)\b',
+            r'\b(what i want is|i want to|i need to|i would like to)\b',
+            r'\b(go to a web and|go to the web and|go to web and|on the web|on web)\b',
+            r'\b(go to a|go to the|go to)\b',
+            r'\b(please|kindly|can you|could you|would you|will you|would you please|for me|thank you|thanks|dhanyavaad|shukriya|karo|kijiye)\b',
+            r'^\s*(can|could|would|will|do|does|what|so)\s+',
+            r'\b(just|really|actually|basically|literally|so|what)\b',
+        ]
+        cleaned = text.lower()
+        for _ in range(2):
+            for pattern in removal_patterns:
+                cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'[,?!]+', ' ', cleaned)
+        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = re.sub(r'^(to|and)\s+', '', cleaned)
+        if not re.search(r'^(open|close|start|launch)', cleaned):
+            cleaned = re.sub(r'\b(the|a|an)\b', '', cleaned)
+        cleaned = re.sub(r'\sfor\s+(?=\w+\s*$)', ' ', cleaned)
+        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = re.sub(r'^(to|for|at|in|on)\s+', '', cleaned)
+        if len(cleaned) >= 3 and cleaned != text.lower():
+            return cleaned
+        return text
+
+
+def main():
+    corpus = load_corpus() + load_corpus("hinglish_commands.txt")
+    legacy = LegacyNormalizer()
+    compiled = GeminiAssistant()
+    steps = ("_preprocess_text", "_regex_parse_command")
+
+    mismatches = [(step, text) for step in steps for text in corpus
+                  if getattr(legacy, step)(text) != getattr(compiled, step)(text)]
+
+    def purged(fn):
+        # Call-time compilation once the re module's 512-pattern cache has been churned.
+        def run(text):
+            re.purge()
+            fn(text)
+        return run
+
+    print_header("COMMAND NORMALISATION BENCHMARK")
+    print(f"Corpus: {len(corpus)} commands, English + Hinglish")
+    print(f"Result mismatches vs legacy: {len(mismatches)}")
+    for step, text in mismatches:
+        print(f"  ✗ {step}: {text}")
+    print(f"\n{'Step':<24}{'legacy µs':>11}{'compiled µs':>13}{'speedup':>9}{'legacy, re purged µs':>22}")
+    print("-"*79)
+    for step in steps:
+        legacy_cost = time_per_item(getattr(legacy, step), corpus)
+        compiled_cost = time_per_item(getattr(compiled, step), corpus)
+        purged_cost = time_per_item(purged(getattr(legacy, step)), corpus, repeat=2)
+        print(f"{step:<24}{legacy_cost * 1e6:>11.1f}{compiled_cost * 1e6:>13.1f}"
+              f"{legacy_cost / compiled_cost:>8.1f}x{purged_cost * 1e6:>22.1f}")
+    fallback_cost = time_per_item(compiled._fallback_parse, corpus)
+    fallback_purged = time_per_item(purged(compiled._fallback_parse), corpus, repeat=2)
+    print(f"\n_fallback_parse: {fallback_cost * 1e6:.1f} µs per command, "
+          f"{fallback_purged * 1e6:.1f} µs with re's cache purged before each call")
+    print("(legacy re-compiles every pattern whenever re's 512-entry cache has been churned)")
+    print("="*70 + "\n")
+    return not mismatches
+
+
+if __name__ == "__main__":
+    main()
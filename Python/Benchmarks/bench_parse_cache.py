@@ -0,0 +1,67 @@
+import argparse
+import time
+
+from bench_utils import load_corpus, percentile, print_header
+from gemini_stub import start_stub
+import GeminiAPI
+from GeminiAPI import GeminiAssistant
+from memory import ParseCache
+
+# Measured without the speculative budget; see bench_speculative_parse.py.
+GeminiAPI.SPECULATIVE_PARSE = False
+
+
+class UncachedGeminiAssistant(GeminiAssistant):
+    """The previous behaviour: every command goes to Gemini."""
+    def _cached_command(self, text):
+        return None, None, None
+
+
+def run(assistant, commands):
+    latencies, parses = [], []
+    for command in commands:
+        started = time.perf_counter()
+        parses.append(assistant.parse_command_to_json(command))
+        latencies.append(time.perf_counter() - started)
+    return latencies, parses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command parse cache against a local Gemini stub")
+    parser.add_argument("--passes", type=int, default=2, help="times the corpus is replayed")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per Gemini request")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    commands = corpus * args.passes
+    reference = GeminiAssistant(parse_cache=ParseCache())
+    # The stub answers with the regex parser, so templated answers can be checked against it.
+    server, base_url = start_stub(connect_delay=0.0, latency=args.latency, parse=reference._fallback_parse)
+
+    uncached_latencies, expected = run(UncachedGeminiAssistant(api_base=base_url), commands)
+    cache = ParseCache()
+    before = server.requests
+    cached_latencies, parses = run(GeminiAssistant(api_base=base_url, parse_cache=cache), commands)
+    requests_sent = server.requests - before
+    stats = cache.stats()
+    agree = sum(a == b for a, b in zip(parses, expected))
+
+    print_header("COMMAND PARSE CACHE BENCHMARK (local stub)")
+    print(f"{len(commands)} commands ({len(corpus)} corpus lines x {args.passes} passes); "
+          f"stub: {args.latency * 1000:.0f} ms per request\n")
+    print(f"{'Mode':<12}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}{'total s':>9}{'requests':>10}")
+    print("-"*58)
+    for label, latencies, sent in (("uncached", uncached_latencies, len(commands)),
+                                   ("cached", cached_latencies, requests_sent)):
+        print(f"{label:<12}{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 95) * 1000:>9.1f}"
+              f"{sum(latencies) / len(latencies) * 1000:>9.1f}{sum(latencies):>9.2f}{sent:>10}")
+    print(f"\nHit rate {stats['hit_rate']:.0%}: {stats['hits']} exact, {stats['template_hits']} templated, "
+          f"{stats['misses']} misses; {stats['templates']} templates learned")
+    print(f"Latency saved (hits x mean Gemini latency): {stats['seconds_saved']:.2f} s")
+    print(f"Cached parses matching the uncached answer: {agree}/{len(commands)}")
+    print("="*70 + "\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+import noisereduce as nr
+from scipy import signal
+
+from bench_utils import print_header
+from STT.AudioPreprocessor import AudioPreprocessor, FILTER_SOS
+
+FS = 16000
+BLOCKSIZE = 1024
+
+
+def legacy_preprocess(audio_np, noise_sample):
+    """Previous preprocess_audio: noisereduce over the whole utterance (noise
+    statistics recomputed per call) and both filters designed per call."""
+    audio_np = nr.reduce_noise(y=audio_np, sr=FS, y_noise=noise_sample, stationary=True, prop_decrease=0.8)
+    audio_np = signal.sosfilt(signal.butter(4, 100, 'hp', fs=FS, output='sos'), audio_np)
+    audio_np = signal.sosfilt(signal.butter(3, [300, 3000], 'bp', fs=FS, output='sos'), audio_np)
+    max_val = np.max(np.abs(audio_np))
+    return (audio_np / max_val if max_val > 0 else audio_np).astype(np.float32)
+
+
+def voiced(seconds, rng):
+    t = np.arange(int(seconds * FS)) / FS
+    phase = 2 * np.pi * np.cumsum(140 + 30 * np.sin(2 * np.pi * 0.7 * t)) / FS
+    harmonics = sum(np.sin(k * phase) / k for k in range(1, 12))
+    return (0.1 * harmonics * np.clip(np.sin(2 * np.pi * 3 * t), 0, None)).astype(np.float32)
+
+
+def snr_db(output, clean):
+    # Least-squares scale onto the filtered clean reference, then compare.
+    reference = signal.sosfilt(FILTER_SOS, clean)
+    scale = np.dot(output, reference) / np.dot(output, output)
+    residual = reference - scale * output
+    return 10 * np.log10(np.dot(reference, reference) / np.dot(residual, residual))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    noise = lambda n: (0.02 * rng.standard_normal(n) + 0.01 * np.sin(2 * np.pi * 60 * np.arange(n) / FS)).astype(np.float32)
+    noise_sample = noise(3 * FS)
+    utterances = []
+    for seconds in (1.5, 3.0, 6.0):
+        clean = voiced(seconds, rng)
+        utterances.append((seconds, clean, clean + noise(len(clean))))
+
+    preprocessor = AudioPreprocessor()
+    preprocessor.calibrate(noise_sample)
+
+    print_header("UTTERANCE PREPROCESSING BENCHMARK")
+    print(f"{'Utterance':<11}{'legacy ms':>11}{'stream ms':>11}{'at endpoint':>13}"
+          f"{'filter only':>13}{'legacy':>9}{'stream':>9}")
+    print("-"*77)
+    for seconds, clean, noisy in utterances:
+        started = time.perf_counter()
+        legacy = legacy_preprocess(noisy, noise_sample)
+        legacy_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        preprocessor.begin()
+        for i in range(0, len(noisy), BLOCKSIZE):
+            preprocessor.feed(noisy[i:i + BLOCKSIZE])
+        endpoint = time.perf_counter()
+        streamed = preprocessor.finish()
+        finished = time.perf_counter()
+
+        print(f"{seconds:>6.1f} s   {legacy_ms:>11.1f}{(finished - started) * 1000:>11.1f}"
+              f"{(finished - endpoint) * 1000:>11.2f}ms{snr_db(signal.sosfilt(FILTER_SOS, noisy), clean):>11.1f}dB"
+              f"{snr_db(legacy, clean):>7.1f}dB{snr_db(streamed, clean):>7.1f}dB")
+
+    print("\nSNR columns are against the band-passed clean signal.")
+    print("Stream ms is spread over the utterance as blocks arrive; 'at endpoint' is what")
+    print("remains after the user stops talking. Legacy ms is all paid at the endpoint.")
+    stats = preprocessor.stats()
+    print("\nPer-stage ms per second of audio: " + ", ".join(
+        f"{stage} {ms:.2f}" for stage, ms in stats["stage_ms_per_audio_second"].items()))
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Offline replay of recorded Gemini traffic through SmartAssistant.process_command.
+
+Record once against the live API (needs GEMINI_API_KEY and network):
+
+    python bench_replay.py --record
+
+then replay as often as needed, offline, from the local stub:
+
+    python bench_replay.py                      # recorded latencies
+    python bench_replay.py --latency-scale 0.5  # Gemini twice as fast
+    python bench_replay.py --latency 0.8        # fixed 800 ms per request
+    python bench_replay.py --no-router --no-speculation
+
+Accuracy compares the parse process_command acted on, whichever tier it came
+from, with Gemini's recorded parse of the same command. Without a recording a
+synthetic one is made from the local fallback parser, which measures latency
+but says nothing about accuracy.
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from bench_utils import DATA_DIR, load_corpus, percentile, print_header
+from gemini_stub import start_stub
+import GeminiAPI
+from GeminiAPI import GeminiAssistant, SpeculationLog
+from GeminiReplay import GeminiRecorder, request_key
+from IntentRouter import intent_router
+from memory import ParseCache
+
+RECORDING = DATA_DIR / "gemini_replay.json.gz"
+
+
+def spoken(command):
+    # What process_command hands to the parser.
+    return command.strip().rstrip('.,!?;:')
+
+
+def make_assistant():
+    from SmartAssistant import SmartAssistant
+
+    class ReplayAssistant(SmartAssistant):
+        # Everything else needs a driver or system controller and is a no-op without one;
+        # switching apps would focus real windows.
+        def _execute_switch_app(self, app_name):
+            return True, f"Switched to {app_name} (replay)"
+    return ReplayAssistant()
+
+
+def run_commands(commands, quiet=True):
+    assistant = make_assistant()
+    used = {}
+    route = intent_router.route
+
+    def capturing_route(text, gemini):
+        command_json, source = route(text, gemini)
+        used[text] = (command_json, source)
+        return command_json, source
+
+    intent_router.route = capturing_route
+    latencies = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            for command in commands:
+                started = time.perf_counter()
+                assistant.process_command(command)
+                latencies.append(time.perf_counter() - started)
+    finally:
+        del intent_router.route
+    return assistant, used, latencies
+
+
+def record(path, commands, api_base=None):
+    """Gemini's parse of every command, then whatever process_command asks Gemini for."""
+    GeminiAPI.PARSE_CACHE_ENABLED = False
+    GeminiAPI.SPECULATIVE_PARSE = False
+    if api_base:
+        GeminiAPI.GEMINI_API_BASE = api_base
+    recorder = GeminiAPI.start_recording(path)
+    parser = GeminiAssistant()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for command in commands:
+            parser.parse_command_to_json(spoken(command))
+    run_commands(commands)
+    GeminiAPI.stop_recording()
+    return recorder
+
+
+def _normalized(value):
+    if isinstance(value, dict):
+        return {key: _normalized(item) for key, item in value.items() if item not in (None, "")}
+    if isinstance(value, list):
+        return [_normalized(item) for item in value]
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+
+def reference_parse(recording, parser, command):
+    with contextlib.redirect_stdout(io.StringIO()):
+        entry = recording.get(request_key(parser._command_payload(spoken(command))))
+    if entry is None or entry["status"] != 200 or not entry["reply"]:
+        return None
+    try:
+        return json.loads(entry["reply"])
+    except json.JSONDecodeError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Gemini traffic through SmartAssistant offline")
+    parser.add_argument("--recording", default=str(RECORDING), help="recorded corpus (.json.gz)")
+    parser.add_argument("--record", action="store_true", help="record against the live API instead of replaying")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiply recorded latencies by this")
+    parser.add_argument("--latency", type=float, default=None, help="fixed seconds per request instead of recorded ones")
+    parser.add_argument("--no-router", action="store_true", help="always ask Gemini (no local intent routing)")
+    parser.add_argument("--no-speculation", action="store_true", help="wait for Gemini instead of racing the local parsers")
+    parser.add_argument("--cache", action="store_true", help="use an in-memory parse cache")
+    parser.add_argument("--verbose", action="store_true", help="show the assistant's output")
+    args = parser.parse_args()
+
+    commands = load_corpus() + load_corpus("hinglish_commands.txt")
+    path = DATA_DIR / args.recording if not args.recording.startswith("/") else args.recording
+    if args.record:
+        recorder = record(path, commands)
+        print(f"Recorded {len(recorder)} exchanges to {path}")
+        return True
+
+    synthetic = None
+    try:
+        recording = GeminiRecorder.load(path)
+    except FileNotFoundError:
+        print(f"No recording at {path}; run with --record. Using a synthetic recording from the fallback parser.")
+        synthetic, synthetic_url = start_stub(connect_delay=0.0, latency=0.6,
+                                              parse=GeminiAssistant()._fallback_parse)
+        recording = record(None, commands, api_base=synthetic_url)
+        synthetic.shutdown()
+
+    # Measure only what is asked for, and keep the on-disk cache and logs out of it.
+    GeminiAPI.PARSE_CACHE_ENABLED = args.cache
+    GeminiAPI._parse_cache = ParseCache() if args.cache else None
+    GeminiAPI.SPECULATIVE_PARSE = not args.no_speculation
+    GeminiAPI._speculation_log = SpeculationLog()
+    intent_router.enabled = not args.no_router
+    server, base_url = start_stub(connect_delay=0.0, latency=args.latency or 0.0, replay=recording,
+                                  latency_scale=None if args.latency is not None else args.latency_scale)
+    GeminiAPI.GEMINI_API_BASE = base_url
+
+    assistant, used, latencies = run_commands(commands, quiet=not args.verbose)
+    compared = action_hits = exact_hits = 0
+    misses = []
+    for command in commands:
+        reference = reference_parse(recording, assistant.gemini, command)
+        if reference is None or spoken(command) not in used:
+            continue
+        command_json, source = used[spoken(command)]
+        compared += 1
+        action_hits += command_json.get("action") == reference.get("action")
+        if _normalized(command_json) == _normalized(reference):
+            exact_hits += 1
+        else:
+            misses.append((command, source, command_json, reference))
+    sources = [source for _, source in used.values()]
+
+    print_header("GEMINI REPLAY BENCHMARK (SmartAssistant.process_command)")
+    print(f"Recording: {'synthetic' if synthetic else path} ({len(recording)} exchanges)")
+    if args.latency is not None:
+        print(f"Stub latency: fixed {args.latency * 1000:.0f} ms")
+    else:
+        print(f"Stub latency: recorded x {args.latency_scale:g}")
+    print(f"Router {'off' if args.no_router else 'on'}, speculation {'off' if args.no_speculation else 'on'}, "
+          f"cache {'on' if args.cache else 'off'}")
+    print(f"\nCommands: {len(commands)}  (local {sources.count('local')}, remote {sources.count('remote')})")
+    print(f"Gemini requests: {server.requests}  (replayed {server.replay_hits}, not recorded {server.replay_misses})")
+    print(f"Latency: p50 {percentile(latencies, 50) * 1000:.1f} ms, p95 {percentile(latencies, 95) * 1000:.1f} ms, "
+          f"total {sum(latencies):.2f} s")
+    if compared:
+        print(f"Parse accuracy vs recorded Gemini ({compared} commands): "
+              f"action {action_hits / compared:.1%}, exact {exact_hits / compared:.1%}")
+    for command, source, command_json, reference in misses[:10]:
+        print(f"  ✗ [{source}] {command}\n      got {json.dumps(command_json)}\n      ref {json.dumps(reference)}")
+    print("="*70 + "\n")
+    server.shutdown()
+    return not misses
+
+
+if __name__ == "__main__":
+    main()
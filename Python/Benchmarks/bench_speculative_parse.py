@@ -0,0 +1,65 @@
+import argparse
+import random
+import time
+
+from bench_utils import load_corpus, percentile, print_header
+from gemini_stub import start_stub
+import GeminiAPI
+from GeminiAPI import GeminiAssistant, SpeculationLog
+
+# Every call should reach the stub; bench_parse_cache.py measures the cache.
+GeminiAPI.PARSE_CACHE_ENABLED = False
+# A fresh log that is not loaded from or saved to memory/data.
+GeminiAPI._speculation_log = SpeculationLog()
+
+
+def run(server, assistant, commands, delays):
+    latencies = []
+    for command, delay in zip(commands, delays):
+        server.latency = delay
+        started = time.perf_counter()
+        assistant.parse_command_to_json(command)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speculative command parsing against a slow-tailed Gemini stub")
+    parser.add_argument("--latency", type=float, default=0.3, help="usual seconds per Gemini request")
+    parser.add_argument("--slow", type=float, default=4.0, help="seconds for a slow request")
+    parser.add_argument("--slow-fraction", type=float, default=0.1)
+    parser.add_argument("--budget", type=float, default=GeminiAPI.SPECULATIVE_PARSE_BUDGET)
+    args = parser.parse_args()
+
+    commands = load_corpus()
+    rng = random.Random(1)
+    delays = [args.slow if rng.random() < args.slow_fraction else args.latency for _ in commands]
+    # The stub's "Gemini" answers web_search for everything, so disagreements get recorded.
+    server, base_url = start_stub(connect_delay=0.0)
+    assistant = GeminiAssistant(api_base=base_url)
+
+    GeminiAPI.SPECULATIVE_PARSE = False
+    blocking = run(server, assistant, commands, delays)
+    GeminiAPI.SPECULATIVE_PARSE = True
+    GeminiAPI.SPECULATIVE_PARSE_BUDGET = args.budget
+    speculative = run(server, assistant, commands, delays)
+    time.sleep(args.slow)
+    stats = GeminiAPI._speculation_log.stats()
+
+    print_header("SPECULATIVE PARSE BENCHMARK (local stub)")
+    print(f"{len(commands)} corpus commands; stub: {args.latency * 1000:.0f} ms, "
+          f"{args.slow_fraction:.0%} of requests {args.slow:.1f} s; budget {args.budget:.1f} s\n")
+    print(f"{'Mode':<14}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'total s':>9}")
+    print("-"*50)
+    for label, latencies in (("blocking", blocking), ("speculative", speculative)):
+        print(f"{label:<14}{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 95) * 1000:>9.1f}"
+              f"{max(latencies) * 1000:>9.1f}{sum(latencies):>9.2f}")
+    print(f"\nGemini in budget {stats['remote']}, budget missed {stats['budget_missed']} "
+          f"(late answers {stats['late']}), failed {stats['remote_failed']}")
+    print(f"Local vs Gemini: {stats['agreements']} agree, {stats['disagreements']} disagree")
+    print("="*70 + "\n")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+DATA_DIR = BENCH_DIR / "data"
+AUDIO_DIR = DATA_DIR / "audio"
+SAMPLE_RATE = 16000
+
+sys.path.append(str(BENCH_DIR.parent))
+
+from Stats import percentile
+
+def load_corpus(name="commands.txt"):
+    with open(DATA_DIR / name, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+def time_per_item(fn, items, repeat=5):
+    # Best-of-N seconds per item, to keep scheduler noise out of the numbers.
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / max(len(items), 1)
+
+def print_header(title):
+    print("\n" + "="*70)
+    print(title)
+    print("="*70)
+
+def load_audio_fixtures():
+    """16 kHz mono WAVs from data/audio; synthetic clips when none are present.
+
+    Synthetic clips only exercise the decoder, so compare speed with them
+    but not transcripts.
+    """
+    import numpy as np
+    from scipy.io import wavfile
+    from scipy.signal import resample_poly
+    fixtures = []
+    for path in sorted(AUDIO_DIR.glob("*.wav")):
+        rate, data = wavfile.read(path)
+        if data.ndim > 1:
+            data = data.mean(axis=1)
+        if np.issubdtype(data.dtype, np.integer):
+            data = data.astype(np.float32) / np.iinfo(data.dtype).max
+        if rate != SAMPLE_RATE:
+            data = resample_poly(data, SAMPLE_RATE, rate)
+        fixtures.append((path.name, data.astype(np.float32)))
+    if fixtures:
+        return fixtures
+    rng = np.random.default_rng(0)
+    for seconds in (1.5, 3.0, 6.0):
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t)) / 2
+        fixtures.append((f"synthetic_{seconds:.1f}s", (tone + 0.02 * rng.standard_normal(len(t))).astype(np.float32)))
+    return fixtures
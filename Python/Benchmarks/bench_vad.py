@@ -0,0 +1,95 @@
+import numpy as np
+import webrtcvad
+
+from bench_utils import time_per_item, print_header
+from STT.VoiceActivity import SpeechDetector, ENERGY_THRESHOLD
+
+FS = 16000
+BLOCKSIZE = 1024
+BLOCK_US = BLOCKSIZE / FS * 1e6
+
+
+class LegacySpeechDetector:
+    """The previous listening-loop hot path: RMS computed separately for the
+    noise update and the energy gate, a fresh int16 copy and bytes slices
+    per block, and webrtcvad called on every frame."""
+    def __init__(self):
+        self.noise_level = 0.01
+        self.vad = webrtcvad.Vad(3)
+
+    def calculate_energy(self, audio):
+        return np.sqrt(np.mean(audio**2))
+
+    def update_noise_level(self, audio):
+        self.noise_level = 0.95 * self.noise_level + 0.05 * self.calculate_energy(audio)
+
+    def is_speech(self, audio_block):
+        if not self.calculate_energy(audio_block) > max(ENERGY_THRESHOLD, self.noise_level * 3):
+            return False
+        pcm_data = (audio_block * 32767).astype(np.int16).tobytes()
+        speech_frames = total_frames = 0
+        for i in range(0, len(pcm_data), 960):
+            frame = pcm_data[i:i + 960]
+            if len(frame) < 960:
+                break
+            total_frames += 1
+            if self.vad.is_speech(frame, sample_rate=FS):
+                speech_frames += 1
+        return total_frames > 0 and (speech_frames / total_frames) >= 0.7
+
+
+def synthetic_blocks(seconds, voiced, seed):
+    # Room noise, optionally with a voiced signal: harmonics of a drifting
+    # pitch under a syllable-rate envelope.
+    rng = np.random.default_rng(seed)
+    n = int(seconds * FS) // BLOCKSIZE * BLOCKSIZE
+    t = np.arange(n) / FS
+    audio = 0.004 * rng.standard_normal(n)
+    if voiced:
+        pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+        phase = 2 * np.pi * np.cumsum(pitch) / FS
+        harmonics = sum(np.sin(k * phase) / k for k in range(1, 12))
+        envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+        audio += 0.12 * harmonics * envelope
+    return [block.astype(np.float32) for block in audio.reshape(-1, BLOCKSIZE)]
+
+
+def run(detector, blocks):
+    decisions = []
+    for block in blocks:
+        detector.update_noise_level(block)
+        decisions.append(detector.is_speech(block))
+    return decisions
+
+
+def main():
+    streams = {
+        "idle room (no speech)": synthetic_blocks(20, False, 1),
+        "active (voiced signal)": synthetic_blocks(20, True, 2),
+    }
+    paths = {
+        "legacy": LegacySpeechDetector,
+        "vectorised webrtc": lambda: SpeechDetector(FS, BLOCKSIZE, vad_mode="webrtc"),
+        "energy + ZCR": lambda: SpeechDetector(FS, BLOCKSIZE, vad_mode="energy_zcr"),
+    }
+
+    print_header("VAD / ENERGY GATE BENCHMARK")
+    print(f"Block: {BLOCKSIZE} samples = {BLOCK_US / 1000:.0f} ms; CPU % is one core's share of real time\n")
+    for label, blocks in streams.items():
+        reference = run(LegacySpeechDetector(), blocks)
+        print(f"{label}: {len(blocks)} blocks, legacy marks {sum(reference)} as speech")
+        print(f"  {'Path':<22}{'µs / block':>12}{'CPU %':>9}{'agreement':>12}")
+        legacy_cost = None
+        for name, factory in paths.items():
+            decisions = run(factory(), blocks)
+            agreement = sum(a == b for a, b in zip(decisions, reference)) / len(blocks)
+            cost = time_per_item(lambda _: run(factory(), blocks), [None]) / len(blocks)
+            legacy_cost = legacy_cost or cost
+            print(f"  {name:<22}{cost * 1e6:>12.1f}{cost * 1e6 / BLOCK_US * 100:>8.3f}%{agreement:>11.1%}"
+                  f"   ({legacy_cost / cost:.1f}x)")
+        print()
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import load_audio_fixtures, print_header, SAMPLE_RATE
+from STT.sttOffline import stt_vosk, recognizer_pool, vosk_model_available, vosk_model_path
+
+
+def throughput(clips, workers):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(stt_vosk, clips))
+    return len(clips) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vosk decode throughput against worker count")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--clips", type=int, default=24)
+    args = parser.parse_args()
+
+    print_header("VOSK RECOGNIZER POOL BENCHMARK")
+    if not vosk_model_available():
+        print(f"✗ Vosk model not found at {vosk_model_path}; nothing to measure")
+        print("="*70 + "\n")
+        return
+    fixtures = load_audio_fixtures()
+    clips = [fixtures[i % len(fixtures)][1] for i in range(args.clips)]
+    audio_seconds = sum(len(clip) for clip in clips) / SAMPLE_RATE
+
+    started = time.perf_counter()
+    first = stt_vosk(clips[0])
+    print(f"Model load + first decode: {time.perf_counter() - started:.1f}s -> {first!r}")
+    repeat = [stt_vosk(fixtures[0][1]) for _ in range(3)]
+    print(f"Same clip decoded 3x on pooled recognizers: {'identical' if len(set(repeat)) == 1 else 'DIFFERENT'}")
+    print(f"Clips: {len(clips)}, {audio_seconds:.1f}s of audio\n")
+
+    print(f"{'Workers':<10}{'clips / s':>12}{'audio s / s':>14}{'scaling':>10}")
+    print("-"*46)
+    base = None
+    for workers in args.workers:
+        rate = throughput(clips, workers)
+        base = base or rate
+        print(f"{workers:<10}{rate:>12.2f}{rate * audio_seconds / len(clips):>14.1f}{rate / base:>9.2f}x")
+    print(f"\nRecognizers created: {recognizer_pool.created}")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import time
+
+from bench_utils import load_audio_fixtures, print_header, SAMPLE_RATE
+from STT.sttWhisper import WhisperService, WHISPER_BACKENDS, WHISPER_BEAM_SIZE, WHISPER_MODEL_SIZE
+
+
+def real_time_factor(service, fixtures, num_beams, repeat):
+    # Processing seconds per second of audio, best of ``repeat`` runs per clip.
+    processing = 0.0
+    for _, audio in fixtures:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            service.transcribe(audio, num_beams=num_beams)
+            best = min(best, time.perf_counter() - start)
+        processing += best
+    return processing / sum(len(audio) / SAMPLE_RATE for _, audio in fixtures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time factor of each Whisper backend")
+    parser.add_argument("--size", default=WHISPER_MODEL_SIZE)
+    parser.add_argument("--backends", nargs="+", default=[b for b in WHISPER_BACKENDS if b != "auto"])
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    fixtures = load_audio_fixtures()
+    rows = []
+    for backend in args.backends:
+        service = WhisperService(model_size=args.size, backend=backend)
+        if not service.wait_ready():
+            rows.append((backend, None, None, None, service.error))
+            continue
+        service.transcribe(fixtures[0][1], num_beams=1)
+        greedy = real_time_factor(service, fixtures, 1, args.repeat)
+        beam = real_time_factor(service, fixtures, WHISPER_BEAM_SIZE, args.repeat)
+        sample = service.transcribe(fixtures[0][1], num_beams=1)
+        rows.append((f"{backend} ({service.backend.device})", service.load_seconds, greedy, beam, sample))
+
+    print_header(f"WHISPER BACKEND BENCHMARK - {args.size}")
+    total = sum(len(audio) for _, audio in fixtures) / SAMPLE_RATE
+    print(f"Fixtures: {len(fixtures)} clips, {total:.1f}s of audio ({', '.join(name for name, _ in fixtures)})")
+    print(f"RTF = processing time / audio duration, lower is better; < 1.0 is faster than real time\n")
+    print(f"{'Backend':<26}{'load s':>8}{'RTF greedy':>12}{'RTF beam=' + str(WHISPER_BEAM_SIZE):>12}  first clip")
+    print("-"*70)
+    for label, load, greedy, beam, note in rows:
+        if greedy is None:
+            print(f"{label:<26}{'-':>8}{'-':>12}{'-':>12}  ✗ {note}")
+        else:
+            print(f"{label:<26}{load:>8.1f}{greedy:>12.3f}{beam:>12.3f}  {note!r}")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+
+from bench_utils import percentile, print_header
+from ConnectionManager import ConnectionManager
+
+
+class LegacyConnectionManager:
+    """Reference for the old manager: each broadcast awaits every client in turn."""
+    def __init__(self):
+        self.active_connections = []
+    async def connect(self, websocket, topics=None):
+        await websocket.accept()
+        self.active_connections.append(websocket)
+    def disconnect(self, websocket):
+        self.active_connections.remove(websocket)
+    async def broadcast(self, message):
+        if not isinstance(message, str):
+            message = json.dumps(message)
+        for connection in self.active_connections:
+            try:
+                await connection.send_text(message)
+            except:
+                self.active_connections.remove(connection)
+
+
+class FakeWebSocket:
+    # Records when each message arrived; ``delay`` per send makes it a slow dashboard.
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.received = []
+        self.closed = False
+    async def accept(self):
+        pass
+    async def send_text(self, text):
+        if self.fail:
+            raise ConnectionResetError("client went away")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append((time.perf_counter(), text))
+    async def close(self, code=1000):
+        self.closed = True
+
+
+async def fan_out(manager, fast=8, slow=1, failing=2, messages=50, slow_delay=0.05, interval=0.002):
+    fast_clients = [FakeWebSocket() for _ in range(fast)]
+    slow_clients = [FakeWebSocket(delay=slow_delay) for _ in range(slow)]
+    failing_clients = [FakeWebSocket(fail=True) for _ in range(failing)]
+    # The slow dashboard attached first; each failing client is followed by a fast one, which
+    # the legacy loop skips when it removes the failing client mid-iteration.
+    order = slow_clients + fast_clients[failing:]
+    for failing_client, fast_client in zip(failing_clients, fast_clients):
+        order += [failing_client, fast_client]
+    for websocket in order:
+        await manager.connect(websocket)
+    sent_at = []
+    for index in range(messages):
+        sent_at.append(time.perf_counter())
+        # As broadcast_from_thread did: scheduled on the loop, not awaited by the producer.
+        asyncio.ensure_future(manager.broadcast({"type": "voice_partial" if index % 2 else "answer_chunk",
+                                                 "index": index}))
+        await asyncio.sleep(interval)
+    await asyncio.sleep(slow_delay * 2)
+    delays = [arrived - sent_at[json.loads(text)["index"]]
+              for websocket in fast_clients for arrived, text in websocket.received]
+    delivered = sum(len(websocket.received) for websocket in fast_clients)
+    return {
+        "fast_p50": percentile(delays, 50),
+        "fast_p95": percentile(delays, 95),
+        "fast_delivered": delivered / (fast * messages),
+        "slow_received": sum(len(websocket.received) for websocket in slow_clients),
+    }
+
+
+async def topic_filter():
+    manager = ConnectionManager()
+    everything, results_only = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(everything)
+    await manager.connect(results_only, topics=["command_result"])
+    for kind in ("voice_partial", "answer_chunk", "command_result", "job_progress"):
+        manager.publish({"type": kind})
+    await asyncio.sleep(0.01)
+    return len(everything.received), len(results_only.received)
+
+
+async def run():
+    legacy = await fan_out(LegacyConnectionManager())
+    hub = await fan_out(ConnectionManager(max_queue=16))
+    disconnecting = await fan_out(ConnectionManager(max_queue=16, slow_client_policy="disconnect"))
+    everything, results_only = await topic_filter()
+
+    print_header("WEBSOCKET FAN-OUT BENCHMARK")
+    print("8 fast clients, 1 slow client (50 ms per send), 2 failing clients, 50 broadcasts\n")
+    print(f"{'Manager':<26}{'fast p50':>12}{'fast p95':>12}{'fast got':>10}{'slow got':>10}")
+    print("-"*70)
+    for name, result in (("legacy (sequential)", legacy), ("queues, coalesce", hub),
+                         ("queues, disconnect slow", disconnecting)):
+        print(f"{name:<26}{result['fast_p50'] * 1000:>9.2f} ms{result['fast_p95'] * 1000:>9.2f} ms"
+              f"{result['fast_delivered']:>10.1%}{result['slow_received']:>10}")
+    print(f"\nTopic filter: unfiltered client got {everything}/4, command_result subscriber got {results_only}/4")
+    print("="*70 + "\n")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
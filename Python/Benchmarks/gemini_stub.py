@@ -0,0 +1,153 @@
+"""Local stand-in for the Gemini generateContent endpoint.
+
+Speaks HTTP/1.1 with keep-alive. ``connect_delay`` is paid once per new
+connection, to stand in for the TCP+TLS handshake round trips to the real
+endpoint. ``latency`` is paid per request, to stand in for model time, plus
+``latency_per_kb`` per KB of request body, to stand in for prompt prefill.
+Answers are generated in pieces ``chunk_interval`` apart:
+``:streamGenerateContent?alt=sse`` sends each piece as a server-sent event,
+``:generateContent`` waits for the last one, as the real API does.
+Point a client at it with ``GeminiAssistant(api_base=base_url)``. Pass
+``parse`` (text -> dict) to answer command prompts with realistic parses
+instead of a fixed web_search. Pass ``replay`` (a ``GeminiRecorder``) to
+answer from a recording of the real API; with ``latency_scale`` set, each
+reply waits its recorded latency times that factor instead of ``latency``.
+Requests missing from the recording get the default answers.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+ANSWER = ("This is a stub answer from the local Gemini stand-in. It arrives in pieces, "
+          "the way a long reply is generated. The first sentence can be shown while the rest "
+          "is still being written. Nothing here comes from a real model.")
+
+
+def _answer_pieces(text, count=8):
+    words = text.split(" ")
+    step = max(1, -(-len(words) // count))
+    return [" ".join(words[i:i + step]) + (" " if i + step < len(words) else "") for i in range(0, len(words), step)]
+
+
+def _reply_for(prompt, parse=None):
+    if "JSON Output:" in prompt:
+        user_input = prompt.rsplit("User Input:", 1)[-1].split("\n")[0].strip()
+        return json.dumps(parse(user_input) if parse else {"action": "web_search", "query": user_input})
+    if "extract the core command" in prompt:
+        return "open calculator"
+    return ANSWER
+
+
+class GeminiStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body in one segment; otherwise Nagle + delayed ACK adds ~40 ms per reply.
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.server.connect_delay)
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests += 1
+        try:
+            prompt = json.loads(body)["contents"][0]["parts"][0]["text"]
+        except (ValueError, KeyError, IndexError):
+            prompt = ""
+        recorded = self.server.replay.get(prompt) if self.server.replay is not None else None
+        if self.server.replay is not None:
+            if recorded is None:
+                self.server.replay_misses += 1
+            else:
+                self.server.replay_hits += 1
+        latency = self.server.latency
+        if recorded is not None and self.server.latency_scale is not None:
+            latency = recorded["latency"] * self.server.latency_scale
+        time.sleep(latency + self.server.latency_per_kb * len(body) / 1024)
+        status = self.server.status
+        if status == 200 and recorded is not None:
+            status = recorded["status"]
+        if status != 200:
+            self._error(status)
+            return
+        if recorded is not None:
+            reply = recorded["reply"] or ""
+            # The recorded latency already covers generation, so only a stream is paced in pieces.
+            pieces = _answer_pieces(reply) if ":streamGenerateContent" in self.path else [reply]
+        else:
+            reply = _reply_for(prompt, self.server.parse)
+            pieces = _answer_pieces(reply) if reply == ANSWER else [reply]
+        if ":streamGenerateContent" in self.path:
+            self._stream(pieces)
+            return
+        time.sleep(self.server.chunk_interval * (len(pieces) - 1))
+        data = json.dumps({"candidates": [{"content": {"parts": [{"text": reply}]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status):
+        data = json.dumps({"error": {"code": status, "message": "stub outage"}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, pieces):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, piece in enumerate(pieces):
+            if index:
+                time.sleep(self.server.chunk_interval)
+            event = ("data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": piece}]}}]}) + "\r\n\r\n").encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GeminiStubServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops SYNs under concurrent connects (1 s retransmit).
+    request_queue_size = 64
+    daemon_threads = True
+
+
+def start_stub(port=0, connect_delay=0.05, latency=0.02, parse=None, latency_per_kb=0.0, chunk_interval=0.05,
+               replay=None, latency_scale=None):
+    server = GeminiStubServer(("127.0.0.1", port), GeminiStubHandler)
+    server.connect_delay = connect_delay
+    server.latency = latency
+    server.parse = parse
+    server.latency_per_kb = latency_per_kb
+    server.chunk_interval = chunk_interval
+    server.replay = replay
+    server.latency_scale = latency_scale
+    server.replay_hits = 0
+    server.replay_misses = 0
+    # Set to e.g. 503 or 429 to answer every request with that error.
+    server.status = 200
+    server.connections = 0
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, name="gemini-stub", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1beta"
+
+
+if __name__ == "__main__":
+    server, base_url = start_stub(port=8765)
+    print(f"Gemini stub listening at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -4,13 +4,13 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
 import re
 import platform
 import subprocess
 import os
 import shutil
 from pathlib import Path
+from Jobs import job_step, job_sleep
 from Browser.MediaPlayer import MediaPlayer
 from Browser.ResearchDownloader import ResearchDownloader
 from Browser.BrowserController import BrowserController
@@ -34,7 +34,7 @@ class EnhancedIntelligentBrowser:
             # Try to access current window
             _ = self.driver.current_window_handle
             return True
-        except:
+        except Exception:
             # Current window is closed, try to switch to any available window
             try:
                 handles = self.driver.window_handles
@@ -347,7 +347,7 @@ class EnhancedIntelligentBrowser:
             url = generic_patterns[0]
             print(f"   Trying: {url}")
             return self.open_website(url)
-        except:
+        except Exception:
             print(f"   ⚠ Search URL unknown, opening homepage")
             homepage = f'https://www.{platform_lower}.com'
             return self.open_website(homepage)
@@ -362,20 +362,20 @@ class EnhancedIntelligentBrowser:
             try:
                 print(f"Searching for: {query} (attempt {attempt + 1}/{max_retries})")
                 self.driver.get("https://www.google.com")
-                time.sleep(1)
+                job_sleep(1)
                 search_box = self.wait.until(
                     EC.presence_of_element_located((By.NAME, "q"))
                 )
                 search_box.clear()
                 search_box.send_keys(query)
                 search_box.send_keys(Keys.RETURN)
-                time.sleep(2)
+                job_sleep(2)
                 print(f"Search results for: {query}")
                 return True
             except TimeoutException:
                 print(f"Timeout waiting for Google search page (attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries - 1:
-                    time.sleep(2)
+                    job_sleep(2)
                     continue
             except Exception as e:
                 error_msg = str(e)
@@ -384,7 +384,7 @@ class EnhancedIntelligentBrowser:
                     return False
                 print(f"Google search failed: {error_msg[:150]}")
                 if attempt < max_retries - 1:
-                    time.sleep(2)
+                    job_sleep(2)
                     continue
         return False
     def download_and_install(self, item):
@@ -401,8 +401,9 @@ class EnhancedIntelligentBrowser:
                 "discord": "https://discord.com/download",
                 "spotify": "https://www.spotify.com/download/",
             }
+            job_step(f"Opening the {item} download page")
             self.open_website(download_urls[item.lower()])
-            time.sleep(2)
+            job_sleep(2)
             try:
                 elements = self.driver.find_elements(By.XPATH, "//*[contains(@class, 'download') or contains(text(), 'Download') or contains(@href, '.exe') or contains(@href, '.dmg') or contains(@href, '.deb')]")
                 for elem in elements:
@@ -410,18 +411,19 @@ class EnhancedIntelligentBrowser:
                     if any(p in elem_text for p in current_platform) or "download" in elem_text:
                         print(f"Found platform button: {elem.text.strip() or 'Link'}")
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", elem)
-                        time.sleep(0.5)
+                        job_sleep(0.5)
                         try:
                             elem.click()
-                        except:
+                        except Exception:
                             self.driver.execute_script("arguments[0].click();", elem)
                         print("Download button clicked")
-                        time.sleep(2)
+                        job_sleep(2)
                         return True
-            except:
+            except Exception:
                 pass
+        job_step(f"Searching for the official {item} download")
         self.search_google(f"{item} official download {self.platform_name.lower()}")
-        time.sleep(2)
+        job_sleep(2)
         try:
             official_domains = [
                 "steampowered.com", "discord.com", "spotify.com",
@@ -434,17 +436,19 @@ class EnhancedIntelligentBrowser:
                     url = link.get_attribute("href")
                     if any(domain in url for domain in official_domains):
                         print(f"Found official site: {url}")
+                        job_step(f"Opening {url}")
                         link.click()
-                        time.sleep(2)
+                        job_sleep(2)
                         break
-                except:
+                except Exception:
                     continue
             else:
                 self.click_first_result()
         except Exception as e:
             print(f"Navigation error: {e}")
             return False
-        time.sleep(2)
+        job_sleep(2)
+        job_step("Looking for the download button")
         if self.find_platform_specific_download(current_platform):
             return True
         if self.find_and_click_download_button():
@@ -467,13 +471,13 @@ class EnhancedIntelligentBrowser:
                     if any(p in elem_text for p in current_platform):
                         print(f"Found {elem_text}")
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", elem)
-                        time.sleep(0.5)
+                        job_sleep(0.5)
                         try:
                             elem.click()
-                        except:
+                        except Exception:
                             self.driver.execute_script("arguments[0].click();", elem)
                         print("Download button clicked")
-                        time.sleep(2)
+                        job_sleep(2)
                         return True
         except Exception as e:
             print(f"Platform detection issue: {e}")
@@ -494,15 +498,15 @@ class EnhancedIntelligentBrowser:
                         if elem.is_displayed() and elem.is_enabled():
                             print(f"Found download button: '{elem.text.strip()}'")
                             self.driver.execute_script("arguments[0].scrollIntoView(true);", elem)
-                            time.sleep(0.5)
+                            job_sleep(0.5)
                             try:
                                 elem.click()
-                            except:
+                            except Exception:
                                 self.driver.execute_script("arguments[0].click();", elem)
                             print("Download clicked")
-                            time.sleep(2)
+                            job_sleep(2)
                             return True
-                except:
+                except Exception:
                     continue
             print("No download button found automatically")
             return False
@@ -541,12 +545,12 @@ class EnhancedIntelligentBrowser:
             try:
                 print(f"Opening: {url} (attempt {attempt + 1}/{max_retries})")
                 self.driver.get(url)
-                time.sleep(2)
+                job_sleep(2)
                 try:
                     title = self.driver.title
                     print(f"Loaded: {title}")
                     return True
-                except:
+                except Exception:
                     print("Page loaded but title unavailable")
                     return True
             except Exception as e:
@@ -556,7 +560,7 @@ class EnhancedIntelligentBrowser:
                     return False
                 print(f"Failed to open {url}: {error_msg[:150]}")
                 if attempt < max_retries - 1:
-                    time.sleep(2)
+                    job_sleep(2)
                     continue
         return False
     def click_first_result(self):
@@ -566,7 +570,7 @@ class EnhancedIntelligentBrowser:
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "h3"))
             )
             first_result.click()
-            time.sleep(2)
+            job_sleep(2)
             print(f"Opened: {self.driver.title}")
             return True
         except Exception as e:
@@ -3,7 +3,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
+from Jobs import job_step, job_sleep
 
 class MediaPlayer:
     def __init__(self, driver):
@@ -13,8 +13,9 @@ class MediaPlayer:
         try:
             search_url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}"
             print(f"🔍 Searching YouTube: {search_url}")
+            job_step(f"Searching YouTube for {query}")
             self.driver.get(search_url)
-            time.sleep(2)
+            job_sleep(2)
             try:
                 first_video = self.wait.until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "a#video-title"))
@@ -22,8 +23,9 @@ class MediaPlayer:
                 video_url = first_video.get_attribute('href')
                 video_title = first_video.get_attribute('title')
                 print(f"▶️  Playing: {video_title}")
+                job_step(f"Playing {video_title}")
                 first_video.click()
-                time.sleep(2)
+                job_sleep(2)
                 return True, f"Playing: {video_title}"
             except TimeoutException:
                 print("⚠ Could not find video results")
@@ -35,8 +37,9 @@ class MediaPlayer:
         try:
             search_url = f"https://open.spotify.com/search/{query.replace(' ', '%20')}"
             print(f"🔍 Searching Spotify: {search_url}")
+            job_step(f"Searching Spotify for {query}")
             self.driver.get(search_url)
-            time.sleep(3)
+            job_sleep(3)
             return True, f"Opened Spotify search for: {query}"
         except Exception as e:
             print(f"❌ Error with Spotify: {e}")
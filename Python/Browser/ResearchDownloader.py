@@ -3,8 +3,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
 import os
+from Jobs import job_step, job_sleep
 
 class ResearchDownloader:
     def __init__(self, driver):
@@ -17,16 +17,19 @@ class ResearchDownloader:
         print()
         downloaded = 0
         print("🔍 Searching arXiv...")
+        job_step("Searching arXiv")
         downloaded += self._download_from_arxiv(topic, max_papers - downloaded)
         if downloaded >= max_papers:
             print(f"\n✅ Successfully downloaded {downloaded} papers!")
             return True
         print("\n🔍 Searching Google Scholar...")
+        job_step("Searching Google Scholar")
         downloaded += self._download_from_google_scholar(topic, max_papers - downloaded)
         if downloaded >= max_papers:
             print(f"\n✅ Successfully downloaded {downloaded} papers!")
             return True
         print("\n🔍 Searching Semantic Scholar...")
+        job_step("Searching Semantic Scholar")
         downloaded += self._download_from_semantic_scholar(topic, max_papers - downloaded)
         print(f"\n✅ Downloaded {downloaded} research papers to: {self.downloads_dir}")
         return downloaded > 0
@@ -34,7 +37,7 @@ class ResearchDownloader:
         try:
             search_url = f"https://arxiv.org/search/?query={topic.replace(' ', '+')}&searchtype=all&source=header"
             self.driver.get(search_url)
-            time.sleep(3)
+            job_sleep(3)
             papers = self.driver.find_elements(By.CSS_SELECTOR, "li.arxiv-result")
             downloaded = 0
             for i, paper in enumerate(papers[:max_papers]):
@@ -48,10 +51,11 @@ class ResearchDownloader:
                     print(f"  [{i+1}] {title[:60]}...")
                     print(f"      Downloading from: {pdf_url}")
                     self.driver.execute_script(f"window.open('{pdf_url}', '_blank');")
-                    time.sleep(2)
+                    job_sleep(2)
                     self.driver.switch_to.window(self.driver.window_handles[0])
                     downloaded += 1
                     print(f"      ✓ Downloaded!")
+                    job_step(f"Downloaded {title[:60]}")
                 except Exception as e:
                     print(f"      ✗ Failed: {e}")
                     continue
@@ -63,7 +67,7 @@ class ResearchDownloader:
         try:
             search_url = f"https://scholar.google.com/scholar?q={topic.replace(' ', '+')}"
             self.driver.get(search_url)
-            time.sleep(3)
+            job_sleep(3)
             papers = self.driver.find_elements(By.CSS_SELECTOR, "div.gs_r.gs_or.gs_scl")
             downloaded = 0
             for i, paper in enumerate(papers[:max_papers]):
@@ -78,10 +82,11 @@ class ResearchDownloader:
                         print(f"  [{i+1}] {title[:60]}...")
                         print(f"      Downloading from: {pdf_url}")
                         self.driver.execute_script(f"window.open('{pdf_url}', '_blank');")
-                        time.sleep(2)
+                        job_sleep(2)
                         self.driver.switch_to.window(self.driver.window_handles[0])
                         downloaded += 1
                         print(f"      ✓ Downloaded!")
+                        job_step(f"Downloaded {title[:60]}")
                     except NoSuchElementException:
                         print(f"  [{i+1}] {title[:60]}...")
                         print(f"      ✗ No PDF available")
@@ -96,7 +101,7 @@ class ResearchDownloader:
         try:
             search_url = f"https://www.semanticscholar.org/search?q={topic.replace(' ', '%20')}"
             self.driver.get(search_url)
-            time.sleep(4)
+            job_sleep(4)
             papers = self.driver.find_elements(By.CSS_SELECTOR, "div[data-test-id='search-result']")
             downloaded = 0
             for i, paper in enumerate(papers[:max_papers]):
@@ -111,10 +116,11 @@ class ResearchDownloader:
                         print(f"  [{i+1}] {title[:60]}...")
                         print(f"      Downloading from: {pdf_url}")
                         self.driver.execute_script(f"window.open('{pdf_url}', '_blank');")
-                        time.sleep(2)
+                        job_sleep(2)
                         self.driver.switch_to.window(self.driver.window_handles[0])
                         downloaded += 1
                         print(f"      ✓ Downloaded!")
+                        job_step(f"Downloaded {title[:60]}")
                     except NoSuchElementException:
                         print(f"  [{i+1}] {title[:60]}...")
                         print(f"      ✗ No PDF available")
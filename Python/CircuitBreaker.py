@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+
+from Stats import percentile
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a remote service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a failing remote service and sizes timeouts from its latency.
+
+    Closed: calls go through. ``failure_threshold`` consecutive failures
+    (exceptions, timeouts, 429 or 5xx) open the circuit, and calls are refused
+    with ``CircuitOpenError`` so callers fall back at once. After
+    ``reset_timeout`` seconds the circuit half-opens and lets
+    ``half_open_probes`` calls through. A probe success closes the circuit;
+    a probe failure opens it again, for twice as long each time up to
+    ``max_reset_timeout``.
+
+    ``timeout(kind, default)`` gives a per-call timeout of ``multiplier`` times
+    the p95 latency of recent 2xx calls of that kind, kept between
+    ``min_timeout`` and ``default``, once ``min_samples`` calls have been seen.
+    """
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0, max_reset_timeout=300.0,
+                 half_open_probes=1, window=100, min_samples=20, multiplier=3.0, min_timeout=2.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.half_open_probes = half_open_probes
+        self.min_samples = min_samples
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self._window = window
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._open_for = reset_timeout
+        self._probes = 0
+        self.consecutive_failures = 0
+        self._outcomes = deque(maxlen=window)
+        self._latencies = {}
+        self.counts = {"calls": 0, "failures": 0, "short_circuited": 0, "opened": 0}
+    def allow(self):
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self._open_for:
+                    self.counts["short_circuited"] += 1
+                    return False
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.counts["short_circuited"] += 1
+                    return False
+                self._probes += 1
+            self.counts["calls"] += 1
+            return True
+    def check(self):
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} unavailable, retrying in {self.retry_in():.0f}s")
+    def retry_in(self):
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self._open_for - (time.monotonic() - self._opened_at))
+    def record_success(self, kind, latency=None):
+        with self._lock:
+            if latency is not None:
+                self._latencies.setdefault(kind, deque(maxlen=self._window)).append(latency)
+            self._outcomes.append(True)
+            self.consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._open_for = self.reset_timeout
+    def record_failure(self, kind):
+        with self._lock:
+            self._outcomes.append(False)
+            self.counts["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                self._open_for = min(self._open_for * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+    def record_status(self, kind, status_code, latency):
+        # Rate limits and server errors count against the service; other 4xx are the caller's fault.
+        # Only 2xx latencies are samples: a fast rejection would shrink the timeout for real calls.
+        if status_code == 429 or status_code >= 500:
+            self.record_failure(kind)
+        else:
+            self.record_success(kind, latency if 200 <= status_code < 300 else None)
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.counts["opened"] += 1
+    def timeout(self, kind, default):
+        with self._lock:
+            latencies = self._latencies.get(kind)
+            if not latencies or len(latencies) < self.min_samples:
+                return default
+            return min(default, max(self.min_timeout, self.multiplier * percentile(latencies, 95)))
+    def stats(self):
+        with self._lock:
+            outcomes = self._outcomes
+            latency = {kind: {"p50_ms": 1000 * percentile(values, 50), "p95_ms": 1000 * percentile(values, 95),
+                              "samples": len(values)}
+                       for kind, values in self._latencies.items()}
+            return dict(self.counts,
+                        state=self.state,
+                        consecutive_failures=self.consecutive_failures,
+                        error_rate=outcomes.count(False) / len(outcomes) if outcomes else 0.0,
+                        latency=latency)
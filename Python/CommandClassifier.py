@@ -1,104 +1,293 @@
 
 import re
+from collections import OrderedDict
 from enum import Enum
+from KeywordMatcher import KeywordMatcher
 
 class CommandType(Enum):
     SYSTEM = "system"
     WEB = "web"
     CONVERSATION = "conversation"
 
+SYSTEM_PATTERNS = [
+    r'\b(open|launch|start|run|execute)\s+\w+',
+    r'\b(close|quit|exit|kill|stop)\s+\w+',
+    r'\b(kholo|khol|chalu|shuru|band|bund)\s+\w+',
+    r'\w+\s+ko\s+(open|close|kholo|band|karo)',
+    r'\b(create|make|delete|remove|rename|copy|move)\s+(file|folder|directory)',
+    r'\b(find|search|locate)\s+(?:file|folder|document)\s+(?:on|in)\s+(?:computer|system|pc|laptop|machine)',
+    r'\b(search|find)\s+(?:for\s+)?(?:file|folder|document)',
+    r'\b(file|folder|document)\s+(?:search|find|dhoondo)',
+    r'\b(file|folder)\s+(banao|banana|delete|hatao|khojo|dhoondo)',
+    r'\b(banao|banana|delete|hatao)\s+(file|folder)',
+    r'\b(system me|computer me|pc me)\s+(search|khojo|dhoondo)',
+    r'\b(mere|meri|my)\s+(computer|pc|system)\s+(me|par|mein)',
+    r'\b(volume|brightness|wifi|bluetooth|screenshot|settings)',
+    r'\b(minimize|maximize|fullscreen)',
+    r'\b(volume|brightness)\s+(badha|kam|increase|decrease)',
+    r'\b(screenshot|settings)\s+(le|karo)',
+]
+WEB_PATTERNS = [
+    r'\b(what is|who is|what are|who are|what\'s|who\'s)\s+',
+    r'\b(when (is|was|will)|where (is|was|will))\s+',
+    r'\b(how to|how do|how does|how can)\s+',
+    r'\b(google|search on internet|search online|web pe|internet pe)\s+',
+    r'\b(search|find|look up)\s+(?!file|folder|document|on computer|on pc|in system)',
+    r'\b(download|install)\s+(?!from)',
+    r'\b(kya hai|kaun hai|kahan hai|kab hai)\s+',
+    r'\b(kaise|kaise kare|kaise karte)\s+',
+    r'\b(google karo|internet pe|web pe|online)\s+',
+    r'\b(batao|bata|bataye)\s+(?:ki|ke|kya)',
+    r'\b(search karo|dhundo)\s+(?!file|folder|system|computer)',
+    r'\b(go to|open|visit|navigate to)\s+\w+\.(com|org|net|in|co)',
+    r'\b(youtube|facebook|twitter|instagram|linkedin|github)\b',
+    r'\b(buy|purchase|order|shopping)\s+',
+    r'\b(price|cost|review|compare)\s+',
+    r'\b(download|install)\s+(?:from|via)\s+',
+]
+CONVERSATION_PATTERNS = [
+    # Greetings
+    r'^(hello|hi|hey|good morning|good evening|good night)\b',
+    r'\b(how are you|what\'s up|how\'s it going|how do you do)',
+    r'\b(namaste|namaskar|kaise ho|kya hal|sab theek|kaise hain)',
+    
+    # Identity questions
+    r'\b(what (is|are) you|who are you|tell me about yourself)',
+    r'\b(tum kaun ho|aap kaun|batao apne bare|tell about yourself)',
+    
+    # Requests for help/entertainment
+    r'\b(can you help|are you able to|do you know how)',
+    r'\b(help me|assist me|guide me|support)',
+    r'\b(madad karo|help karo|batao kaise|sikha)',
+    r'\b(tell me (a|an|the))\s+(joke|story|fact|quote)',
+    r'^(joke|story|fact|quote|advice)\b',
+    r'^(ek|one)\s+(joke|story|kahani)',
+    r'\b(sunao|batao)\s+(?!weather|price|kya hai)',
+    
+    # Thanks and acknowledgments (EXPANDED)
+    r'\b(thank you|thanks|thank|thankyou|thx)',
+    r'\b(thank you for|thanks for|thank for)',
+    r'\b(dhanyavad|theek hai|accha|shukriya|theek)',
+    
+    # Confirmations and agreements
+    r'^(okay|ok|fine|sure|got it|alright|right|yes|no|nope|yep|yeah)\b',
+    r'\b(theek|sahi|haan|nahi|bilkul)',
+    
+    # Goodbyes and closings (NEW)
+    r'\b(goodbye|good bye|bye|see you|farewell|take care|catch you later)',
+    r'\b(bye bye|byebye|see ya|later|peace|adios)',
+    r'\b(alvida|khuda hafiz|phir milenge)',
+    
+    # Watching/viewing related phrases (NEW)
+    r'\b(thank(s)? for (watching|viewing|listening|your time))',
+    r'\b(thanks for (being here|joining|coming))',
+    r'^(watching|viewing|listening)$',
+    
+    # Apologies
+    r'\b(sorry|apologies|apologize|excuse me|pardon)',
+    r'\b(maaf|maafi|sorry)',
+    
+    # Exclamations and reactions
+    r'^(wow|cool|nice|great|awesome|amazing|excellent|perfect)\b',
+    r'^(wah|zabardast|badhiya|mast|shandar)\b',
+]
+
+SEARCH_PREFIXES = ('search ', 'google ', 'find ', 'lookup ', 'look up ')
+LAUNCH_PREFIXES = ('open ', 'launch ', 'start ', 'run ', 'execute ', 'close ', 'quit ')
+KNOWN_APPS = frozenset(['chrome', 'firefox', 'brave', 'edge', 'safari', 'notepad',
+                        'calculator', 'terminal', 'cmd', 'settings', 'explorer',
+                        'finder', 'spotify', 'discord', 'steam', 'vlc', 'code', 'vscode',
+                        'visual', 'studio', 'tool', 'app', 'application'])
+SYSTEM_KEYWORDS = frozenset(['file', 'folder', 'directory', 'volume', 'brightness',
+                             'screenshot', 'taskbar', 'desktop', 'window'])
+LOCAL_INDICATORS = frozenset(['on computer', 'in computer', 'on pc', 'in pc',
+                              'on system', 'in system', 'from system', 'on my computer', 'on this computer',
+                              'my pc', 'this pc', 'on laptop', 'in laptop',
+                              'computer me', 'pc me', 'system me', 'system se', 'mere computer',
+                              'meri pc', 'is computer'])
+QUESTION_WORDS = frozenset(['what', 'who', 'when', 'where', 'why', 'how',
+                            'kya', 'kaun', 'kab', 'kahan', 'kaise', 'kyun'])
+ENGLISH_QUESTION_WORDS = frozenset(['what', 'who', 'when', 'where', 'why', 'how'])
+INFO_WORDS = frozenset(['information', 'details', 'about', 'regarding',
+                        'jankari', 'bare mein', 'ke bare'])
+WEB_INDICATORS = frozenset(['google', 'search on internet', 'search online',
+                            'internet pe', 'web pe', 'online search',
+                            'google karo', 'internet par'])
+WEB_CONVERSATION_INDICATORS = frozenset(['thank', 'thanks', 'bye', 'hello', 'hi', 'sorry',
+                                         'ok', 'okay', 'watching', 'listening'])
+WEB_LOCAL_CONTEXT = frozenset(['on computer', 'in computer', 'computer me', 'pc me',
+                               'system me', 'from system', 'system se', 'on my pc', 'my computer'])
+STRONG_CONVERSATION_INDICATORS = frozenset([
+    'thank you', 'thanks', 'thank', 'thankyou', 'thx',
+    'bye', 'goodbye', 'see you', 'take care',
+    'hello', 'hi', 'hey',
+    'sorry', 'apologies',
+    'ok', 'okay', 'alright', 'sure', 'got it',
+    'wow', 'cool', 'nice', 'great',
+])
+VIEWING_WORDS = frozenset(['watching', 'listening', 'viewing'])
+PRONOUNS = frozenset(['you', 'your', 'yourself', 'tum', 'tumhara', 'aap', 'aapka'])
+POLITE_WORDS = frozenset(['please', 'kindly', 'kripa', 'meherbani'])
+SEARCH_VERBS = frozenset(['search', 'find', 'lookup', 'google'])
+
+SEARCH_PREPOSITION_RE = re.compile(r'\b(search|find|lookup|google)\s+(for|about|on)\s+')
+DOMAIN_RE = re.compile(r'\.(com|org|net|in|co)')
+LEADING_GROUP_RE = re.compile(r'(?:\^|\\b)\((?:\?:)?')
+LEADING_LITERAL_RE = re.compile(r'[\w ]+')
+
+CONTEXT_KEYWORDS = (KNOWN_APPS | SYSTEM_KEYWORDS | LOCAL_INDICATORS | INFO_WORDS
+                    | WEB_INDICATORS | WEB_CONVERSATION_INDICATORS | WEB_LOCAL_CONTEXT
+                    | STRONG_CONVERSATION_INDICATORS | VIEWING_WORDS
+                    | ENGLISH_QUESTION_WORDS | POLITE_WORDS | SEARCH_VERBS)
+
+
+class CompiledPatternSet:
+    """Patterns of one category, compiled once and prefiltered by keyword.
+
+    Most patterns open with an alternation of literal words, e.g.
+    ``\\b(open|launch|start)``. A pattern can only match when the leading
+    word of one of its branches occurs in the text, so the keywords found by
+    the shared ``KeywordMatcher`` scan pick the few patterns worth running.
+    Patterns without such a lead always run. Scores are identical to
+    searching every pattern.
+    """
+    def __init__(self, patterns):
+        self.patterns = tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+        self.unfiltered = []
+        self.by_lead = {}
+        for index, pattern in enumerate(patterns):
+            leads = _literal_leads(pattern)
+            if not leads:
+                self.unfiltered.append(index)
+                continue
+            for lead in leads:
+                self.by_lead.setdefault(lead, []).append(index)
+        self.leads = frozenset(self.by_lead)
+
+    def score(self, text, found):
+        candidates = set(self.unfiltered)
+        for lead in self.leads.intersection(found):
+            candidates.update(self.by_lead[lead])
+        patterns = self.patterns
+        return sum(1 for index in candidates if patterns[index].search(text))
+
+
+def _literal_leads(pattern):
+    # Leading literal of every branch of an opening "\b(...)" or "^(...)" group.
+    match = LEADING_GROUP_RE.match(pattern)
+    if not match:
+        return None
+    branches = []
+    depth = 0
+    start = match.end()
+    for index in range(start, len(pattern)):
+        char = pattern[index]
+        if pattern[index - 1] == '\\':
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            if depth == 0:
+                branches.append(pattern[start:index])
+                break
+            depth -= 1
+        elif char == '|' and depth == 0:
+            branches.append(pattern[start:index])
+            start = index + 1
+    else:
+        return None
+    leads = []
+    for branch in branches:
+        lead = LEADING_LITERAL_RE.match(branch)
+        if not lead:
+            return None
+        literal = lead.group(0)
+        if branch[len(literal):len(literal) + 1] in ('?', '*', '{'):
+            # "colou?r": the last letter is optional, so it can't be required.
+            literal = literal[:-1]
+        if not literal.strip():
+            return None
+        leads.append(literal.lower())
+    return leads
+
+
+class ClassifierTables:
+    def __init__(self, system_patterns, web_patterns, conversation_patterns, max_results=1024):
+        self.system = CompiledPatternSet(system_patterns)
+        self.web = CompiledPatternSet(web_patterns)
+        self.conversation = CompiledPatternSet(conversation_patterns)
+        self.matcher = KeywordMatcher(
+            CONTEXT_KEYWORDS | self.system.leads | self.web.leads | self.conversation.leads
+        )
+        # Spoken commands repeat a lot; remember the last results (LRU).
+        self.results = OrderedDict()
+        self.max_results = max_results
+
+    def lookup(self, text):
+        result = self.results.get(text)
+        if result is not None:
+            try:
+                self.results.move_to_end(text)
+            except KeyError:
+                pass
+        return result
+
+    def remember(self, text, result):
+        self.results[text] = result
+        while len(self.results) > self.max_results:
+            try:
+                self.results.popitem(last=False)
+            except KeyError:
+                break
+
+
+_tables_cache = {}
+
+def compile_tables(system_patterns, web_patterns, conversation_patterns):
+    key = (tuple(system_patterns), tuple(web_patterns), tuple(conversation_patterns))
+    tables = _tables_cache.get(key)
+    if tables is None:
+        tables = ClassifierTables(*key)
+        _tables_cache[key] = tables
+    return tables
+
+
+_pattern_sets = {}
+
+def compile_pattern_set(patterns):
+    # For scoring an arbitrary pattern list: compiled with its own keyword matcher, once.
+    key = tuple(patterns)
+    compiled = _pattern_sets.get(key)
+    if compiled is None:
+        pattern_set = CompiledPatternSet(key)
+        compiled = _pattern_sets[key] = (pattern_set, KeywordMatcher(pattern_set.leads))
+    return compiled
+
+
 class CommandClassifier:
     def __init__(self):
-        self.system_patterns = [
-            r'\b(open|launch|start|run|execute)\s+\w+',
-            r'\b(close|quit|exit|kill|stop)\s+\w+',
-            r'\b(kholo|khol|chalu|shuru|band|bund)\s+\w+',
-            r'\w+\s+ko\s+(open|close|kholo|band|karo)',
-            r'\b(create|make|delete|remove|rename|copy|move)\s+(file|folder|directory)',
-            r'\b(find|search|locate)\s+(?:file|folder|document)\s+(?:on|in)\s+(?:computer|system|pc|laptop|machine)',
-            r'\b(search|find)\s+(?:for\s+)?(?:file|folder|document)',
-            r'\b(file|folder|document)\s+(?:search|find|dhoondo)',
-            r'\b(file|folder)\s+(banao|banana|delete|hatao|khojo|dhoondo)',
-            r'\b(banao|banana|delete|hatao)\s+(file|folder)',
-            r'\b(system me|computer me|pc me)\s+(search|khojo|dhoondo)',
-            r'\b(mere|meri|my)\s+(computer|pc|system)\s+(me|par|mein)',
-            r'\b(volume|brightness|wifi|bluetooth|screenshot|settings)',
-            r'\b(minimize|maximize|fullscreen)',
-            r'\b(volume|brightness)\s+(badha|kam|increase|decrease)',
-            r'\b(screenshot|settings)\s+(le|karo)',
-        ]
-        self.web_patterns = [
-            r'\b(what is|who is|what are|who are|what\'s|who\'s)\s+',
-            r'\b(when (is|was|will)|where (is|was|will))\s+',
-            r'\b(how to|how do|how does|how can)\s+',
-            r'\b(google|search on internet|search online|web pe|internet pe)\s+',
-            r'\b(search|find|look up)\s+(?!file|folder|document|on computer|on pc|in system)',
-            r'\b(download|install)\s+(?!from)',
-            r'\b(kya hai|kaun hai|kahan hai|kab hai)\s+',
-            r'\b(kaise|kaise kare|kaise karte)\s+',
-            r'\b(google karo|internet pe|web pe|online)\s+',
-            r'\b(batao|bata|bataye)\s+(?:ki|ke|kya)',
-            r'\b(search karo|dhundo)\s+(?!file|folder|system|computer)',
-            r'\b(go to|open|visit|navigate to)\s+\w+\.(com|org|net|in|co)',
-            r'\b(youtube|facebook|twitter|instagram|linkedin|github)\b',
-            r'\b(buy|purchase|order|shopping)\s+',
-            r'\b(price|cost|review|compare)\s+',
-            r'\b(download|install)\s+(?:from|via)\s+',
-        ]
-        self.conversation_patterns = [
-            # Greetings
-            r'^(hello|hi|hey|good morning|good evening|good night)\b',
-            r'\b(how are you|what\'s up|how\'s it going|how do you do)',
-            r'\b(namaste|namaskar|kaise ho|kya hal|sab theek|kaise hain)',
-            
-            # Identity questions
-            r'\b(what (is|are) you|who are you|tell me about yourself)',
-            r'\b(tum kaun ho|aap kaun|batao apne bare|tell about yourself)',
-            
-            # Requests for help/entertainment
-            r'\b(can you help|are you able to|do you know how)',
-            r'\b(help me|assist me|guide me|support)',
-            r'\b(madad karo|help karo|batao kaise|sikha)',
-            r'\b(tell me (a|an|the))\s+(joke|story|fact|quote)',
-            r'^(joke|story|fact|quote|advice)\b',
-            r'^(ek|one)\s+(joke|story|kahani)',
-            r'\b(sunao|batao)\s+(?!weather|price|kya hai)',
-            
-            # Thanks and acknowledgments (EXPANDED)
-            r'\b(thank you|thanks|thank|thankyou|thx)',
-            r'\b(thank you for|thanks for|thank for)',
-            r'\b(dhanyavad|theek hai|accha|shukriya|theek)',
-            
-            # Confirmations and agreements
-            r'^(okay|ok|fine|sure|got it|alright|right|yes|no|nope|yep|yeah)\b',
-            r'\b(theek|sahi|haan|nahi|bilkul)',
-            
-            # Goodbyes and closings (NEW)
-            r'\b(goodbye|good bye|bye|see you|farewell|take care|catch you later)',
-            r'\b(bye bye|byebye|see ya|later|peace|adios)',
-            r'\b(alvida|khuda hafiz|phir milenge)',
-            
-            # Watching/viewing related phrases (NEW)
-            r'\b(thank(s)? for (watching|viewing|listening|your time))',
-            r'\b(thanks for (being here|joining|coming))',
-            r'^(watching|viewing|listening)$',
-            
-            # Apologies
-            r'\b(sorry|apologies|apologize|excuse me|pardon)',
-            r'\b(maaf|maafi|sorry)',
-            
-            # Exclamations and reactions
-            r'^(wow|cool|nice|great|awesome|amazing|excellent|perfect)\b',
-            r'^(wah|zabardast|badhiya|mast|shandar)\b',
-        ]
+        self.system_patterns = list(SYSTEM_PATTERNS)
+        self.web_patterns = list(WEB_PATTERNS)
+        self.conversation_patterns = list(CONVERSATION_PATTERNS)
+        # Shared across instances: every session's SmartAssistant and the intent router have one.
+        self._tables = compile_tables(self.system_patterns, self.web_patterns, self.conversation_patterns)
     def classify(self, text):
         text = text.lower().strip()
-        system_score = self._score_patterns(text, self.system_patterns)
-        web_score = self._score_patterns(text, self.web_patterns)
-        conversation_score = self._score_patterns(text, self.conversation_patterns)
-        system_score += self._contextual_system_score(text)
-        web_score += self._contextual_web_score(text)
-        conversation_score += self._contextual_conversation_score(text)
+        cached = self._tables.lookup(text)
+        if cached is not None:
+            return cached
+        result = self._classify(text)
+        self._tables.remember(text, result)
+        return result
+    def _classify(self, text):
+        words = text.split()
+        found = self._tables.matcher.find(text)
+        system_score = self._tables.system.score(text, found)
+        web_score = self._tables.web.score(text, found)
+        conversation_score = self._tables.conversation.score(text, found)
+        system_score += self._contextual_system_score(text, found)
+        web_score += self._contextual_web_score(text, words, found)
+        conversation_score += self._contextual_conversation_score(text, words, found)
         scores = {
             CommandType.SYSTEM: system_score,
             CommandType.WEB: web_score,
@@ -115,130 +304,83 @@ class CommandClassifier:
         reasoning = self._get_reasoning(text, command_type, scores)
         return command_type, confidence, reasoning
     def _score_patterns(self, text, patterns):
+        # Kept for callers of the old API; scores with compiled tables instead of rebuilding them.
+        pattern_set, matcher = compile_pattern_set(patterns)
+        return pattern_set.score(text, matcher.find(text.lower()))
+    def _found(self, text, found):
+        return self._tables.matcher.find(text) if found is None else found
+    def _contextual_system_score(self, text, found=None):
+        found = self._found(text, found)
         score = 0
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += 1
-        return score
-    def _contextual_system_score(self, text):
-        score = 0
-        if text.strip().lower().startswith(('search ', 'google ', 'find ', 'lookup ', 'look up ')):
+        if text.strip().lower().startswith(SEARCH_PREFIXES):
             return -10
-        if text.strip().lower().startswith(('open ', 'launch ', 'start ', 'run ', 'execute ', 'close ', 'quit ')):
+        if text.strip().lower().startswith(LAUNCH_PREFIXES):
             score += 3
-        apps = ['chrome', 'firefox', 'brave', 'edge', 'safari', 'notepad', 
-                'calculator', 'terminal', 'cmd', 'settings', 'explorer',
-                'finder', 'spotify', 'discord', 'steam', 'vlc', 'code', 'vscode',
-                'visual', 'studio', 'tool', 'app', 'application']
-        for app in apps:
-            if app in text:
-                score += 2
-        system_keywords = ['file', 'folder', 'directory', 'volume', 'brightness',
-                          'screenshot', 'taskbar', 'desktop', 'window']
-        for keyword in system_keywords:
-            if keyword in text:
-                score += 1
-        local_indicators = ['on computer', 'in computer', 'on pc', 'in pc', 
-                           'on system', 'in system', 'from system', 'on my computer', 'on this computer',
-                           'my pc', 'this pc', 'on laptop', 'in laptop',
-                           'computer me', 'pc me', 'system me', 'system se', 'mere computer',
-                           'meri pc', 'is computer']
-        for indicator in local_indicators:
-            if indicator in text:
-                score += 10
+        score += 2 * len(found.intersection(KNOWN_APPS))
+        score += len(found.intersection(SYSTEM_KEYWORDS))
+        score += 10 * len(found.intersection(LOCAL_INDICATORS))
         return score
-    def _contextual_web_score(self, text):
+    def _contextual_web_score(self, text, words=None, found=None):
+        found = self._found(text, found)
         score = 0
+        if words is None:
+            words = text.split()
         
         # Explicit search commands get high score
-        if text.strip().lower().startswith(('search ', 'google ', 'find ', 'lookup ', 'look up ')):
+        if text.strip().lower().startswith(SEARCH_PREFIXES):
             score += 10
-        if re.search(r'\b(search|find|lookup|google)\s+(for|about|on)\s+', text):
+        if not found.isdisjoint(SEARCH_VERBS) and SEARCH_PREPOSITION_RE.search(text):
             score += 8
         
         # Question words indicate information seeking
-        question_words = ['what', 'who', 'when', 'where', 'why', 'how',
-                         'kya', 'kaun', 'kab', 'kahan', 'kaise', 'kyun']
-        has_question_word = False
-        for word in question_words:
-            if word in text.split():
-                score += 1.5
-                has_question_word = True
+        question_hits = len(QUESTION_WORDS.intersection(words))
+        score += 1.5 * question_hits
+        has_question_word = question_hits > 0
         
         # Informational keywords
-        info_words = ['information', 'details', 'about', 'regarding',
-                     'jankari', 'bare mein', 'ke bare']
-        for word in info_words:
-            if word in text:
-                score += 1
+        score += len(found.intersection(INFO_WORDS))
         
         # URLs are clearly web-related
-        if re.search(r'\.(com|org|net|in|co)', text):
+        if '.' in text and DOMAIN_RE.search(text):
             score += 3
         
         # Explicit web indicators
-        web_indicators = ['google', 'search on internet', 'search online', 
-                         'internet pe', 'web pe', 'online search',
-                         'google karo', 'internet par']
-        for indicator in web_indicators:
-            if indicator in text:
-                score += 5
+        score += 5 * len(found.intersection(WEB_INDICATORS))
         
         # Penalize very short phrases without question words (likely conversation)
-        if len(text.split()) <= 2 and not has_question_word:
+        if len(words) <= 2 and not has_question_word:
             score -= 5
         
         # Conversational phrases should not be searches
-        conversation_indicators = ['thank', 'thanks', 'bye', 'hello', 'hi', 'sorry', 
-                                  'ok', 'okay', 'watching', 'listening']
-        for indicator in conversation_indicators:
-            if indicator in text:
-                score -= 8
+        score -= 8 * len(found.intersection(WEB_CONVERSATION_INDICATORS))
         
         # Local computer context negates web search
-        local_context = ['on computer', 'in computer', 'computer me', 'pc me', 
-                        'system me', 'from system', 'system se', 'on my pc', 'my computer']
-        for context in local_context:
-            if context in text:
-                score -= 10
+        score -= 10 * len(found.intersection(WEB_LOCAL_CONTEXT))
         
         return score
-    def _contextual_conversation_score(self, text):
+    def _contextual_conversation_score(self, text, words=None, found=None):
+        found = self._found(text, found)
         score = 0
+        if words is None:
+            words = text.split()
         
         # Boost short phrases (likely conversational)
-        if len(text.split()) <= 3:
+        if len(words) <= 3:
             score += 2
         
         # Strong conversation indicators - common phrases
-        strong_indicators = [
-            'thank you', 'thanks', 'thank', 'thankyou', 'thx',
-            'bye', 'goodbye', 'see you', 'take care',
-            'hello', 'hi', 'hey',
-            'sorry', 'apologies',
-            'ok', 'okay', 'alright', 'sure', 'got it',
-            'wow', 'cool', 'nice', 'great',
-        ]
-        for indicator in strong_indicators:
-            if indicator in text:
-                score += 5
+        score += 5 * len(found.intersection(STRONG_CONVERSATION_INDICATORS))
         
         # "watching", "listening" without question words = conversation
-        if any(word in text for word in ['watching', 'listening', 'viewing']):
-            if not any(qword in text for qword in ['what', 'who', 'when', 'where', 'why', 'how']):
+        if not found.isdisjoint(VIEWING_WORDS):
+            if found.isdisjoint(ENGLISH_QUESTION_WORDS):
                 score += 5
         
         # Pronouns addressing the assistant
-        pronouns = ['you', 'your', 'yourself', 'tum', 'tumhara', 'aap', 'aapka']
-        for pronoun in pronouns:
-            if pronoun in text.split():
-                score += 2
+        score += 2 * len(PRONOUNS.intersection(words))
         
         # Polite words boost
-        polite_words = ['please', 'kindly', 'kripa', 'meherbani']
-        for word in polite_words:
-            if word in text:
-                score += 1
+        score += len(found.intersection(POLITE_WORDS))
         
         # If text ends with punctuation like "!" or ".", likely conversational
         if text.endswith(('!', '.')):
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from Stats import percentile
+
+try:
+    from config import COMMAND_WORKERS, COMMAND_QUEUE_SIZE
+except ImportError:
+    COMMAND_WORKERS, COMMAND_QUEUE_SIZE = 4, 16
+
+COMMANDS = "commands"
+BROWSER = "browser"
+
+
+class LaneFull(Exception):
+    """Raised by ``submit`` when a lane already has its limit of commands waiting or running."""
+
+
+class _Lane:
+    def __init__(self, name, workers, limit):
+        self.name = name
+        self.workers = workers
+        self.limit = limit
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-lane")
+        self.in_flight = 0
+        self.counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "cancelled": 0}
+        self.waits = deque(maxlen=200)
+        self.runs = deque(maxlen=200)
+
+
+class CommandExecutor:
+    """Runs commands off the server's event loop, in bounded lanes of threads.
+
+    ``commands`` has ``workers`` threads for commands that only wait on
+    Gemini, the OS or the network. ``browser`` has one thread, so
+    commands that look like browser work queue in order instead of filling
+    the other lane while they wait for the driver; the driver itself is
+    guarded by AssistantSession.SharedDriver, whichever lane a command
+    that uses it ends up in. Each lane holds at most ``queue_size`` commands waiting or
+    running; past that ``submit`` raises ``LaneFull`` instead of queueing
+    without bound. ``submit`` returns a concurrent future, which the server
+    awaits with ``asyncio.wrap_future``.
+
+    A session runs one command at a time (AssistantSession's lock), so the
+    lanes only add parallelism across sessions: ``workers`` is how many
+    sessions can run commands at once. Commands that all use the default
+    session, as the desktop app and voice input do, run in turn, and the
+    extra workers just wait on that session.
+    """
+    def __init__(self, workers=COMMAND_WORKERS, queue_size=COMMAND_QUEUE_SIZE):
+        self._lock = threading.Lock()
+        self._lanes = {
+            COMMANDS: _Lane(COMMANDS, workers, queue_size),
+            BROWSER: _Lane(BROWSER, 1, queue_size),
+        }
+    def submit(self, lane_name, fn, *args, **kwargs):
+        lane = self._lanes[lane_name]
+        with self._lock:
+            if lane.in_flight >= lane.limit:
+                lane.counts["rejected"] += 1
+                raise LaneFull(f"{lane.name} lane is full ({lane.limit} commands waiting or running)")
+            lane.in_flight += 1
+            lane.counts["submitted"] += 1
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                with self._lock:
+                    lane.in_flight -= 1
+                    lane.counts["failed" if failed else "completed"] += 1
+                    lane.waits.append(started - submitted)
+                    lane.runs.append(time.perf_counter() - started)
+        try:
+            future = lane.pool.submit(run)
+        except RuntimeError:
+            with self._lock:
+                lane.in_flight -= 1
+            raise
+        future.add_done_callback(lambda f: f.cancelled() and self._cancelled(lane))
+        return future
+    def _cancelled(self, lane):
+        # Cancelled before it started, so run() never gave its place back.
+        with self._lock:
+            lane.in_flight -= 1
+            lane.counts["cancelled"] += 1
+    def shutdown(self, wait=False):
+        for lane in self._lanes.values():
+            lane.pool.shutdown(wait=wait, cancel_futures=True)
+    def stats(self):
+        with self._lock:
+            return {
+                name: dict(lane.counts,
+                           workers=lane.workers,
+                           limit=lane.limit,
+                           in_flight=lane.in_flight,
+                           wait_p95_ms=percentile(list(lane.waits), 95) * 1000,
+                           run_p50_ms=percentile(list(lane.runs), 50) * 1000,
+                           run_p95_ms=percentile(list(lane.runs), 95) * 1000)
+                for name, lane in self._lanes.items()
+            }
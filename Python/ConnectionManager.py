@@ -0,0 +1,183 @@
+import asyncio
+import json
+from collections import deque
+
+try:
+    from config import WS_CLIENT_QUEUE_SIZE, WS_SEND_TIMEOUT, WS_SLOW_CLIENT_POLICY
+except ImportError:
+    WS_CLIENT_QUEUE_SIZE, WS_SEND_TIMEOUT, WS_SLOW_CLIENT_POLICY = 256, 5.0, "coalesce"
+
+SLOW_CLIENT_POLICIES = ("coalesce", "disconnect")
+
+# Only the newest of these matters, so a backed-up client can skip the ones in between.
+LATEST_ONLY = frozenset({"voice_partial", "network_status"})
+
+
+class _Client:
+    def __init__(self, websocket, topics, max_queue):
+        self.websocket = websocket
+        self.topics = topics
+        # Topics left out while subscribed to everything (``topics`` is None).
+        self.excluded = set()
+        self.max_queue = max_queue
+        self.queue = deque()
+        self.ready = asyncio.Event()
+        self.writer = None
+        self.counts = {"sent": 0, "dropped": 0, "coalesced": 0}
+    def wants(self, topic):
+        if topic is None:
+            return True
+        return topic not in self.excluded if self.topics is None else topic in self.topics
+
+
+def _topic_set(topics):
+    # A bare string would otherwise become a set of its characters.
+    if isinstance(topics, str) or not isinstance(topics, (list, tuple, set, frozenset)) \
+            or not all(isinstance(topic, str) for topic in topics):
+        raise ValueError(f"topics must be a list of message types, got {topics!r}")
+    return set(topics)
+
+
+class ConnectionManager:
+    """WebSocket fan-out: a bounded send queue and a writer task per client.
+
+    ``publish`` serialises a message once and only appends it to each
+    subscribed client's queue, so a slow client never holds up the others
+    or the caller. A client subscribes to message types (the ``type``
+    field), all of them by default; unsubscribing from a topic while
+    subscribed to all of them leaves just that one out. When a client's queue is full,
+    ``coalesce`` drops older LATEST_ONLY messages of the same type, or else
+    the oldest queued message. ``disconnect`` closes the client instead.
+    A send that takes longer than ``send_timeout`` also drops the client.
+
+    Everything except ``publish_threadsafe`` runs on the server's event loop.
+    """
+    def __init__(self, max_queue=WS_CLIENT_QUEUE_SIZE, send_timeout=WS_SEND_TIMEOUT,
+                 slow_client_policy=WS_SLOW_CLIENT_POLICY):
+        if slow_client_policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError(f"Unknown slow client policy '{slow_client_policy}', expected one of {SLOW_CLIENT_POLICIES}")
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.slow_client_policy = slow_client_policy
+        self._clients = {}
+        self.counts = {"broadcasts": 0, "connected": 0, "disconnected": 0, "slow_disconnects": 0,
+                       "dropped": 0, "coalesced": 0}
+    @property
+    def active_connections(self):
+        return list(self._clients)
+    async def connect(self, websocket, topics=None):
+        topics = _topic_set(topics) if topics is not None else None
+        await websocket.accept()
+        client = _Client(websocket, topics or None, self.max_queue)
+        client.writer = asyncio.create_task(self._write(client))
+        self._clients[websocket] = client
+        self.counts["connected"] += 1
+        return client
+    def disconnect(self, websocket):
+        client = self._clients.pop(websocket, None)
+        if client is None:
+            return
+        self.counts["disconnected"] += 1
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+    def subscribe(self, websocket, topics):
+        topics = _topic_set(topics)
+        client = self._clients.get(websocket)
+        if client is not None:
+            client.topics = topics if topics and "*" not in topics else None
+            client.excluded.clear()
+    def unsubscribe(self, websocket, topics):
+        topics = _topic_set(topics)
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        if "*" in topics:
+            client.topics, client.excluded = set(), set()
+        elif client.topics is None:
+            client.excluded.update(topics)
+        else:
+            client.topics.difference_update(topics)
+    def topics(self, websocket):
+        client = self._clients.get(websocket)
+        return None if client is None or client.topics is None else sorted(client.topics)
+    def excluded_topics(self, websocket):
+        client = self._clients.get(websocket)
+        return [] if client is None else sorted(client.excluded)
+    async def send_personal_message(self, message, websocket):
+        # Through the client's queue, so it never interleaves with the writer task.
+        client = self._clients.get(websocket)
+        if client is not None:
+            self._enqueue(client, None, message if isinstance(message, str) else json.dumps(message))
+    async def broadcast(self, message):
+        self.publish(message)
+    def publish(self, message):
+        if isinstance(message, str):
+            self.publish_text(None, message)
+        else:
+            self.publish_text(message.get("type"), json.dumps(message))
+    def publish_text(self, topic, text):
+        self.counts["broadcasts"] += 1
+        for client in list(self._clients.values()):
+            if client.wants(topic):
+                self._enqueue(client, topic, text)
+    def publish_threadsafe(self, loop, message):
+        # From other threads: serialise there, hand only the queueing to the loop.
+        topic, text = (None, message) if isinstance(message, str) else (message.get("type"), json.dumps(message))
+        loop.call_soon_threadsafe(self.publish_text, topic, text)
+    def _enqueue(self, client, topic, text):
+        if len(client.queue) >= client.max_queue:
+            if self.slow_client_policy == "disconnect":
+                self._drop_slow(client)
+                return
+            if not self._coalesce(client, topic):
+                client.queue.popleft()
+                client.counts["dropped"] += 1
+                self.counts["dropped"] += 1
+        client.queue.append((topic, text))
+        client.ready.set()
+    def _coalesce(self, client, topic):
+        # Make room by dropping an older message that a newer one supersedes.
+        if topic in LATEST_ONLY:
+            stale = [entry for entry in client.queue if entry[0] == topic]
+        else:
+            stale = [entry for entry in client.queue if entry[0] in LATEST_ONLY][:1]
+        if not stale:
+            return False
+        for entry in stale:
+            client.queue.remove(entry)
+        client.counts["coalesced"] += len(stale)
+        self.counts["coalesced"] += len(stale)
+        return True
+    def _drop_slow(self, client):
+        self.counts["slow_disconnects"] += 1
+        self.disconnect(client.websocket)
+        asyncio.ensure_future(self._close(client.websocket))
+    async def _close(self, websocket):
+        try:
+            await websocket.close(code=1008)
+        except Exception:
+            pass
+    async def _write(self, client):
+        try:
+            while True:
+                await client.ready.wait()
+                while client.queue:
+                    _, text = client.queue.popleft()
+                    await asyncio.wait_for(client.websocket.send_text(text), self.send_timeout)
+                    client.counts["sent"] += 1
+                client.ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._drop_slow(client)
+        except Exception:
+            self.disconnect(client.websocket)
+    def stats(self):
+        return dict(self.counts,
+                    clients=len(self._clients),
+                    max_queue=self.max_queue,
+                    slow_client_policy=self.slow_client_policy,
+                    per_client=[dict(client.counts, queued=len(client.queue),
+                                     topics=None if client.topics is None else sorted(client.topics),
+                                     excluded=sorted(client.excluded))
+                                for client in self._clients.values()])
@@ -0,0 +1,526 @@
+import re
+from KeywordMatcher import KeywordMatcher
+
+WEB_PLATFORMS = ('youtube', 'google', 'instagram', 'facebook', 'twitter', 'amazon',
+                 'reddit', 'wikipedia', 'spotify', 'linkedin', 'github', 'chatgpt',
+                 'netflix', 'pinterest', 'tiktok', 'snapchat', 'whatsapp', 'telegram',
+                 'stackoverflow', 'medium', 'quora', 'ebay', 'imdb', 'yelp', 'twitch')
+KNOWN_WEBSITES = ('youtube', 'google', 'facebook', 'instagram', 'twitter', 'reddit',
+                  'github', 'amazon', 'netflix', 'spotify', 'linkedin', 'wikipedia',
+                  'flipkart', 'gmail', 'yahoo', 'bing', 'chatgpt', 'whatsapp')
+BROWSERS = ('chrome', 'firefox', 'edge', 'safari', 'brave', 'opera')
+SWITCHABLE_APPS = ('chrome', 'firefox', 'vscode', 'code', 'terminal', 'calculator',
+                   'notepad', 'word', 'excel', 'browser', 'spotify', 'discord',
+                   'steam', 'vlc', 'gimp', 'photoshop')
+APP_COMMANDS = ('save file', 'save', 'copy', 'paste', 'cut', 'undo', 'redo',
+                'select all', 'bold', 'italic', 'underline', 'find', 'replace')
+FILE_NAME_FILLERS = frozenset(('called', 'named', 'titled', 'a', 'the'))
+FILE_APP_KEYWORDS = {
+    'vscode': ['vscode', 'vs code', 'visual studio code', 'code editor'],
+    'chrome': ['chrome', 'browser', 'google chrome'],
+    'firefox': ['firefox'],
+    'notepad': ['notepad'],
+}
+
+# Keyword groups that trigger rules. Hindi/Hinglish synonyms sit next to their English verbs.
+OPEN_VERBS = ('open', 'launch', 'start')
+SEARCH_VERBS = ('search', 'searc', 'serch', 'find', 'lookup')
+CREATE_VERBS = ('create', 'make')
+TAB_MOVES = ('switch to', 'go to', 'move to')
+HINGLISH_OPEN = ('kholo', 'khol do', 'open karo', 'open kar do', 'chalu karo', 'chalu kar do',
+                 'shuru karo', 'start karo', 'launch karo')
+HINGLISH_PLAY = ('chalao', 'chala do', 'bajao', 'baja do', 'play karo', 'play kar do')
+HINGLISH_ON = ('pe', 'par', 'mein', 'me')
+HINGLISH_SEARCH = ('search', 'find', 'dhoondo', 'khojo')
+
+SEARCH_ON_PLATFORM_RE = re.compile(r'(?:search|find|lookup)\s+(?:for\s+)?(.+?)\s+(?:on|in)\s+(\w+)')
+VISIT_AND_SEARCH_RE = re.compile(r'(?:go to|open|use)\s+(\w+)\s+(?:and|to)\s+(?:search|find|lookup|write)\s+(?:for\s+)?(.+)')
+OPEN_OR_USE_RE = re.compile(r'(?:open|use)\s+(\w+)')
+PLATFORM_PE_SEARCH_RE = re.compile(r'(\w+)\s+(?:pe|par|mein|me)\s+(?:search|find|dhoondo|khojo)\s+(?:karo\s+)?(.+)')
+PLATFORM_PE_QUERY_SEARCH_RE = re.compile(r'^(\w+)\s+(?:pe|par|mein|me)\s+(.+?)\s+(?:search|dhoondo|khojo)(?:\s+karo)?$')
+OPEN_BROWSER_AND_SEARCH_RES = {
+    browser: re.compile(r'(?:open|launch|start)\s+(' + browser + r')\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)')
+    for browser in BROWSERS + ('browser',)
+}
+OPEN_AND_CREATE_FILE_RES = [
+    re.compile(r'(?:open|launch|start)\s+(.+?)\s+(?:and|,)\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+]
+APP_AND_CREATE_FILE_RES = [
+    re.compile(r'^(.+?)\s+and\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+]
+APP_AND_SEARCH_RE = re.compile(r'^(.+?)\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)')
+CREATE_FILE_RES = [
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))'),
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+and|\s+in|\s+to|$)'),
+]
+CREATE_FILE_TO_OPEN_RES = [
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+]
+DOWNLOAD_SOURCE_RES = [
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(web|internet|online|website)'), 'web'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(terminal|package\s+manager|apt|dnf|brew|choco)'), 'terminal'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(snap(?:\s+store)?)'), 'snap'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(flatpak)'), 'flatpak'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(app\s+store|microsoft\s+store|mac\s+app\s+store|gnome\s+software)'), 'appstore'),
+]
+NEW_TAB_RE = re.compile(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?tab')
+NEW_TAB_URL_RE = re.compile(r'(?:and\s+)?(?:open|go to)\s+(\w+(?:\.\w+)?)')
+FIRST_TAB_RE = re.compile(r'(switch to|go to|move to)\s+first\s+tab')
+LAST_TAB_RE = re.compile(r'(switch to|go to|move to)\s+last\s+tab')
+NEXT_TAB_RE = re.compile(r'(switch to|go to|move to)\s+next\s+tab')
+PREVIOUS_TAB_RE = re.compile(r'(switch to|go to|move to)\s+prev(?:ious)?\s+tab')
+TAB_NUMBER_RE = re.compile(r'(switch to|go to|move to)\s+tab\s+(\d+)')
+TAB_ORDINAL_RE = re.compile(r'(switch to|go to|move to)\s+(\d+)(?:st|nd|rd|th)\s+tab')
+CLOSE_TAB_RE = re.compile(r'close\s+(?:this\s+|current\s+)?tab')
+CLOSE_OTHER_TABS_RE = re.compile(r'close\s+(?:all\s+)?other\s+tabs')
+LIST_TABS_RE = re.compile(r'(list|show)\s+(?:all\s+)?tabs')
+NEW_WINDOW_RE = re.compile(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?window')
+INCOGNITO_WINDOW_RE = re.compile(r'(create|open|new)\s+(?:an?\s+)?(?:incognito|private)\s+window')
+GO_BACK_RE = re.compile(r'\bgo\s+back\b|\bback\b')
+GO_FORWARD_RE = re.compile(r'\bgo\s+forward\b|\bforward\b')
+CURRENT_URL_RE = re.compile(r'(what\s+is|show|get|tell)\s+(the\s+)?current\s+url')
+PAGE_TITLE_RE = re.compile(r'(what\s+is|show|get|tell)\s+(the\s+)?page\s+title')
+ORDINAL_RE = re.compile(r'(\d+)(st|nd|rd|th)?')
+CLICK_TARGET_RES = [
+    re.compile(r'click\s+on\s+(?:the\s+)?(.+)'),
+    re.compile(r'press\s+on\s+(?:the\s+)?(.+)'),
+    re.compile(r'select\s+(?:the\s+)?(.+)'),
+    re.compile(r'click\s+(.+)'),
+]
+CALLED_RE = re.compile(r'(?:called|titled|named)\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+file|\s+page|\s+link|\s+in|\s+on|\s+can|$)')
+HINGLISH_OPEN_RE = re.compile(r'^([a-z0-9.]+(?: [a-z0-9.]+){0,2}?)\s+(?:ko\s+)?(?:' + '|'.join(HINGLISH_OPEN) + r')$')
+# "youtube pe gaane chalao": a leading "<platform> pe" names the platform, not part of the query.
+HINGLISH_PLAY_RE = re.compile(r"^(?:(" + '|'.join(WEB_PLATFORMS) + r")\s+(?:pe|par|mein|me)\s+)?"
+                              r"([\w .'-]+?)\s+(?:ko\s+)?(?:" + '|'.join(HINGLISH_PLAY) + r')$')
+GREETING_ONLY_RE = re.compile(r'^(hello|hi|hey|thank you|thanks|how are you|namaste|kaise ho)[\s\.,!?]*$')
+
+# An extractor returns an action, None when its rule does not apply after all, or CLAIMED
+# when the rule owns the command but could not fill it in, which leaves it to the tail rules.
+CLAIMED = object()
+
+
+def _steps(*steps):
+    return {"action": "complex_command", "steps": list(steps)}
+
+
+def _vscode_alias(app_name):
+    app_name = app_name.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
+    return 'vscode' if app_name.strip() == 'vs' else app_name
+
+
+def _platform_search(platform, query):
+    if any(indicator in platform for indicator in WEB_PLATFORMS) or len(platform) > 3:
+        return {"action": "platform_search", "platform": platform, "query": query}
+    return None
+
+
+def _search_on_platform(t, text):
+    match = SEARCH_ON_PLATFORM_RE.search(t)
+    if match:
+        query, platform = match.groups()
+        return _platform_search(platform.strip(), query.strip())
+    return None
+
+
+def _visit_and_search(t, text):
+    match = VISIT_AND_SEARCH_RE.search(t)
+    if not match:
+        return None
+    platform_or_browser, query = match.groups()
+    query = query.strip()
+    platform_or_browser = platform_or_browser.strip().lower()
+    if any(browser in platform_or_browser for browser in BROWSERS):
+        app_match = OPEN_OR_USE_RE.search(t)
+        if app_match:
+            return _steps({"action": "open_app", "app_name": app_match.group(1).strip()},
+                          {"action": "web_search", "query": query})
+    return _platform_search(platform_or_browser, query)
+
+
+def _platform_pe_search(t, text):
+    match = PLATFORM_PE_SEARCH_RE.search(t) or PLATFORM_PE_QUERY_SEARCH_RE.search(t)
+    if match:
+        platform, query = match.groups()
+        return _platform_search(platform.strip(), query.strip())
+    return None
+
+
+def _open_browser_and_search(t, text):
+    for browser, pattern in OPEN_BROWSER_AND_SEARCH_RES.items():
+        if browser in t:
+            match = pattern.search(t)
+            if match:
+                return _steps({"action": "open_app", "app_name": match.group(1).strip()},
+                              {"action": "web_search", "query": match.group(2).strip()})
+    return None
+
+
+def _open_and_create_file(t, text):
+    for pattern in OPEN_AND_CREATE_FILE_RES:
+        match = pattern.search(t)
+        if match:
+            app_name = _vscode_alias(match.group(1).strip().rstrip(','))
+            file_name = match.group(2).strip().rstrip('.,!?;:')
+            if file_name and file_name not in FILE_NAME_FILLERS and file_name != 'it':
+                return _steps({"action": "open_app", "app_name": app_name},
+                              {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": app_name})
+    return None
+
+
+def _web_search(t, text):
+    return {"action": "web_search", "query": t.split(None, 1)[1] if len(t.split()) > 1 else t}
+
+
+def _switch_app(t, text):
+    if 'switch back' in t or 'previous app' in t:
+        return {"action": "switch_app", "app_name": "previous"}
+    app_name = t
+    for prefix in ('switch to ', 'go to ', 'focus on '):
+        if t.startswith(prefix):
+            app_name = t[len(prefix):].strip()
+            break
+    if any(keyword in app_name for keyword in SWITCHABLE_APPS):
+        return {"action": "switch_app", "app_name": app_name}
+    return CLAIMED
+
+
+def _open_app(t, text):
+    app_name = t.split(None, 1)[1] if len(t.split()) > 1 else t
+    lowered = app_name.lower()
+    if ('and' in lowered or ',' in lowered) and ('create' in lowered or 'make' in lowered) and 'file' in lowered:
+        normalized = lowered.replace(',', ' and ')
+        for pattern in APP_AND_CREATE_FILE_RES:
+            match = pattern.search(normalized)
+            if match:
+                actual_app = _vscode_alias(match.group(1).strip().rstrip(','))
+                file_name = match.group(2).strip().rstrip('.,!?;:')
+                if file_name and file_name not in FILE_NAME_FILLERS and file_name != 'it':
+                    return _steps({"action": "open_app", "app_name": actual_app},
+                                  {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": actual_app})
+    if ('and' in lowered or ',' in lowered) and any(verb in lowered for verb in SEARCH_VERBS):
+        normalized = lowered.replace(',', ' and ')
+        browsers = BROWSERS + ('browser',)
+        if any(browser in normalized for browser in browsers):
+            match = APP_AND_SEARCH_RE.search(normalized)
+            if match and any(browser in match.group(1).strip() for browser in browsers):
+                return _steps({"action": "open_app", "app_name": match.group(1).strip()},
+                              {"action": "web_search", "query": match.group(2).strip()})
+        parts = app_name.split('and')
+        if len(parts) >= 2:
+            query_parts = []
+            for part in parts[1:]:
+                cleaned = part.replace('search', '').replace('searc', '').replace('serch', '').replace('find', '').replace('lookup', '').strip()
+                if cleaned:
+                    query_parts.append(cleaned)
+            query = ' '.join(query_parts).strip()
+            if any(browser in parts[0].strip().lower() for browser in browsers):
+                return _steps({"action": "open_app", "app_name": parts[0].strip()},
+                              {"action": "web_search", "query": query})
+            return {"action": "platform_search", "platform": parts[0].strip(), "query": query}
+    if lowered in ('vs', 'vscode', 'visual studio', 'visual studio code', 'code'):
+        app_name = 'vscode'
+    return {"action": "open_app", "app_name": app_name}
+
+
+def _mentions_vscode(t):
+    return 'vscode' in t or 'visual studio' in t or 'code' in t
+
+
+def _create_file(t, text, open_in_app=None):
+    for pattern in CREATE_FILE_RES:
+        match = pattern.search(t)
+        if match:
+            file_name = match.group(1).strip().rstrip('.,!?;:')
+            if file_name and file_name not in FILE_NAME_FILLERS:
+                return {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True,
+                        "open_in_app": 'vscode' if _mentions_vscode(t) else open_in_app}
+    return CLAIMED
+
+
+def _create_file_to_open(t, text):
+    app_mentioned = None
+    for app_key, keywords in FILE_APP_KEYWORDS.items():
+        if any(keyword in t for keyword in keywords):
+            app_mentioned = app_key
+            break
+    if 'open it' in t or 'open in' in t or app_mentioned:
+        for pattern in CREATE_FILE_TO_OPEN_RES:
+            match = pattern.search(t)
+            if match:
+                file_name = match.group(1).strip().rstrip('.,!?;:')
+                if file_name and file_name not in FILE_NAME_FILLERS and file_name != 'it':
+                    return _steps({"action": "create_file", "file_path": file_name, "create_folder_if_missing": True,
+                                   "open_in_app": app_mentioned or 'vscode'})
+    return app_mentioned
+
+
+def _create_file_in_app(t, text):
+    app_mentioned = _create_file_to_open(t, text)
+    if isinstance(app_mentioned, dict):
+        return app_mentioned
+    return _create_file(t, text, open_in_app=app_mentioned)
+
+
+def _open_file_after_create(t, text):
+    result = _create_file_to_open(t, text)
+    return result if isinstance(result, dict) else None
+
+
+def _type_text(t, text):
+    for prefix in ('type ', 'write ', 'enter '):
+        if t.startswith(prefix):
+            return {"action": "app_command", "command": "type", "params": {"text": text[len(prefix):].strip()}}
+    return None
+
+
+def _app_command(t, text):
+    for command in APP_COMMANDS:
+        if command in t:
+            return {"action": "app_command", "command": command}
+    return None
+
+
+def _play_media(t, text):
+    query = t.replace('play ', '').replace('the ', '').replace('first ', '').strip()
+    return {"action": "play_media", "query": query, "platform": "youtube"}
+
+
+def _download_research(t, text):
+    topic = t
+    for remove in ('download', 'fetch', 'get', 'me', 'all', 'research', 'of', 'on', 'about', 'for'):
+        topic = topic.replace(remove, '')
+    return {"action": "download_research", "topic": topic.strip(), "max_papers": 5}
+
+
+def _download_app(t, text):
+    app_name = t.split(None, 1)[1] if len(t.split()) > 1 else t
+    app_name = app_name.replace('for me', '').strip()
+    if 'research' in app_name or 'papers' in app_name:
+        topic = app_name.replace('research', '').replace('papers', '').replace('on', '').replace('about', '').strip()
+        return {"action": "download_research", "topic": topic, "max_papers": 5}
+    source = "web"
+    for pattern, src in DOWNLOAD_SOURCE_RES:
+        if pattern.search(app_name):
+            source = src
+            app_name = pattern.sub('', app_name).strip()
+            break
+    return {"action": "download_app", "app_name": app_name, "source": source}
+
+
+def _visit_website(t, text):
+    target = t.replace('go to ', '').replace('goto ', '').replace('open ', '').replace('visit ', '').strip()
+    if 'and search' in target or 'and find' in target or 'and write' in target:
+        parts = target.split('and')
+        if len(parts) >= 2:
+            query = ' '.join(parts[1:]).replace('search', '').replace('find', '').replace('write', '').strip()
+            return {"action": "platform_search", "platform": parts[0].strip(), "query": query}
+    if any(site in target for site in KNOWN_WEBSITES):
+        return {"action": "open_website", "url": f"{target}.com"}
+    if any(app in target for app in ('steam', 'chrome', 'firefox', 'calculator', 'discord', 'vscode', 'code')):
+        return {"action": "open_app", "app_name": target}
+    if '.com' in target or '.org' in target or '.net' in target or '.io' in target:
+        return {"action": "open_website", "url": target}
+    return {"action": "open_website", "url": f"{target}.com"}
+
+
+def _browser(command, pattern=None, **params):
+    # Browser control with no slots; ``pattern`` must match too when given.
+    result = dict({"action": "browser_control", "command": command}, **params)
+    if pattern is None:
+        return lambda t, text: result
+    return lambda t, text: dict(result) if pattern.search(t) else None
+
+
+def _keys(command):
+    result = {"action": "app_command", "command": command}
+    return lambda t, text: dict(result)
+
+
+def _new_tab(t, text):
+    if not NEW_TAB_RE.search(t):
+        return None
+    url_match = NEW_TAB_URL_RE.search(t)
+    if url_match:
+        return {"action": "browser_control", "command": "new_tab", "url": url_match.group(1)}
+    return {"action": "browser_control", "command": "new_tab"}
+
+
+def _tab_by_number(pattern):
+    def extract(t, text):
+        match = pattern.search(t)
+        if match:
+            return {"action": "browser_control", "command": "switch_to_tab", "tab_index": int(match.group(2))}
+        return None
+    return extract
+
+
+def _click(t, text):
+    number_match = ORDINAL_RE.search(t)
+    if number_match:
+        element_type = 'link'
+        for kind in ('video', 'link', 'button', 'result'):
+            if kind in t:
+                element_type = kind
+                break
+        return {"action": "browser_control", "command": "click_nth", "position": int(number_match.group(1)),
+                "element_type": element_type}
+    for pattern in CLICK_TARGET_RES:
+        match = pattern.search(t)
+        if match:
+            text_to_click = match.group(1).strip()
+            if 'called' in t or 'titled' in t or 'named' in t:
+                called_match = CALLED_RE.search(t)
+                if called_match:
+                    text_to_click = called_match.group(1).strip()
+            if text_to_click not in ('cross', 'cross button', 'popup', 'first', 'first link', 'that', 'this', 'it') and len(text_to_click) > 2:
+                return {"action": "browser_control", "command": "click_by_text", "text": text_to_click}
+    return {"action": "browser_control", "command": "click_first_link"}
+
+
+def _hinglish_open(t, text):
+    match = HINGLISH_OPEN_RE.match(t)
+    return {"action": "open_app", "app_name": match.group(1)} if match else None
+
+
+def _hinglish_play(t, text):
+    match = HINGLISH_PLAY_RE.match(t)
+    if not match:
+        return None
+    return {"action": "play_media", "query": match.group(2).strip(), "platform": match.group(1) or "youtube"}
+
+
+def _greeting(t, text):
+    return {"action": "conversation", "text": text} if GREETING_ONLY_RE.match(t) else None
+
+
+def _single_word(t, text):
+    return {"action": "open_app", "app_name": t} if len(t.split()) == 1 and len(t) > 2 else None
+
+
+def _any(*keywords):
+    return (keywords,)
+
+
+# (keyword groups, required prefixes or None, extractor) in priority order. A rule is tried
+# only when every group has a keyword in the command and the command starts with one of the
+# prefixes. The first action returned wins. The first rules pick multi-part commands out of
+# anywhere in the text and never claim; from "search ..." on, a claimed command skips the rest
+# and goes to FALLBACK_TAIL_RULES.
+FALLBACK_RULES = [
+    (_any('search', 'find', 'lookup'), None, _search_on_platform),
+    ((('go to', 'open', 'use'), ('search', 'find', 'lookup', 'write')), None, _visit_and_search),
+    ((HINGLISH_ON, HINGLISH_SEARCH), None, _platform_pe_search),
+    ((OPEN_VERBS, SEARCH_VERBS, BROWSERS + ('browser',)), None, _open_browser_and_search),
+    ((OPEN_VERBS, CREATE_VERBS, ('file',)), None, _open_and_create_file),
+    (_any('search', 'google', 'find', 'lookup'), ('search ', 'google ', 'find ', 'lookup '), _web_search),
+    (_any('switch to', 'switch back', 'go to', 'focus on'), ('switch to ', 'switch back', 'go to ', 'focus on '), _switch_app),
+    (_any('open', 'launch', 'start', 'run'), ('open ', 'launch ', 'start ', 'run '), _open_app),
+    (_any('create file', 'make file'), None, _create_file),
+    ((CREATE_VERBS, ('file',)), None, _create_file_in_app),
+    (_any('type', 'write', 'enter'), ('type ', 'write ', 'enter '), _type_text),
+    (_any(*APP_COMMANDS), None, _app_command),
+    (_any('play'), ('play ',), _play_media),
+    ((('research',), ('download', 'fetch', 'get')), None, _download_research),
+    (_any('download', 'install', 'get'), ('download ', 'install ', 'get '), _download_app),
+    (_any('goto', 'visit'), ('goto ', 'visit '), _visit_website),
+    (_any('list app', 'show app'), None, lambda t, text: {"action": "list_apps"}),
+    (_any("what's on", 'show page', 'read page', 'page content'), None, _browser("show_page")),
+    (_any('scroll down'), None, _browser("scroll_down")),
+    (_any('scroll up'), None, _browser("scroll_up")),
+    (_any('close popup', 'close pop up', 'press cross', 'click cross'), None, _browser("close_popup")),
+    (_any('volume up', 'increase volume'), None, _browser("volume_up")),
+    (_any('volume down', 'decrease volume'), None, _browser("volume_down")),
+    ((('create', 'open', 'new'), ('tab',)), None, _new_tab),
+    ((TAB_MOVES, ('first',), ('tab',)), None, _browser("first_tab", FIRST_TAB_RE)),
+    ((TAB_MOVES, ('last',), ('tab',)), None, _browser("last_tab", LAST_TAB_RE)),
+    (_any('next tab'), None, _browser("next_tab")),
+    ((TAB_MOVES, ('next',), ('tab',)), None, _browser("next_tab", NEXT_TAB_RE)),
+    (_any('previous tab'), None, _browser("previous_tab")),
+    ((TAB_MOVES, ('prev',), ('tab',)), None, _browser("previous_tab", PREVIOUS_TAB_RE)),
+    ((TAB_MOVES, ('tab',)), None, _tab_by_number(TAB_NUMBER_RE)),
+    ((TAB_MOVES, ('tab',)), None, _tab_by_number(TAB_ORDINAL_RE)),
+    ((('close',), ('tab',)), None, _browser("close_tab", CLOSE_TAB_RE)),
+    ((('close',), ('other',), ('tabs',)), None, _browser("close_other_tabs", CLOSE_OTHER_TABS_RE)),
+    ((('list', 'show'), ('tabs',)), None, _browser("list_tabs", LIST_TABS_RE)),
+    ((('create', 'open', 'new'), ('window',)), None, _browser("new_window", NEW_WINDOW_RE)),
+    ((('create', 'open', 'new'), ('incognito', 'private'), ('window',)), None, _browser("incognito_window", INCOGNITO_WINDOW_RE)),
+    ((('maximize',), ('window',)), None, _browser("maximize")),
+    ((('minimize',), ('window',)), None, _browser("minimize")),
+    (_any('fullscreen', 'full screen'), None, _browser("fullscreen")),
+    (_any('back'), None, _browser("go_back", GO_BACK_RE)),
+    (_any('forward'), None, _browser("go_forward", GO_FORWARD_RE)),
+    (_any('refresh', 'reload'), None, _browser("refresh")),
+    ((('current',), ('url',)), None, _browser("get_url", CURRENT_URL_RE)),
+    ((('page',), ('title',)), None, _browser("get_title", PAGE_TITLE_RE)),
+    ((('click',), ('first',)), None, _browser("click_first_link")),
+    (_any('press enter', 'hit enter', 'press return'), None, _keys("enter")),
+    (_any('press escape', 'hit escape', 'press esc'), None, _keys("escape")),
+    (_any('press tab', 'hit tab'), None, _keys("tab")),
+    (_any('delete', 'backspace'), None, _keys("delete")),
+    (_any('click', 'press', 'select'), None, _click),
+    (_any(*HINGLISH_OPEN), None, _hinglish_open),
+    (_any(*HINGLISH_PLAY), None, _hinglish_play),
+]
+FALLBACK_TAIL_RULES = [
+    ((CREATE_VERBS, ('file',)), None, _open_file_after_create),
+    ((), None, _greeting),
+    ((), None, _single_word),
+]
+
+
+class FallbackParser:
+    """Regex/keyword command parser used when Gemini is unavailable or skipped.
+
+    Every trigger keyword of every rule is compiled into one
+    ``KeywordMatcher``, so a single scan of the command finds all of them.
+    Only the rules whose keyword groups are all present get their
+    extractor run, in table order, so adding actions does not add a check
+    per action to every command.
+    """
+    def __init__(self, rules=FALLBACK_RULES, tail_rules=FALLBACK_TAIL_RULES):
+        self.rules = [(tuple(frozenset(group) for group in groups), prefixes, extract)
+                      for groups, prefixes, extract in list(rules) + list(tail_rules)]
+        self.tail_start = len(rules)
+        self.unfiltered = frozenset(index for index, (groups, _, _) in enumerate(self.rules) if not groups)
+        self.by_keyword = {}
+        for index, (groups, _, _) in enumerate(self.rules):
+            if groups:
+                # Any keyword of the rarest-looking group will do to nominate the rule.
+                for keyword in min(groups, key=len):
+                    self.by_keyword.setdefault(keyword, set()).add(index)
+        self.matcher = KeywordMatcher(keyword for groups, _, _ in self.rules for group in groups for keyword in group)
+    def candidates(self, text):
+        """(found keywords, indices of rules that may apply to ``text``, in priority order)."""
+        found = self.matcher.find(text)
+        nominated = set(self.unfiltered)
+        for keyword in found.intersection(self.by_keyword):
+            nominated |= self.by_keyword[keyword]
+        return found, sorted(nominated)
+    def parse(self, text, cleaned):
+        """Action JSON for ``text``; ``cleaned`` is ``text`` after command preprocessing."""
+        t = cleaned.lower().strip()
+        found, candidates = self.candidates(t)
+        resume = 0
+        for index in candidates:
+            if index < resume:
+                continue
+            groups, prefixes, extract = self.rules[index]
+            if prefixes and not t.startswith(prefixes):
+                continue
+            if not all(group & found for group in groups):
+                continue
+            result = extract(t, text)
+            if result is CLAIMED:
+                resume = self.tail_start
+            elif result is not None:
+                return result
+        return {"action": "web_search", "query": cleaned}
+
+
+fallback_parser = FallbackParser()
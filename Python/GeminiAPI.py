@@ -1,74 +1,281 @@
 
 import requests
 import json
+import threading
+import time
+import atexit
+import functools
+import hashlib
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from requests.adapters import HTTPAdapter
 from config import GEMINI_API_KEY
+from memory import MemoryPersistence, ParseCache
+from memory.parse_cache import normalize_key
+from CircuitBreaker import CircuitBreaker, CircuitOpenError
+from Stats import percentile
+from TextNormalizer import preprocess_command, strip_fillers
+from FallbackParser import fallback_parser
+from GeminiReplay import GeminiRecorder
 
-class GeminiAssistant:
-    def __init__(self):
-        self.api_key = GEMINI_API_KEY
-        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.api_key}"
-        self.headers = {
-            "Content-Type": "application/json"
-        }
-        import platform
-        self.os_name = platform.system()
-        self.default_browser = self._detect_default_browser()
-    def _detect_default_browser(self):
-        import platform
-        os_name = platform.system()
-        if os_name == "Linux":
-            return "Chrome/Firefox"
-        elif os_name == "Darwin":
-            return "Safari"
-        elif os_name == "Windows":
-            return "Edge/Chrome"
-        return "Chrome"
-    def _preprocess_text(self, text):
-        import re
-        cleaned = text
-        original = text
-        if 'research' in cleaned.lower() and ('download' in cleaned.lower() or 'fetch' in cleaned.lower()):
-            browser_pattern = re.search(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', 
-                                       cleaned, flags=re.IGNORECASE)
-            if browser_pattern:
-                cleaned = re.sub(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', '', 
-                               cleaned, flags=re.IGNORECASE)
-                return cleaned.strip()
-        browser_search = re.search(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+(go to|search|find|lookup)?\s*(.+)', 
-                                   cleaned, flags=re.IGNORECASE)
-        if browser_search:
-            target = browser_search.group(6).strip()
-            return f"search {target}"
-        
-        cleaned = re.sub(r',\s+', ' and ', cleaned, flags=re.IGNORECASE)
-        
-        if ('create' in cleaned.lower() or 'make' in cleaned.lower()) and 'file' in cleaned.lower():
-            cleaned = re.sub(r'^(i\s+want\s+you\s+to|i\s+want|please|can\s+you|could\s+you|would\s+you)\s+', '', cleaned, flags=re.IGNORECASE)
-        
-        cleaned = re.sub(r'^(hello|hi|hey|good morning|good afternoon|good evening|namaste)\s+', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\b(bot|chatbot|assistant|either)\b', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\b(what i want you to do is|i want you to|i need you to)\b', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\bi would say\b', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        cleaned = re.sub(r'^[,\s]+', '', cleaned)
-        cleaned = cleaned.strip()
-        return cleaned if len(cleaned) > 2 else text
-    def parse_command_to_json(self, text):
-        try:
-            cleaned_text = self._preprocess_text(text)
-            if cleaned_text != text:
-                print(f"📝 Cleaned: '{text}' → '{cleaned_text}'")
-            os_friendly = {
-                'Windows': 'Windows',
-                'Linux': 'Linux',
-                'Darwin': 'macOS'
-            }.get(self.os_name, self.os_name)
-            prompt = f"""You are a Command Understanding AI for a cross-platform voice assistant.
+try:
+    from config import GEMINI_API_BASE
+except ImportError:
+    GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+try:
+    from config import GEMINI_MODEL
+except ImportError:
+    GEMINI_MODEL = "gemini-2.5-flash"
+
+try:
+    from config import PARSE_CACHE_ENABLED, PARSE_CACHE_SIZE, PARSE_CACHE_TTL
+except ImportError:
+    PARSE_CACHE_ENABLED = True
+    PARSE_CACHE_SIZE = 512
+    PARSE_CACHE_TTL = 7 * 24 * 3600
+
+try:
+    from config import SPECULATIVE_PARSE, SPECULATIVE_PARSE_BUDGET
+except ImportError:
+    SPECULATIVE_PARSE = True
+    SPECULATIVE_PARSE_BUDGET = 1.5
+
+try:
+    from config import GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET, GEMINI_TIMEOUT_MULTIPLIER, GEMINI_MIN_TIMEOUT
+except ImportError:
+    GEMINI_BREAKER_FAILURES = 3
+    GEMINI_BREAKER_RESET = 30.0
+    GEMINI_TIMEOUT_MULTIPLIER = 3.0
+    GEMINI_MIN_TIMEOUT = 2.0
+
+try:
+    from config import COMMAND_PROMPT_STYLE
+except ImportError:
+    COMMAND_PROMPT_STYLE = "compact"
+
+try:
+    from config import GEMINI_RECORD_PATH
+except ImportError:
+    GEMINI_RECORD_PATH = None
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    # One keep-alive pool for every assistant, so commands reuse the TLS connection.
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
+def parse_cache_version():
+    # Changes with the model, prompt style, instruction text or response schema, any of which can change the parses.
+    import platform
+    instruction = command_instruction(COMMAND_PROMPT_STYLE, platform.system(), "{browser}")
+    signature = json.dumps([GEMINI_MODEL, COMMAND_PROMPT_STYLE, instruction, COMMAND_RESPONSE_SCHEMA], sort_keys=True)
+    return hashlib.sha256(signature.encode("utf-8")).hexdigest()[:16]
+
+def get_parse_cache():
+    # Shared by every assistant and kept on disk, so repeated commands skip the Gemini round trip.
+    global _parse_cache
+    if _parse_cache is None and PARSE_CACHE_ENABLED:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                persistence = MemoryPersistence()
+                cache = ParseCache(max_entries=PARSE_CACHE_SIZE, ttl_seconds=PARSE_CACHE_TTL,
+                                   version=parse_cache_version())
+                cache.from_dict(persistence.load_parse_cache())
+                atexit.register(lambda: persistence.save_parse_cache(cache.to_dict()))
+                _parse_cache = cache
+    return _parse_cache
+
+_recorder = None
+
+def start_recording(path):
+    # Capture every Gemini exchange to ``path`` (saved at exit) for offline replay.
+    global _recorder
+    recorder = GeminiRecorder(path)
+    atexit.register(recorder.save)
+    _recorder = recorder
+    return recorder
+
+def stop_recording():
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.save()
+    return recorder
+
+if GEMINI_RECORD_PATH:
+    start_recording(GEMINI_RECORD_PATH)
+
+class SpeculationLog:
+    """Outcomes of racing Gemini against the local parsers, and where they disagreed.
+
+    Disagreements are kept (bounded) and saved with the parse cache, to tune
+    the regex fallback and the local intent rules against what Gemini said.
+    """
+    def __init__(self, max_disagreements=200):
+        self._lock = threading.Lock()
+        self.disagreements = deque(maxlen=max_disagreements)
+        self.counts = {"remote": 0, "budget_missed": 0, "late": 0, "remote_failed": 0,
+                       "agreements": 0, "disagreements": 0}
+    def record(self, outcome, kind=None, text=None, local=None, remote=None):
+        with self._lock:
+            self.counts[outcome] += 1
+            if remote is None:
+                return
+            if local == remote:
+                self.counts["agreements"] += 1
+                return
+            self.counts["disagreements"] += 1
+            self.disagreements.append({"time": time.time(), "kind": kind, "text": text,
+                                       "local": local, "remote": remote, "outcome": outcome})
+    def stats(self):
+        with self._lock:
+            compared = self.counts["agreements"] + self.counts["disagreements"]
+            return dict(self.counts,
+                        budget_seconds=SPECULATIVE_PARSE_BUDGET,
+                        agreement_rate=self.counts["agreements"] / compared if compared else 0.0,
+                        recent_disagreements=list(self.disagreements)[-5:])
+    def to_list(self):
+        with self._lock:
+            return list(self.disagreements)
+    def from_list(self, entries):
+        with self._lock:
+            self.disagreements.extend(entries)
+
+_speculation_log = None
+_speculation_pool = None
+_speculation_lock = threading.Lock()
+
+def get_speculation_log():
+    global _speculation_log
+    if _speculation_log is None:
+        with _speculation_lock:
+            if _speculation_log is None:
+                persistence = MemoryPersistence()
+                log = SpeculationLog()
+                log.from_list(persistence.load_parse_disagreements())
+                atexit.register(lambda: persistence.save_parse_disagreements(log.to_list()))
+                _speculation_log = log
+    return _speculation_log
+
+def get_speculation_pool():
+    # Remote parses run here so the caller can give up on them at the budget.
+    global _speculation_pool
+    if _speculation_pool is None:
+        with _speculation_lock:
+            if _speculation_pool is None:
+                _speculation_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gemini-speculate")
+    return _speculation_pool
+
+class StreamStats:
+    """Time to first token and total time of streamed answers (recent window)."""
+    def __init__(self, window=200):
+        self._lock = threading.Lock()
+        self.ttft = deque(maxlen=window)
+        self.total = deque(maxlen=window)
+        self.streams = 0
+        self.failures = 0
+    def record(self, ttft, total):
+        with self._lock:
+            self.streams += 1
+            if ttft is None:
+                self.failures += 1
+                return
+            self.ttft.append(ttft)
+            self.total.append(total)
+    def stats(self):
+        with self._lock:
+            return {
+                "streams": self.streams,
+                "failures": self.failures,
+                "ttft_ms_p50": 1000 * percentile(self.ttft, 50),
+                "ttft_ms_p95": 1000 * percentile(self.ttft, 95),
+                "total_ms_p50": 1000 * percentile(self.total, 50),
+            }
+
+stream_stats = StreamStats()
+# Shared by every client: when Gemini is down, calls fail fast and callers use the local parsers.
+gemini_breaker = CircuitBreaker("Gemini", failure_threshold=GEMINI_BREAKER_FAILURES,
+                                reset_timeout=GEMINI_BREAKER_RESET, multiplier=GEMINI_TIMEOUT_MULTIPLIER,
+                                min_timeout=GEMINI_MIN_TIMEOUT)
+
+OS_NAMES = {
+    'Windows': 'Windows',
+    'Linux': 'Linux',
+    'Darwin': 'macOS'
+}
+
+_STEP_PROPERTIES = {
+    "action": {"type": "STRING"},
+    "app_name": {"type": "STRING"},
+    "command": {"type": "STRING"},
+    "params": {"type": "OBJECT", "properties": {"text": {"type": "STRING"}}},
+    "query": {"type": "STRING"},
+    "platform": {"type": "STRING"},
+    "url": {"type": "STRING"},
+    "text": {"type": "STRING"},
+    "source": {"type": "STRING"},
+    "topic": {"type": "STRING"},
+    "max_papers": {"type": "INTEGER"},
+    "file_path": {"type": "STRING"},
+    "folder_path": {"type": "STRING"},
+    "create_folder_if_missing": {"type": "BOOLEAN"},
+    "open_in_app": {"type": "STRING"},
+    "destination": {"type": "STRING"},
+    "tab_index": {"type": "INTEGER"},
+    "position": {"type": "INTEGER"},
+    "element_type": {"type": "STRING"},
+}
+
+# Gemini's JSON mode schema (OpenAPI subset, no recursion): one action object,
+# whose complex_command steps are flat action objects.
+COMMAND_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": dict(_STEP_PROPERTIES, steps={
+        "type": "ARRAY",
+        "items": {"type": "OBJECT", "properties": _STEP_PROPERTIES, "required": ["action"]},
+    }),
+    "required": ["action"],
+}
+
+@functools.lru_cache(maxsize=8)
+def command_instruction(style, os_name, browser):
+    # Everything but the user's words, so it is built once per OS/browser and
+    # sent as the system instruction, a stable prefix the API can cache.
+    os_friendly = OS_NAMES.get(os_name, os_name)
+    if style == "full":
+        return f"""You are a Command Understanding AI for a cross-platform voice assistant.
 You must ONLY understand English, Hindi and Hinglish.
 
 Device Information:
 Operating System: {os_friendly}
-Browser: {self.default_browser}
+Browser: {browser}
 
 CRITICAL INSTRUCTIONS:
 🔥 IGNORE greetings and politeness - focus on the ACTION
@@ -330,605 +537,292 @@ Rules:
 ✨ "search X on [WEBSITE]" = platform_search
 ✨ Prefer action over conversation when unsure
 ✨ 🔥 ALWAYS extract download source if mentioned: "from web", "from snap", "via terminal", etc.
-✨ 🔥 App control keywords: save, copy, paste, cut, undo, redo, find, close, bold, italic, etc.
-
-User Input: {cleaned_text}
-JSON Output:"""
-
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "maxOutputTokens": 100,
-                    "topK": 1,
-                    "topP": 0.1,
-                }
-            }
-            response = requests.post(self.api_url, headers=self.headers, data=json.dumps(payload), timeout=10)
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    candidate = result['candidates'][0]
-                    if 'content' in candidate and 'parts' in candidate['content']:
-                        parts = candidate['content']['parts']
-                        if len(parts) > 0 and 'text' in parts[0]:
-                            json_text = parts[0]['text'].strip()
-                            json_text = json_text.replace('```json', '').replace('```', '').strip()
-                            try:
-                                parsed_json = json.loads(json_text)
-                                return parsed_json
-                            except json.JSONDecodeError:
-                                return self._fallback_parse(text)
-            return self._fallback_parse(text)
-        except Exception as e:
-            return self._fallback_parse(text)
-    def _fallback_parse(self, text):
-        import re
-        cleaned = self._preprocess_text(text)
-        text_lower = cleaned.lower().strip()
-        match1 = re.search(r'(?:search|find|lookup)\s+(?:for\s+)?(.+?)\s+(?:on|in)\s+(\w+)', text_lower)
-        if match1:
-            query, platform = match1.groups()
-            query = query.strip()
-            platform = platform.strip()
-            web_indicators = ['youtube', 'google', 'instagram', 'facebook', 'twitter', 'amazon', 
-                             'reddit', 'wikipedia', 'spotify', 'linkedin', 'github', 'chatgpt',
-                             'netflix', 'pinterest', 'tiktok', 'snapchat', 'whatsapp', 'telegram',
-                             'stackoverflow', 'medium', 'quora', 'ebay', 'imdb', 'yelp', 'twitch']
-            if any(indicator in platform for indicator in web_indicators) or len(platform) > 3:
-                return {"action": "platform_search", "platform": platform, "query": query}
-        match2 = re.search(r'(?:go to|open|use)\s+(\w+)\s+(?:and|to)\s+(?:search|find|lookup|write)\s+(?:for\s+)?(.+)', text_lower)
-        if match2:
-            platform_or_browser, query = match2.groups()
-            query = query.strip()
-            platform_or_browser = platform_or_browser.strip().lower()
-            
-            browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera']
-            if any(browser in platform_or_browser for browser in browsers):
-                import re
-                app_match = re.search(r'(?:open|use)\s+(\w+)', text_lower)
-                if app_match:
-                    browser_name = app_match.group(1).strip()
-                    return {"action": "complex_command", "steps": [
-                        {"action": "open_app", "app_name": browser_name},
-                        {"action": "web_search", "query": query}
-                    ]}
-            
-            web_indicators = ['youtube', 'google', 'instagram', 'facebook', 'twitter', 'amazon', 
-                             'reddit', 'wikipedia', 'spotify', 'linkedin', 'github', 'chatgpt',
-                             'netflix', 'pinterest', 'tiktok', 'snapchat', 'whatsapp', 'telegram',
-                             'stackoverflow', 'medium', 'quora', 'ebay', 'imdb', 'yelp', 'twitch']
-            if any(indicator in platform_or_browser for indicator in web_indicators) or len(platform_or_browser) > 3:
-                return {"action": "platform_search", "platform": platform_or_browser, "query": query}
-        match3 = re.search(r'(\w+)\s+(?:pe|mein|me)\s+(?:search|find|dhoondo)\s+(.+)', text_lower)
-        if match3:
-            platform, query = match3.groups()
-            query = query.strip()
-            platform = platform.strip()
-            web_indicators = ['youtube', 'google', 'instagram', 'facebook', 'twitter', 'amazon', 
-                             'reddit', 'wikipedia', 'spotify', 'linkedin', 'github', 'chatgpt',
-                             'netflix', 'pinterest', 'tiktok', 'snapchat', 'whatsapp', 'telegram',
-                             'stackoverflow', 'medium', 'quora', 'ebay', 'imdb', 'yelp', 'twitch']
-            if any(indicator in platform for indicator in web_indicators) or len(platform) > 3:
-                return {"action": "platform_search", "platform": platform, "query": query}
-        if ('open' in text_lower or 'launch' in text_lower or 'start' in text_lower) and any(word in text_lower for word in ['search', 'searc', 'serch', 'find', 'lookup']) and any(browser in text_lower for browser in ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']):
-            import re
-            browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']
-            for browser in browsers:
-                if browser in text_lower:
-                    pattern = r'(?:open|launch|start)\s+(' + browser + r')\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)'
-                    match = re.search(pattern, text_lower)
-                    if match:
-                        browser_name = match.group(1).strip()
-                        query = match.group(2).strip()
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": browser_name},
-                            {"action": "web_search", "query": query}
-                        ]}
-        
-        if ('open' in text_lower or 'launch' in text_lower or 'start' in text_lower) and ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            patterns = [
-                r'(?:open|launch|start)\s+(.+?)\s+(?:and|,)\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    app_name = match.group(1).strip().rstrip(',')
-                    file_name = match.group(2).strip().rstrip('.,!?;:')
-                    
-                    app_name = app_name.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
-                    if app_name.lower() == 'vs' or app_name.lower().strip() == 'vs':
-                        app_name = 'vscode'
-                    
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": app_name},
-                            {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": app_name}
-                        ]}
-        
-        if text_lower.startswith(('search ', 'google ', 'find ', 'lookup ')):
-            query = text_lower.split(None, 1)[1] if len(text_lower.split()) > 1 else text_lower
-            return {"action": "web_search", "query": query}
-        elif text_lower.startswith(('switch to ', 'switch back', 'go to ', 'focus on ')):
-            if 'switch back' in text_lower or 'previous app' in text_lower:
-                return {"action": "switch_app", "app_name": "previous"}
-            
-            app_name = text_lower
-            for prefix in ['switch to ', 'go to ', 'focus on ']:
-                if text_lower.startswith(prefix):
-                    app_name = text_lower[len(prefix):].strip()
-                    break
-            
-            app_keywords = ['chrome', 'firefox', 'vscode', 'code', 'terminal', 'calculator', 
-                           'notepad', 'word', 'excel', 'browser', 'spotify', 'discord', 
-                           'steam', 'vlc', 'gimp', 'photoshop']
-            
-            if any(keyword in app_name for keyword in app_keywords):
-                return {"action": "switch_app", "app_name": app_name}
-        
-        elif text_lower.startswith(('open ', 'launch ', 'start ', 'run ')):
-            app_name = text_lower.split(None, 1)[1] if len(text_lower.split()) > 1 else text_lower
-            
-            if ('and' in app_name.lower() or ',' in app_name.lower()) and ('create' in app_name.lower() or 'make' in app_name.lower()) and 'file' in app_name.lower():
-                import re
-                app_name_normalized = app_name.lower().replace(',', ' and ')
-                patterns = [
-                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                ]
-                for pattern in patterns:
-                    match = re.search(pattern, app_name_normalized)
-                    if match:
-                        actual_app = match.group(1).strip().rstrip(',')
-                        file_name = match.group(2).strip().rstrip('.,!?;:')
-                        
-                        actual_app = actual_app.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
-                        if actual_app.lower() == 'vs' or actual_app.lower().strip() == 'vs':
-                            actual_app = 'vscode'
-                        
-                        if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                            return {"action": "complex_command", "steps": [
-                                {"action": "open_app", "app_name": actual_app},
-                                {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": actual_app}
-                            ]}
-            
-            search_variations = ['search', 'searc', 'serch', 'find', 'lookup']
-            has_search = any(var in app_name.lower() for var in search_variations)
-            
-            if ('and' in app_name.lower() or ',' in app_name.lower()) and has_search:
-                import re
-                app_name_normalized = app_name.lower().replace(',', ' and ')
-                browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']
-                
-                for browser in browsers:
-                    if browser in app_name_normalized:
-                        pattern = r'^(.+?)\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)'
-                        match = re.search(pattern, app_name_normalized)
-                        if match:
-                            browser_name = match.group(1).strip()
-                            query = match.group(2).strip()
-                            if any(b in browser_name for b in browsers):
-                                return {"action": "complex_command", "steps": [
-                                    {"action": "open_app", "app_name": browser_name},
-                                    {"action": "web_search", "query": query}
-                                ]}
-                
-                parts = app_name.split('and')
-                if len(parts) >= 2:
-                    browser_or_app = parts[0].strip().lower()
-                    query_parts = []
-                    for part in parts[1:]:
-                        cleaned = part.replace('search', '').replace('searc', '').replace('serch', '').replace('find', '').replace('lookup', '').strip()
-                        if cleaned:
-                            query_parts.append(cleaned)
-                    query = ' '.join(query_parts).strip()
-                    
-                    if any(browser in browser_or_app for browser in browsers):
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": parts[0].strip()},
-                            {"action": "web_search", "query": query}
-                        ]}
-                    
-                    return {"action": "platform_search", "platform": parts[0].strip(), "query": query}
-            
-            if app_name.lower() in ['vs', 'vscode', 'visual studio', 'visual studio code', 'code']:
-                app_name = 'vscode'
-            
-            return {"action": "open_app", "app_name": app_name}
-        
-        elif 'create file' in text_lower or 'make file' in text_lower:
-            import re
-            patterns = [
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+and|\s+in|\s+to|$)',
-            ]
-            for pattern in patterns:
-                file_match = re.search(pattern, text_lower)
-                if file_match:
-                    file_name = file_match.group(1).strip()
-                    file_name = file_name.rstrip('.,!?;:')
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the']:
-                        open_in_app = None
-                        if 'vscode' in text_lower or 'visual studio' in text_lower or 'code' in text_lower:
-                            open_in_app = 'vscode'
-                        return {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": open_in_app}
-        
-        elif ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            app_mentioned = None
-            app_keywords = {
-                'vscode': ['vscode', 'vs code', 'visual studio code', 'code editor'],
-                'chrome': ['chrome', 'browser', 'google chrome'],
-                'firefox': ['firefox'],
-                'notepad': ['notepad'],
-            }
-            
-            for app_key, keywords in app_keywords.items():
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        app_mentioned = app_key
-                        break
-                if app_mentioned:
-                    break
-            
-            if 'open it' in text_lower or 'open in' in text_lower or app_mentioned:
-                file_patterns = [
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                ]
-                for pattern in file_patterns:
-                    file_match = re.search(pattern, text_lower)
-                    if file_match:
-                        file_name = file_match.group(1).strip()
-                        file_name = file_name.rstrip('.,!?;:')
-                        if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                            target_app = app_mentioned if app_mentioned else 'vscode'
-                            return {"action": "complex_command", "steps": [
-                                {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": target_app}
-                            ]}
-            
-            file_patterns = [
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+and|\s+in|\s+to|$)',
-            ]
-            for pattern in file_patterns:
-                file_match = re.search(pattern, text_lower)
-                if file_match:
-                    file_name = file_match.group(1).strip()
-                    file_name = file_name.rstrip('.,!?;:')
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the']:
-                        open_in_app = app_mentioned
-                        if 'vscode' in text_lower or 'visual studio' in text_lower or 'code' in text_lower:
-                            open_in_app = 'vscode'
-                        return {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": open_in_app}
-        
-        elif 'open' in text_lower and ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            patterns = [
-                r'open\s+([^\s]+(?:\s+[^\s]+)*?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))',
-                r'open\s+([^\s]+(?:\s+[^\s]+)*?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-            ]
-            for pattern in patterns:
-                app_match = re.search(pattern, text_lower)
-                if app_match:
-                    app_name = app_match.group(1).strip()
-                    file_name = app_match.group(2).strip()
-                    file_name = file_name.rstrip('.,!?;:')
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the']:
-                        app_name = app_name.replace('vs code', 'vscode').replace('visual studio code', 'vscode')
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": app_name},
-                            {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": app_name}
-                        ]}
-        
-        elif text_lower.startswith(('type ', 'write ', 'enter ')):
-            text_to_type = text_lower
-            for prefix in ['type ', 'write ', 'enter ']:
-                if text_lower.startswith(prefix):
-                    text_to_type = text[len(prefix):].strip()
-                    break
-            return {"action": "app_command", "command": "type", "params": {"text": text_to_type}}
-        
-        elif any(cmd in text_lower for cmd in ['save', 'copy', 'paste', 'cut', 'undo', 'redo', 
-                                                 'select all', 'bold', 'italic', 'underline',
-                                                 'find', 'replace']):
-            for cmd in ['save file', 'save', 'copy', 'paste', 'cut', 'undo', 'redo', 
-                       'select all', 'bold', 'italic', 'underline', 'find', 'replace']:
-                if cmd in text_lower:
-                    return {"action": "app_command", "command": cmd}
-        elif text_lower.startswith(('play ', 'play the ', 'play first ')):
-            query = text_lower.replace('play ', '').replace('the ', '').replace('first ', '').strip()
-            return {"action": "play_media", "query": query, "platform": "youtube"}
-        elif 'research' in text_lower and ('download' in text_lower or 'fetch' in text_lower or 'get' in text_lower):
-            topic = text_lower
-            for remove in ['download', 'fetch', 'get', 'me', 'all', 'research', 'of', 'on', 'about', 'for']:
-                topic = topic.replace(remove, '')
-            topic = topic.strip()
-            return {"action": "download_research", "topic": topic, "max_papers": 5}
-        elif text_lower.startswith(('download ', 'install ', 'get ')):
-            app_name = text_lower.split(None, 1)[1] if len(text_lower.split()) > 1 else text_lower
-            app_name = app_name.replace('for me', '').strip()
-            
-            # Check for research download
-            if 'research' in app_name or 'papers' in app_name:
-                topic = app_name.replace('research', '').replace('papers', '').replace('on', '').replace('about', '').strip()
-                return {"action": "download_research", "topic": topic, "max_papers": 5}
-            
-            # Detect download source
-            source = "web"  # default
-            source_patterns = [
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(web|internet|online|website)', 'web'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(terminal|package\s+manager|apt|dnf|brew|choco)', 'terminal'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(snap(?:\s+store)?)', 'snap'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(flatpak)', 'flatpak'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(app\s+store|microsoft\s+store|mac\s+app\s+store|gnome\s+software)', 'appstore'),
-            ]
-            
-            for pattern, src in source_patterns:
-                match = re.search(pattern, app_name)
-                if match:
-                    source = src
-                    # Remove the source specification from app_name
-                    app_name = re.sub(pattern, '', app_name).strip()
-                    break
-            
-            return {"action": "download_app", "app_name": app_name, "source": source}
-        elif text_lower.startswith(('go to ', 'goto ', 'open ', 'visit ')):
-            target = text_lower.replace('go to ', '').replace('goto ', '').replace('open ', '').replace('visit ', '').strip()
-            if 'and search' in target or 'and find' in target or 'and write' in target:
-                parts = target.split('and')
-                if len(parts) >= 2:
-                    platform = parts[0].strip()
-                    query = ' '.join(parts[1:]).replace('search', '').replace('find', '').replace('write', '').strip()
-                    return {"action": "platform_search", "platform": platform, "query": query}
-            known_websites = ['youtube', 'google', 'facebook', 'instagram', 'twitter', 'reddit', 
-                             'github', 'amazon', 'netflix', 'spotify', 'linkedin', 'wikipedia',
-                             'flipkart', 'gmail', 'yahoo', 'bing', 'chatgpt', 'whatsapp']
-            if any(site in target for site in known_websites):
-                return {"action": "open_website", "url": f"{target}.com"}
-            if any(app in target for app in ['steam', 'chrome', 'firefox', 'calculator', 'discord', 'vscode', 'code']):
-                return {"action": "open_app", "app_name": target}
-            if '.com' in target or '.org' in target or '.net' in target or '.io' in target:
-                return {"action": "open_website", "url": target}
-            return {"action": "open_website", "url": f"{target}.com"}
-        elif 'list app' in text_lower or 'show app' in text_lower:
-            return {"action": "list_apps"}
-        elif "what's on" in text_lower or 'show page' in text_lower or 'read page' in text_lower or 'page content' in text_lower:
-            return {"action": "browser_control", "command": "show_page"}
-        elif 'scroll down' in text_lower:
-            return {"action": "browser_control", "command": "scroll_down"}
-        elif 'scroll up' in text_lower:
-            return {"action": "browser_control", "command": "scroll_up"}
-        elif 'close popup' in text_lower or 'close pop up' in text_lower or 'press cross' in text_lower or 'click cross' in text_lower:
-            return {"action": "browser_control", "command": "close_popup"}
-        elif 'volume up' in text_lower or 'increase volume' in text_lower:
-            return {"action": "browser_control", "command": "volume_up"}
-        elif 'volume down' in text_lower or 'decrease volume' in text_lower:
-            return {"action": "browser_control", "command": "volume_down"}
-        
-        # Tab management
-        elif re.search(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?tab', text_lower):
-            url_match = re.search(r'(?:and\s+)?(?:open|go to)\s+(\w+(?:\.\w+)?)', text_lower)
-            if url_match:
-                url = url_match.group(1)
-                return {"action": "browser_control", "command": "new_tab", "url": url}
-            return {"action": "browser_control", "command": "new_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+first\s+tab', text_lower):
-            return {"action": "browser_control", "command": "first_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+last\s+tab', text_lower):
-            return {"action": "browser_control", "command": "last_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+next\s+tab', text_lower) or 'next tab' in text_lower:
-            return {"action": "browser_control", "command": "next_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+prev(?:ious)?\s+tab', text_lower) or 'previous tab' in text_lower:
-            return {"action": "browser_control", "command": "previous_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+tab\s+(\d+)', text_lower):
-            match = re.search(r'(switch to|go to|move to)\s+tab\s+(\d+)', text_lower)
-            tab_index = int(match.group(2))
-            return {"action": "browser_control", "command": "switch_to_tab", "tab_index": tab_index}
-        elif re.search(r'(switch to|go to|move to)\s+(\d+)(?:st|nd|rd|th)\s+tab', text_lower):
-            match = re.search(r'(switch to|go to|move to)\s+(\d+)(?:st|nd|rd|th)\s+tab', text_lower)
-            tab_index = int(match.group(2))
-            return {"action": "browser_control", "command": "switch_to_tab", "tab_index": tab_index}
-        elif re.search(r'close\s+(?:this\s+|current\s+)?tab', text_lower):
-            return {"action": "browser_control", "command": "close_tab"}
-        elif re.search(r'close\s+(?:all\s+)?other\s+tabs', text_lower):
-            return {"action": "browser_control", "command": "close_other_tabs"}
-        elif re.search(r'(list|show)\s+(?:all\s+)?tabs', text_lower):
-            return {"action": "browser_control", "command": "list_tabs"}
-        
-        # Window management
-        elif re.search(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?window', text_lower):
-            return {"action": "browser_control", "command": "new_window"}
-        elif re.search(r'(create|open|new)\s+(?:an?\s+)?(?:incognito|private)\s+window', text_lower):
-            return {"action": "browser_control", "command": "incognito_window"}
-        elif 'maximize' in text_lower and 'window' in text_lower:
-            return {"action": "browser_control", "command": "maximize"}
-        elif 'minimize' in text_lower and 'window' in text_lower:
-            return {"action": "browser_control", "command": "minimize"}
-        elif 'fullscreen' in text_lower or 'full screen' in text_lower:
-            return {"action": "browser_control", "command": "fullscreen"}
-        
-        # Navigation
-        elif re.search(r'\bgo\s+back\b|\bback\b', text_lower) and 'go back' not in ['go to back', 'search go back']:
-            return {"action": "browser_control", "command": "go_back"}
-        elif re.search(r'\bgo\s+forward\b|\bforward\b', text_lower):
-            return {"action": "browser_control", "command": "go_forward"}
-        elif 'refresh' in text_lower or 'reload' in text_lower:
-            return {"action": "browser_control", "command": "refresh"}
-        elif re.search(r'(what\s+is|show|get|tell)\s+(the\s+)?current\s+url', text_lower):
-            return {"action": "browser_control", "command": "get_url"}
-        elif re.search(r'(what\s+is|show|get|tell)\s+(the\s+)?page\s+title', text_lower):
-            return {"action": "browser_control", "command": "get_title"}
-        elif 'click' in text_lower and 'first' in text_lower:
-            return {"action": "browser_control", "command": "click_first_link"}
-        elif any(word in text_lower for word in ['press enter', 'hit enter', 'press return']):
-            return {"action": "app_command", "command": "enter"}
-        
-        elif any(word in text_lower for word in ['press escape', 'hit escape', 'press esc']):
-            return {"action": "app_command", "command": "escape"}
-        
-        elif any(word in text_lower for word in ['press tab', 'hit tab']):
-            return {"action": "app_command", "command": "tab"}
-        
-        elif 'delete' in text_lower or 'backspace' in text_lower:
-            return {"action": "app_command", "command": "delete"}
-        
-        elif 'click' in text_lower or 'press' in text_lower or 'select' in text_lower:
-            import re
-            number_match = re.search(r'(\d+)(st|nd|rd|th)?', text_lower)
-            if number_match:
-                n = int(number_match.group(1))
-                element_type = 'link'
-                if 'video' in text_lower:
-                    element_type = 'video'
-                elif 'link' in text_lower:
-                    element_type = 'link'
-                elif 'button' in text_lower:
-                    element_type = 'button'
-                elif 'result' in text_lower:
-                    element_type = 'result'
-                return {"action": "browser_control", "command": "click_nth", "position": n, "element_type": element_type}
-            else:
-                patterns = [
-                    r'click\s+on\s+(?:the\s+)?(.+)',
-                    r'press\s+on\s+(?:the\s+)?(.+)',
-                    r'select\s+(?:the\s+)?(.+)',
-                    r'click\s+(.+)',
-                ]
-                for pattern in patterns:
-                    match = re.search(pattern, text_lower)
-                    if match:
-                        text_to_click = match.group(1).strip()
-                        if 'called' in text_lower or 'titled' in text_lower or 'named' in text_lower:
-                            called_match = re.search(r'(?:called|titled|named)\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+file|\s+page|\s+link|\s+in|\s+on|\s+can|$)', text_lower)
-                            if called_match:
-                                text_to_click = called_match.group(1).strip()
-                        if text_to_click not in ['cross', 'cross button', 'popup', 'first', 'first link', 'that', 'this', 'it'] and len(text_to_click) > 2:
-                            return {"action": "browser_control", "command": "click_by_text", "text": text_to_click}
-                return {"action": "browser_control", "command": "click_first_link"}
-        if ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            app_mentioned = None
-            app_keywords = {
-                'vscode': ['vscode', 'vs code', 'visual studio code', 'code editor'],
-                'chrome': ['chrome', 'browser', 'google chrome'],
-                'firefox': ['firefox'],
-                'notepad': ['notepad'],
-            }
-            
-            for app_key, keywords in app_keywords.items():
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        app_mentioned = app_key
-                        break
-                if app_mentioned:
-                    break
-            
-            if 'open it' in text_lower or 'open in' in text_lower or app_mentioned:
-                file_patterns = [
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                ]
-                for pattern in file_patterns:
-                    file_match = re.search(pattern, text_lower)
-                    if file_match:
-                        file_name = file_match.group(1).strip()
-                        file_name = file_name.rstrip('.,!?;:')
-                        if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                            target_app = app_mentioned if app_mentioned else 'vscode'
-                            return {"action": "complex_command", "steps": [
-                                {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": target_app}
-                            ]}
-        
-        greeting_only = re.match(r'^(hello|hi|hey|thank you|thanks|how are you|namaste|kaise ho)[\s\.,!?]*$', text_lower)
-        if greeting_only:
-            return {"action": "conversation", "text": text}
-        if len(text_lower.split()) == 1 and len(text_lower) > 2:
-            return {"action": "open_app", "app_name": text_lower}
-        return {"action": "web_search", "query": cleaned}
-    def query(self, prompt):
+✨ 🔥 App control keywords: save, copy, paste, cut, undo, redo, find, close, bold, italic, etc."""
+    return f"""You turn voice commands (English, Hindi or Hinglish) into one JSON action for a desktop assistant on {os_friendly} (browser: {browser}).
+Ignore greetings and politeness; if there is any command, return the command, never conversation.
+
+Actions (fields):
+open_app(app_name) - launch a local app: "open chrome"
+switch_app(app_name) - "switch to vscode"; "switch back"/"previous app" -> app_name "previous"
+app_command(command, params) - inside the active app: save, copy, paste, cut, undo, redo, find, bold, enter, scroll down; "type X"/"write X" -> command "type", params {{"text": "X"}}; generic text while in an app is also type
+web_search(query) - "search python" -> query "python"
+open_website(url) - "go to/open/visit youtube" (no search) -> url "youtube.com"
+platform_search(platform, query) - "search cats on youtube", "open instagram and search oman", "search on amazon for laptop"
+play_media(query, platform) - "play latest song" -> platform "youtube"
+download_app(app_name, source) - source web|terminal|snap|flatpak|appstore from "from/via X" (apt, brew, choco, package manager -> terminal); default "web"; always include source
+download_research(topic, max_papers=5) - "download/fetch research on X"
+list_apps()
+browser_control(command, ...) - new_tab (optional url), first_tab, last_tab, next_tab, previous_tab, switch_to_tab (tab_index), close_tab, close_other_tabs, list_tabs, new_window, incognito_window, maximize, minimize, fullscreen, go_back, go_forward, refresh, get_url, get_title, show_page, click_first_link, click_by_text (text), click_nth (position, element_type), scroll_down, scroll_up, close_popup, volume_up, volume_down, play_video
+create_file(file_path, create_folder_if_missing, open_in_app) - "make a file called X" -> file_path "X" (never "called"/"named"); "in folder F" -> "F/X"
+create_folder(folder_path)
+move_file(source, destination), copy_file(source, destination) - "move a.txt to folder backup" -> destination "backup/a.txt"
+complex_command(steps) - several actions joined by and/then, each step an action object:
+  "open VS Code and create file tut1.cpp" -> steps [open_app vscode, create_file tut1.cpp open_in_app vscode]
+  "create file tut1.cpp and open it in VS Code" -> steps [create_file tut1.cpp open_in_app vscode]
+  "open chrome and search python" / "open browser and search cats" -> steps [open_app chrome, web_search]
+conversation(text) - only when there is no command at all: "thank you", "how are you"
+
+Rules:
+Browsers (Chrome, Firefox, Edge, Safari, Brave, Opera) are apps; "open/go to [WEBSITE] and search X" and "search X on [WEBSITE]" are platform_search.
+"scroll", "new tab", "close tab": browser_control in the browser, app_command in other apps.
+"play X on page"/"play video X" -> browser_control play_video.
+"click on [TEXT]" -> click_by_text; "click on the Nth [thing]" -> click_nth.
+Prefer an action over conversation when unsure."""
+
+class GeminiAssistant:
+    def __init__(self, api_base=None, parse_cache=None):
+        self.api_key = GEMINI_API_KEY
+        self.api_url = f"{api_base or GEMINI_API_BASE}/models/{GEMINI_MODEL}:generateContent?key={self.api_key}"
+        self.stream_url = f"{api_base or GEMINI_API_BASE}/models/{GEMINI_MODEL}:streamGenerateContent?alt=sse&key={self.api_key}"
+        self.headers = {
+            "Content-Type": "application/json"
+        }
+        self.session = get_session()
+        self.parse_cache = parse_cache
+        self.prompt_style = COMMAND_PROMPT_STYLE
+        import platform
+        self.os_name = platform.system()
+        self.default_browser = self._detect_default_browser()
+    def _post(self, payload, timeout, kind="command"):
+        # timeout is the ceiling; the breaker shortens it once it has seen how fast Gemini answers.
+        gemini_breaker.check()
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.api_url, headers=self.headers, data=self._encode(payload),
+                                         timeout=gemini_breaker.timeout(kind, timeout))
+        except Exception:
+            gemini_breaker.record_failure(kind)
+            raise
+        gemini_breaker.record_status(kind, response.status_code, time.perf_counter() - started)
+        if _recorder is not None:
+            self._record(kind, payload, response, time.perf_counter() - started)
+        return response
+    def _record(self, kind, payload, response, latency):
+        reply = None
+        if response.status_code == 200:
+            try:
+                reply = self._extract_text(response.json())
+            except ValueError:
+                pass
+        _recorder.record(kind, payload, response.status_code, reply, latency)
+    def _encode(self, payload):
+        # Compact UTF-8: the prompt's emoji cost 4 bytes each instead of a 12-byte \u escape pair.
+        return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    def _extract_text(self, result):
+        if 'candidates' in result and len(result['candidates']) > 0:
+            candidate = result['candidates'][0]
+            if 'content' in candidate and 'parts' in candidate['content']:
+                parts = candidate['content']['parts']
+                if len(parts) > 0 and 'text' in parts[0]:
+                    return parts[0]['text']
+        return None
+    def _detect_default_browser(self):
+        import platform
+        os_name = platform.system()
+        if os_name == "Linux":
+            return "Chrome/Firefox"
+        elif os_name == "Darwin":
+            return "Safari"
+        elif os_name == "Windows":
+            return "Edge/Chrome"
+        return "Chrome"
+    def _preprocess_text(self, text):
+        return preprocess_command(text)
+    def parse_command_to_json(self, text):
+        cache, key, cached = self._cached_command(text)
+        if cached is not None:
+            return cached
+        remote = lambda: self._remote_parse(text, cache, key)
+        if SPECULATIVE_PARSE:
+            return self._speculate("command", text, remote, lambda: self._fallback_parse(text))
         try:
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                }
+            parsed = remote()
+        except Exception:
+            parsed = None
+        return parsed if parsed is not None else self._fallback_parse(text)
+    def _speculate(self, kind, text, remote, local):
+        # Local parse runs while Gemini works; Gemini wins if it answers within the budget.
+        started = time.perf_counter()
+        future = get_speculation_pool().submit(remote)
+        local_result = local()
+        try:
+            remote_result = future.result(timeout=max(0.0, SPECULATIVE_PARSE_BUDGET - (time.perf_counter() - started)))
+        except FutureTimeout:
+            get_speculation_log().record("budget_missed")
+            future.add_done_callback(lambda f: self._record_late(kind, text, local_result, f))
+            return local_result
+        except Exception:
+            get_speculation_log().record("remote_failed")
+            return local_result
+        if remote_result is None:
+            get_speculation_log().record("remote_failed")
+            return local_result
+        get_speculation_log().record("remote", kind, text, local_result, remote_result)
+        return remote_result
+    def _record_late(self, kind, text, local_result, future):
+        # A late command parse is still cached by _remote_parse, so the next repeat is fast.
+        if future.cancelled() or future.exception() is not None or future.result() is None:
+            get_speculation_log().record("remote_failed")
+        else:
+            get_speculation_log().record("late", kind, text, local_result, future.result())
+    def _remote_parse(self, text, cache, key):
+        # Only Gemini's own parses are cached; the regex fallback is cheap to redo.
+        started = time.perf_counter()
+        response = self._post(self._command_payload(text), timeout=10)
+        parsed = self._remote_command(response)
+        if parsed is not None and cache is not None:
+            cache.put(key, parsed, time.perf_counter() - started)
+        return parsed
+    def _cached_command(self, text):
+        cache = self.parse_cache or get_parse_cache()
+        if cache is None:
+            return None, None, None
+        key = normalize_key(self._preprocess_text(text))
+        return cache, key, cache.get(key)
+    def _command_payload(self, text):
+        cleaned_text = self._preprocess_text(text)
+        if cleaned_text != text:
+            print(f"📝 Cleaned: '{text}' → '{cleaned_text}'")
+        instruction = command_instruction(self.prompt_style, self.os_name, self.default_browser)
+        payload = {
+            "systemInstruction": {
+                "parts": [{"text": instruction}]
+            },
+            "contents": [{
+                "parts": [{"text": f"User Input: {cleaned_text}\nJSON Output:"}]
+            }],
+            "generationConfig": {
+                "temperature": 0.1,
+                "maxOutputTokens": 100,
+                "topK": 1,
+                "topP": 0.1,
+                "responseMimeType": "application/json",
+                "responseSchema": COMMAND_RESPONSE_SCHEMA,
             }
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                data=json.dumps(payload),
-                timeout=30
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if "candidates" in data and len(data["candidates"]) > 0:
-                    candidate = data["candidates"][0]
-                    if "content" in candidate and "parts" in candidate["content"]:
-                        parts = candidate["content"]["parts"]
-                        if len(parts) > 0 and "text" in parts[0]:
-                            return True, parts[0]["text"]
-                return False, "No response from Gemini"
-            else:
-                error_msg = f"API error: {response.status_code}"
+        }
+        return payload
+    def _command_from_response(self, response, text):
+        parsed = self._remote_command(response)
+        return parsed if parsed is not None else self._fallback_parse(text)
+    def _remote_command(self, response):
+        if response.status_code == 200:
+            json_text = self._extract_text(response.json())
+            if json_text is not None:
+                # JSON mode replies are bare JSON; older models may still wrap it in a code block.
                 try:
-                    error_data = response.json()
-                    if "error" in error_data:
-                        error_msg = error_data["error"].get("message", error_msg)
-                except:
+                    return json.loads(json_text)
+                except json.JSONDecodeError:
                     pass
-                return False, error_msg
+                json_text = json_text.strip().replace('```json', '').replace('```', '').strip()
+                try:
+                    return json.loads(json_text)
+                except json.JSONDecodeError:
+                    return None
+        return None
+    def _fallback_parse(self, text):
+        return fallback_parser.parse(text, self._preprocess_text(text))
+    def query(self, prompt, on_chunk=None):
+        if on_chunk is not None:
+            return self._stream_query(prompt, on_chunk)
+        try:
+            response = self._post(self._query_payload(prompt), timeout=30, kind="query")
+            return self._query_from_response(response)
         except requests.exceptions.Timeout:
             return False, "Request timeout - check internet connection"
         except Exception as e:
             return False, f"Error: {str(e)}"
+    def _stream_query(self, prompt, on_chunk):
+        # Server-sent events: on_chunk gets each piece of the answer as it is generated.
+        started = time.perf_counter()
+        first = None
+        parts = []
+        payload = self._query_payload(prompt)
+        try:
+            gemini_breaker.check()
+            try:
+                response = self.session.post(self.stream_url, headers=self.headers, data=self._encode(payload),
+                                             timeout=gemini_breaker.timeout("stream", 30), stream=True)
+            except Exception:
+                gemini_breaker.record_failure("stream")
+                raise
+            # Time to the response headers, so the adaptive timeout covers the wait for the first bytes.
+            gemini_breaker.record_status("stream", response.status_code, time.perf_counter() - started)
+            with response:
+                if response.status_code != 200:
+                    stream_stats.record(None, None)
+                    return self._query_from_response(response)
+                # chunk_size=None hands over each network chunk as it arrives instead of filling 512 bytes.
+                for line in response.iter_lines(chunk_size=None):
+                    chunk = self._sse_text(line)
+                    if chunk:
+                        if first is None:
+                            first = time.perf_counter() - started
+                        parts.append(chunk)
+                        on_chunk(chunk)
+        except requests.exceptions.Timeout:
+            if not parts:
+                stream_stats.record(None, None)
+                return False, "Request timeout - check internet connection"
+        except Exception as e:
+            if not parts:
+                stream_stats.record(None, None)
+                return False, f"Error: {str(e)}"
+        stream_stats.record(first, time.perf_counter() - started)
+        if not parts:
+            return False, "No response from Gemini"
+        if _recorder is not None:
+            _recorder.record("stream", payload, 200, ''.join(parts), time.perf_counter() - started)
+        return True, ''.join(parts)
+    def _sse_text(self, line):
+        # Lines are bytes: SSE has no charset header, and Hindi answers must decode as UTF-8.
+        if not line.startswith(b'data:'):
+            return None
+        try:
+            return self._extract_text(json.loads(line[5:].decode('utf-8')))
+        except ValueError:
+            return None
+    def _query_payload(self, prompt):
+        return {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": 0.7,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": 1024,
+            }
+        }
+    def _query_from_response(self, response):
+        if response.status_code == 200:
+            text = self._extract_text(response.json())
+            if text is not None:
+                return True, text
+            return False, "No response from Gemini"
+        error_msg = f"API error: {response.status_code}"
+        try:
+            error_data = response.json()
+            if "error" in error_data:
+                error_msg = error_data["error"].get("message", error_msg)
+        except:
+            pass
+        return False, error_msg
     def _regex_parse_command(self, text):
-        import re
-        removal_patterns = [
-            r'\b(hello|hi|hey|good morning|good afternoon|good evening|namaste|namaskar)\b',
-            r'\b(bot|assistant|either|either assistant|alexa|siri)\b',
-            r'\b(how are you|what\'s up|kaise ho|kya hal hai)\??',
-            r'\b(what i want you to do is|i want you to do is|i want you to|i need you to|i would like you to)\b',
-            r'\b(what i want is|i want to|i need to|i would like to)\b',
-            r'\b(go to a web and|go to the web and|go to web and|on the web|on web)\b',
-            r'\b(go to a|go to the|go to)\b',
-            r'\b(please|kindly|can you|could you|would you|will you|would you please|for me|thank you|thanks|dhanyavaad|shukriya|karo|kijiye)\b',
-            r'^\s*(can|could|would|will|do|does|what|so)\s+',
-            r'\b(just|really|actually|basically|literally|so|what)\b',
-        ]
-        cleaned = text.lower()
-        for _ in range(2):
-            for pattern in removal_patterns:
-                cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'[,?!]+', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        cleaned = re.sub(r'^(to|and)\s+', '', cleaned)
-        if not re.search(r'^(open|close|start|launch)', cleaned):
-            cleaned = re.sub(r'\b(the|a|an)\b', '', cleaned)
-        cleaned = re.sub(r'\sfor\s+(?=\w+\s*$)', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        cleaned = re.sub(r'^(to|for|at|in|on)\s+', '', cleaned)
-        if len(cleaned) >= 3 and cleaned != text.lower():
-            return cleaned
-        return text
+        return strip_fillers(text)
     def parse_conversational_command(self, text):
+        remote = lambda: self._remote_conversational(self._post(self._conversational_payload(text), timeout=10, kind="conversational"), text)
+        if SPECULATIVE_PARSE:
+            return self._speculate("conversational", text, remote, lambda: self._regex_parse_command(text))
         try:
-            prompt = f"""You are a command parser for a voice assistant. Extract ONLY the core action from conversational text.
+            return self._conversational_from_response(self._post(self._conversational_payload(text), timeout=10, kind="conversational"), text)
+        except requests.exceptions.RequestException as e:
+            return self._regex_parse_command(text)
+        except Exception as e:
+            return self._regex_parse_command(text)
+    def _conversational_payload(self, text):
+        prompt = f"""You are a command parser for a voice assistant. Extract ONLY the core action from conversational text.
 
 Rules:
 1. Remove greetings: "hello", "hi", "hey", "good morning", "namaste", etc.
@@ -965,46 +859,184 @@ Now extract the core command from this:
 Input: {text}
 Output:"""
 
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "maxOutputTokens": 50,
-                    "topK": 1,
-                    "topP": 0.1,
-                }
+        return {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.1,
+                "maxOutputTokens": 50,
+                "topK": 1,
+                "topP": 0.1,
             }
-            response = requests.post(self.api_url, headers=self.headers, data=json.dumps(payload), timeout=10)
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    candidate = result['candidates'][0]
-                    if 'content' in candidate and 'parts' in candidate['content']:
-                        parts = candidate['content']['parts']
-                        if len(parts) > 0 and 'text' in parts[0]:
-                            extracted_text = parts[0]['text'].strip()
-                            extracted_text = extracted_text.replace('Output:', '').strip()
-                            extracted_text = extracted_text.strip('"\'')
-                            extracted_text = extracted_text.split('\n')[0]
-                            if 2 <= len(extracted_text) <= 50 and extracted_text.lower() != text.lower():
-                                return extracted_text
-            return self._regex_parse_command(text)
-        except requests.exceptions.RequestException as e:
-            return self._regex_parse_command(text)
-        except Exception as e:
-            return self._regex_parse_command(text)
-    def search_and_respond(self, query):
-        enhanced_query = f"""You are a helpful voice assistant. Answer this question concisely and clearly:
+        }
+    def _conversational_from_response(self, response, text):
+        extracted_text = self._remote_conversational(response, text)
+        return extracted_text if extracted_text is not None else self._regex_parse_command(text)
+    def _remote_conversational(self, response, text):
+        if response.status_code == 200:
+            extracted_text = self._extract_text(response.json())
+            if extracted_text is not None:
+                extracted_text = extracted_text.strip()
+                extracted_text = extracted_text.replace('Output:', '').strip()
+                extracted_text = extracted_text.strip('"\'')
+                extracted_text = extracted_text.split('\n')[0]
+                if 2 <= len(extracted_text) <= 50 and extracted_text.lower() != text.lower():
+                    return extracted_text
+        return None
+    def search_and_respond(self, query, on_chunk=None):
+        success, response = self.query(self._search_prompt(query), on_chunk)
+        if success:
+            return response
+        else:
+            return f"Sorry, I couldn't get information: {response}"
+    def _search_prompt(self, query):
+        return f"""You are a helpful voice assistant. Answer this question concisely and clearly:
 Question: {query}
 
 Provide a brief, direct answer suitable for voice interaction. Keep it under 3-4 sentences."""
-        success, response = self.query(enhanced_query)
+
+
+class AsyncGeminiAssistant(GeminiAssistant):
+    """Same prompts and parsing as GeminiAssistant, awaited over httpx.
+
+    The client keeps its connections alive and negotiates HTTP/2 when the
+    h2 package is installed. Create it inside the running event loop and
+    ``aclose`` it on shutdown.
+    """
+    def __init__(self, api_base=None, parse_cache=None):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncGeminiAssistant")
+        super().__init__(api_base, parse_cache)
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+        )
+    async def _apost(self, payload, timeout, kind="command"):
+        gemini_breaker.check()
+        started = time.perf_counter()
+        try:
+            response = await self.client.post(self.api_url, headers=self.headers, content=self._encode(payload),
+                                              timeout=gemini_breaker.timeout(kind, timeout))
+        except Exception:
+            gemini_breaker.record_failure(kind)
+            raise
+        gemini_breaker.record_status(kind, response.status_code, time.perf_counter() - started)
+        if _recorder is not None:
+            self._record(kind, payload, response, time.perf_counter() - started)
+        return response
+    async def parse_command_to_json(self, text):
+        cache, key, cached = self._cached_command(text)
+        if cached is not None:
+            return cached
+        remote = lambda: self._aremote_parse(text, cache, key)
+        if SPECULATIVE_PARSE:
+            return await self._aspeculate("command", text, remote, lambda: self._fallback_parse(text))
+        try:
+            parsed = await remote()
+        except Exception:
+            parsed = None
+        return parsed if parsed is not None else self._fallback_parse(text)
+    async def _aspeculate(self, kind, text, remote, local):
+        started = time.perf_counter()
+        task = asyncio.ensure_future(remote())
+        local_result = local()
+        try:
+            remote_result = await asyncio.wait_for(
+                asyncio.shield(task), timeout=max(0.0, SPECULATIVE_PARSE_BUDGET - (time.perf_counter() - started)))
+        except asyncio.TimeoutError:
+            get_speculation_log().record("budget_missed")
+            task.add_done_callback(lambda t: self._record_late(kind, text, local_result, t))
+            return local_result
+        except Exception:
+            get_speculation_log().record("remote_failed")
+            return local_result
+        if remote_result is None:
+            get_speculation_log().record("remote_failed")
+            return local_result
+        get_speculation_log().record("remote", kind, text, local_result, remote_result)
+        return remote_result
+    async def _aremote_parse(self, text, cache, key):
+        started = time.perf_counter()
+        response = await self._apost(self._command_payload(text), timeout=10)
+        parsed = self._remote_command(response)
+        if parsed is not None and cache is not None:
+            cache.put(key, parsed, time.perf_counter() - started)
+        return parsed
+    async def query(self, prompt, on_chunk=None):
+        if on_chunk is not None:
+            return await self._astream_query(prompt, on_chunk)
+        try:
+            response = await self._apost(self._query_payload(prompt), timeout=30, kind="query")
+            return self._query_from_response(response)
+        except httpx.TimeoutException:
+            return False, "Request timeout - check internet connection"
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+    async def _astream_query(self, prompt, on_chunk):
+        # on_chunk may be a coroutine function; it is awaited so chunks stay in order.
+        started = time.perf_counter()
+        first = None
+        parts = []
+        payload = self._query_payload(prompt)
+        try:
+            gemini_breaker.check()
+            request = self.client.build_request("POST", self.stream_url, headers=self.headers,
+                                                content=self._encode(payload),
+                                                timeout=gemini_breaker.timeout("stream", 30))
+            try:
+                response = await self.client.send(request, stream=True)
+            except Exception:
+                gemini_breaker.record_failure("stream")
+                raise
+            gemini_breaker.record_status("stream", response.status_code, time.perf_counter() - started)
+            try:
+                if response.status_code != 200:
+                    await response.aread()
+                    stream_stats.record(None, None)
+                    return self._query_from_response(response)
+                async for line in response.aiter_lines():
+                    chunk = self._sse_text(line.encode('utf-8'))
+                    if chunk:
+                        if first is None:
+                            first = time.perf_counter() - started
+                        parts.append(chunk)
+                        result = on_chunk(chunk)
+                        if asyncio.iscoroutine(result):
+                            await result
+            finally:
+                await response.aclose()
+        except httpx.TimeoutException:
+            if not parts:
+                stream_stats.record(None, None)
+                return False, "Request timeout - check internet connection"
+        except Exception as e:
+            if not parts:
+                stream_stats.record(None, None)
+                return False, f"Error: {str(e)}"
+        stream_stats.record(first, time.perf_counter() - started)
+        if not parts:
+            return False, "No response from Gemini"
+        if _recorder is not None:
+            _recorder.record("stream", payload, 200, ''.join(parts), time.perf_counter() - started)
+        return True, ''.join(parts)
+    async def parse_conversational_command(self, text):
+        async def remote():
+            return self._remote_conversational(await self._apost(self._conversational_payload(text), timeout=10, kind="conversational"), text)
+        if SPECULATIVE_PARSE:
+            return await self._aspeculate("conversational", text, remote, lambda: self._regex_parse_command(text))
+        try:
+            return self._conversational_from_response(await self._apost(self._conversational_payload(text), timeout=10, kind="conversational"), text)
+        except Exception:
+            return self._regex_parse_command(text)
+    async def search_and_respond(self, query, on_chunk=None):
+        success, response = await self.query(self._search_prompt(query), on_chunk)
         if success:
             return response
         else:
             return f"Sorry, I couldn't get information: {response}"
+    async def aclose(self):
+        await self.client.aclose()
 
 
 def test_gemini():
@@ -0,0 +1,62 @@
+import gzip
+import json
+import threading
+from pathlib import Path
+
+FORMAT_VERSION = 1
+
+
+def request_key(payload):
+    # The user turn: the command, the conversational prompt or the question. The system
+    # instruction is left out, so a recording survives prompt-style changes.
+    try:
+        return payload["contents"][0]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+class GeminiRecorder:
+    """Gemini request/response pairs, saved as a compact corpus for offline replay.
+
+    Each exchange is keyed by ``request_key`` and keeps the kind of call,
+    the HTTP status, the reply text (None on errors) and the latency, and
+    nothing else: no API key, headers or system instruction. The latest
+    exchange for a key wins. ``Benchmarks/gemini_stub.py`` answers from a
+    recording when started with ``replay=``.
+    """
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self.exchanges = {}
+    def record(self, kind, payload, status, reply, latency):
+        key = request_key(payload)
+        if key is None:
+            return
+        with self._lock:
+            self.exchanges[key] = {"kind": kind, "status": status, "reply": reply, "latency": round(latency, 4)}
+    def get(self, key):
+        with self._lock:
+            return self.exchanges.get(key)
+    def __len__(self):
+        return len(self.exchanges)
+    def save(self, path=None):
+        path = Path(path) if path else self.path
+        if path is None:
+            return False
+        with self._lock:
+            data = {"version": FORMAT_VERSION, "exchanges": [[key, entry] for key, entry in self.exchanges.items()]}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".tmp")
+        with gzip.open(temp, "wt", encoding="utf-8", compresslevel=9) as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        temp.replace(path)
+        return True
+    @classmethod
+    def load(cls, path):
+        recorder = cls(path)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version {data.get('version')} in {path}")
+        recorder.exchanges = {key: entry for key, entry in data["exchanges"]}
+        return recorder
@@ -0,0 +1,154 @@
+import re
+import threading
+import time
+from CommandClassifier import CommandClassifier, CommandType
+from TextNormalizer import FILLER_WORDS, ARTICLES
+from System.SystemController import APP_MAPPINGS
+
+try:
+    from config import LOCAL_INTENT_ENABLED
+except ImportError:
+    LOCAL_INTENT_ENABLED = True
+
+try:
+    from config import LOCAL_INTENT_THRESHOLD
+except ImportError:
+    LOCAL_INTENT_THRESHOLD = 0.8
+
+# Websites Gemini opens as sites rather than apps ("open youtube" -> open_website).
+WEBSITES = ('youtube', 'google', 'github', 'facebook', 'instagram', 'twitter', 'reddit',
+            'amazon', 'flipkart', 'gmail', 'wikipedia', 'linkedin', 'netflix', 'whatsapp')
+PLATFORMS = ('youtube', 'google', 'amazon', 'flipkart', 'github', 'instagram', 'twitter',
+             'facebook', 'reddit', 'linkedin', 'wikipedia', 'spotify')
+
+# Anything that joins or qualifies a second clause needs the model.
+MULTI_INTENT_RE = re.compile(r'\b(and|then|also|after that|aur|phir|fir)\b|,')
+SLOT_BLOCKERS_RE = re.compile(r'\b(on|in|pe|par|from|to|for|with|using|file|folder|document|computer|pc|system|karo|kholo)\b')
+MAX_SLOT_WORDS = 6
+# A slot holding politeness, filler or an article ("notepad please", "the door") was not cleaned
+# up the way Gemini would, so the command goes remote.
+SLOT_NOISE = FILLER_WORDS | ARTICLES
+# "play video X", "play pause", "play next video" are browser controls, not media searches.
+PLAY_CONTROL_WORDS = ('video', 'pause', 'next', 'previous', 'resume', 'stop', 'page', 'tab')
+# An open_app slot that is not a known app or alias stays local only at this classifier confidence.
+APP_AGREEMENT = 0.95
+
+# (shape, action the regex fallback must agree on, classifier type that must agree or None,
+#  confidence, slot must be plain). A shape must match the whole command. None means the
+# phrase is closed-vocabulary and the classifier has nothing to add (it scores "scroll down"
+# as conversation). Plain slots carry no platform, place or file qualifier. Questions ("what
+# is X", "how to X") are answered rather than searched, so they are left to Gemini.
+INTENT_RULES = [
+    (r'(scroll (down|up)|new tab|(close|next|previous) tab|close this tab|go (back|forward)'
+     r'|(refresh|reload)( (the )?page)?|volume (up|down))', 'browser_control', None, 1.0, False),
+    (r'(copy( this)?|paste|undo|redo|select all|press (enter|escape|esc|tab))', 'app_command', None, 1.0, False),
+    (r'(list|show) (apps|applications)', 'list_apps', None, 1.0, False),
+    (r'switch back', 'switch_app', None, 1.0, False),
+    (r'(hello|hi|namaste|thank you|thanks|kaise ho)', 'conversation', None, 1.0, False),
+    (r'switch to (?P<slot>[a-z][a-z0-9]*( [a-z0-9]+)?)', 'switch_app', None, 0.9, True),
+    (r'(open|launch|start) (?P<slot>[a-z][a-z0-9 ]*)', 'open_app', CommandType.SYSTEM, 0.9, True),
+    (r'(search|google|look up|lookup) (?!for |about |karo )(?P<slot>.+) on (' + '|'.join(PLATFORMS) + ')',
+     'platform_search', CommandType.WEB, 0.9, True),
+    (r'(search|google|look up|lookup) (?!for |about |karo )(?P<slot>.+)', 'web_search', CommandType.WEB, 0.9, True),
+    (r'play (?!(' + '|'.join(PLAY_CONTROL_WORDS) + r')\b)(?P<slot>.+)', 'play_media', None, 0.9, True),
+    (r'type (?P<slot>.+)', 'app_command', None, 0.9, False),
+    (r'download research on (?P<slot>.+)', 'download_research', None, 0.9, True),
+]
+
+
+class IntentRouter:
+    """Answers clear-cut commands locally and sends the rest to Gemini.
+
+    A command stays local only when it matches one of the anchored
+    ``INTENT_RULES`` shapes, the regex fallback parser produces the action
+    that shape implies, and, for open-ended shapes, the classifier agrees on
+    the command type. Multi-step or qualified commands always go remote,
+    and so does ``open X`` unless X is a known app or alias (APP_MAPPINGS
+    or the installed apps passed in) or the classifier is sure.
+    """
+    def __init__(self, threshold=LOCAL_INTENT_THRESHOLD, enabled=LOCAL_INTENT_ENABLED):
+        self.threshold = threshold
+        self.enabled = enabled
+        self.rules = [(re.compile(shape), action, expected, confidence, plain)
+                      for shape, action, expected, confidence, plain in INTENT_RULES]
+        self.classifier = CommandClassifier()
+        self._lock = threading.Lock()
+        self.counts = {"local": 0, "remote": 0}
+        self.local_actions = {}
+        self._seconds = {"local": 0.0, "remote": 0.0}
+    def local_parse(self, text, assistant, installed_apps=None):
+        """(command_json, confidence) from the local tier; command_json is None below the threshold."""
+        cleaned = ' '.join(assistant._preprocess_text(text).lower().split())
+        if not cleaned or MULTI_INTENT_RE.search(cleaned):
+            return None, 0.0
+        for shape, action, expected, confidence, plain in self.rules:
+            match = shape.fullmatch(cleaned)
+            if not match:
+                continue
+            slot = match.groupdict().get('slot')
+            if slot is not None and not self._slot_ok(slot, action, plain):
+                return None, 0.0
+            command_json = assistant._fallback_parse(text)
+            if command_json.get('action') != action:
+                return None, 0.0
+            if expected is not None:
+                cmd_type, type_confidence, _ = self.classifier.classify(cleaned)
+                if cmd_type != expected:
+                    confidence *= 0.5
+                elif action == 'open_app' and not self._known_app(slot, installed_apps) \
+                        and type_confidence < APP_AGREEMENT:
+                    return None, 0.0
+            return (command_json if confidence >= self.threshold else None), confidence
+        return None, 0.0
+    def _slot_ok(self, slot, action, plain):
+        words = slot.split()
+        if len(words) > MAX_SLOT_WORDS:
+            return False
+        if action == 'open_app' and words[0] in WEBSITES:
+            return False
+        if not plain:
+            return True
+        return SLOT_BLOCKERS_RE.search(slot) is None and not any(word in SLOT_NOISE for word in words)
+    def _known_app(self, slot, installed_apps):
+        return slot in APP_MAPPINGS or bool(installed_apps) and slot in installed_apps
+    def route(self, text, assistant, installed_apps=None):
+        """Parse ``text`` with the local tier, or with ``assistant.parse_command_to_json``.
+
+        ``installed_apps`` (SystemController.installed_apps) widens the apps
+        ``open X`` can name locally. Returns (command_json, source) with
+        source "local" or "remote".
+        """
+        started = time.perf_counter()
+        command_json = None
+        if self.enabled:
+            command_json, _ = self.local_parse(text, assistant, installed_apps)
+        source = "local"
+        if command_json is None:
+            command_json = assistant.parse_command_to_json(text)
+            source = "remote"
+        self._record(source, command_json, time.perf_counter() - started)
+        return command_json, source
+    def _record(self, source, command_json, seconds):
+        with self._lock:
+            self.counts[source] += 1
+            self._seconds[source] += seconds
+            if source == "local":
+                action = command_json.get('action', 'unknown')
+                self.local_actions[action] = self.local_actions.get(action, 0) + 1
+    def stats(self):
+        with self._lock:
+            total = self.counts["local"] + self.counts["remote"]
+            return {
+                "enabled": self.enabled,
+                "threshold": self.threshold,
+                "local": self.counts["local"],
+                "remote": self.counts["remote"],
+                "local_fraction": self.counts["local"] / total if total else 0.0,
+                "mean_local_ms": 1000 * self._seconds["local"] / self.counts["local"] if self.counts["local"] else 0.0,
+                "mean_remote_ms": 1000 * self._seconds["remote"] / self.counts["remote"] if self.counts["remote"] else 0.0,
+                "local_actions": dict(self.local_actions),
+            }
+
+
+# Shared by every SmartAssistant (one per session), so the counters cover all sessions and lanes.
+intent_router = IntentRouter()
@@ -0,0 +1,179 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+
+try:
+    from config import JOB_HISTORY_SIZE
+except ImportError:
+    JOB_HISTORY_SIZE = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(BaseException):
+    """Raised at the next step or wait of a cancelled job.
+
+    A BaseException, like asyncio's CancelledError, so the ``except
+    Exception`` handlers around browser automation let it through.
+    """
+
+
+_current = threading.local()
+
+
+def current_job():
+    return getattr(_current, "job", None)
+
+
+def job_step(message):
+    # Progress for whoever is watching the job running on this thread; a no-op outside jobs.
+    job = current_job()
+    if job is not None:
+        job.step(message)
+
+
+def job_sleep(seconds):
+    # time.sleep that a cancelled job wakes from.
+    job = current_job()
+    if job is None:
+        time.sleep(seconds)
+    elif job.cancel_requested.wait(seconds):
+        raise JobCancelled(f"Job {job.id} cancelled")
+
+
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, command, session_id, manager, max_steps=100):
+        self.id = f"job-{next(Job._ids)}"
+        self.command = command
+        self.session_id = session_id
+        self.state = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.steps = deque(maxlen=max_steps)
+        self.cancel_requested = threading.Event()
+        self.future = None
+        self._manager = manager
+    def step(self, message):
+        if self.cancel_requested.is_set():
+            raise JobCancelled(f"Job {self.id} cancelled")
+        entry = {"time": time.time(), "message": message}
+        self.steps.append(entry)
+        self._manager._notify({"type": "job_progress", "job_id": self.id, "step": len(self.steps),
+                               "message": message, "timestamp": entry["time"]})
+    def to_dict(self, steps=True):
+        job = {
+            "job_id": self.id,
+            "command": self.command,
+            "session_id": self.session_id,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+        if steps:
+            job["steps"] = list(self.steps)
+        return job
+
+
+class JobManager:
+    """Long-running commands as jobs: submitted at once, run in the background, watched and cancelled.
+
+    ``submit`` records the job and hands it to ``schedule``, which runs it
+    somewhere (the server's command lanes) and returns a future. While it
+    runs, ``job_step`` and ``job_sleep`` on that thread report progress and
+    honour cancellation. ``listener`` gets every state change and step as
+    an event dict. The last ``history`` finished jobs stay queryable.
+    """
+    def __init__(self, listener=None, history=JOB_HISTORY_SIZE):
+        self.listener = listener
+        self.history = history
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self.counts = {"submitted": 0, SUCCEEDED: 0, FAILED: 0, CANCELLED: 0}
+    def submit(self, command, session_id, work, schedule):
+        job = Job(command, session_id, self)
+        with self._lock:
+            self._jobs[job.id] = job
+            self.counts["submitted"] += 1
+            self._trim()
+        self._changed(job)
+        try:
+            job.future = schedule(lambda: self._run(job, work))
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+            raise
+        return job
+    def _run(self, job, work):
+        with self._lock:
+            if job.state != QUEUED:
+                return job.result
+            job.state = RUNNING
+            job.started_at = time.time()
+        _current.job = job
+        self._changed(job)
+        try:
+            result = work()
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+        else:
+            success = result.get("success", True) if isinstance(result, dict) else True
+            self._finish(job, SUCCEEDED if success else FAILED, result=result)
+        finally:
+            _current.job = None
+        return job.result
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.state in FINISHED:
+            return job
+        job.cancel_requested.set()
+        if job.state == QUEUED and (job.future is None or job.future.cancel()):
+            self._finish(job, CANCELLED)
+        return job
+    def _finish(self, job, state, result=None, error=None):
+        with self._lock:
+            if job.state in FINISHED:
+                return
+            job.state = state
+            job.result = result
+            job.error = error or (result.get("error") if isinstance(result, dict) else None)
+            job.finished_at = time.time()
+            self.counts[state] += 1
+        self._changed(job)
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.state in FINISHED]
+        for job_id in finished[:max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+    def _changed(self, job):
+        self._notify({"type": "job_update", "job": job.to_dict(steps=False), "timestamp": time.time()})
+    def _notify(self, event):
+        if self.listener is not None:
+            try:
+                self.listener(event)
+            except Exception:
+                pass
+    def stats(self):
+        with self._lock:
+            active = [job.state for job in self._jobs.values()]
+            return dict(self.counts, queued=active.count(QUEUED), running=active.count(RUNNING),
+                        retained=len(self._jobs))
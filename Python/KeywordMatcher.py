@@ -0,0 +1,54 @@
+import re
+
+
+class KeywordMatcher:
+    """Finds every keyword of a fixed vocabulary in one scan of the text.
+
+    The vocabulary is compiled once into a trie-shaped regex wrapped in a
+    lookahead, so ``finditer`` visits each position of the text exactly once
+    and reports the longest keyword starting there. Shorter keywords that
+    start at the same position are prefixes of that match and are added from
+    a table built at construction, which makes ``find`` equivalent to testing
+    ``keyword in text`` for every keyword, without looping over the
+    vocabulary.
+    """
+    def __init__(self, keywords):
+        self.keywords = frozenset(k for k in keywords if k)
+        self._regex = re.compile('(?=(' + _trie_pattern(sorted(self.keywords)) + '))') if self.keywords else None
+        self._prefixes = {}
+        for keyword in self.keywords:
+            self._prefixes[keyword] = frozenset(
+                keyword[:end] for end in range(1, len(keyword) + 1)
+                if keyword[:end] in self.keywords
+            )
+
+    def find(self, text):
+        found = set()
+        if self._regex is None:
+            return found
+        prefixes = self._prefixes
+        for match in self._regex.finditer(text):
+            found |= prefixes[match.group(1)]
+        return found
+
+
+def _trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return _node_pattern(trie)
+
+def _node_pattern(node):
+    terminal = '' in node
+    branches = [re.escape(char) + _node_pattern(child)
+                for char, child in sorted(node.items()) if char != '']
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if terminal:
+        # Greedy optional keeps the longest keyword at each position.
+        return '(?:' + body + ')?'
+    return body
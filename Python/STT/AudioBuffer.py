@@ -0,0 +1,67 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Fixed-capacity sample ring for pre-roll and utterance capture.
+
+    Every sample is written twice, at ``i`` and ``i + capacity``, so the
+    newest ``n`` samples are always one contiguous slice. ``latest`` and
+    ``capture`` can therefore return views instead of concatenating.
+    Views are only valid until the ring wraps past them. Copy (or
+    preprocess into a new array) anything that must outlive the next
+    ``capacity`` samples.
+    """
+    def __init__(self, capacity, dtype=np.float32):
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=dtype)
+        self._pos = 0
+        self.total_written = 0
+        self._capture_start = None
+
+    def write(self, samples):
+        n = len(samples)
+        if n >= self.capacity:
+            samples = samples[-self.capacity:]
+            self._pos = 0
+            self._data[:self.capacity] = samples
+            self._data[self.capacity:] = samples
+            self.total_written += n
+            return
+        pos, cap = self._pos, self.capacity
+        first = min(n, cap - pos)
+        self._data[pos:pos + first] = samples[:first]
+        self._data[pos + cap:pos + cap + first] = samples[:first]
+        rest = n - first
+        if rest:
+            self._data[:rest] = samples[first:]
+            self._data[cap:cap + rest] = samples[first:]
+        self._pos = (pos + n) % cap
+        self.total_written += n
+
+    def available(self):
+        return min(self.total_written, self.capacity)
+
+    def latest(self, n):
+        n = min(int(n), self.available())
+        end = self._pos + self.capacity
+        return self._data[end - n:end]
+
+    def start_capture(self, pre_roll=0):
+        # The capture begins pre_roll samples back so the speech onset is kept.
+        self._capture_start = self.total_written - min(int(pre_roll), self.available())
+
+    def is_capturing(self):
+        return self._capture_start is not None
+
+    def capture_length(self):
+        if self._capture_start is None:
+            return 0
+        return min(self.total_written - self._capture_start, self.capacity)
+
+    def capture(self):
+        return self.latest(self.capture_length())
+
+    def stop_capture(self):
+        audio = self.capture()
+        self._capture_start = None
+        return audio
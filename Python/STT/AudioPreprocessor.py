@@ -0,0 +1,138 @@
+import time
+
+import numpy as np
+from scipy import ndimage, signal
+
+from STT.AudioBuffer import AudioRingBuffer
+
+FS = 16000
+HIGHPASS_SOS = signal.butter(4, 100, 'hp', fs=FS, output='sos')
+BANDPASS_SOS = signal.butter(3, [300, 3000], 'bp', fs=FS, output='sos')
+# High-pass then band-pass, cascaded once so each block runs one sosfilt.
+FILTER_SOS = np.vstack([HIGHPASS_SOS, BANDPASS_SOS])
+STAGES = ("gate", "filter", "normalize")
+
+
+class AudioPreprocessor:
+    """Stationary spectral gating and speech band-pass, applied as audio arrives.
+
+    ``calibrate`` computes the noise threshold per frequency once, from the
+    calibration sample (mean + ``n_std_thresh`` std in dB, as noisereduce
+    does for stationary noise). Between ``begin`` and ``finish`` each fed
+    block goes through a 50%-overlap STFT gate and the cascaded filters,
+    whose state carries across blocks. The cleaned samples collect in a
+    ring, so ``finish`` only flushes the last half frame and
+    peak-normalises. Per-stage time is accumulated for ``stats``.
+    """
+    def __init__(self, fs=FS, n_fft=512, prop_decrease=0.8, n_std_thresh=1.5,
+                 freq_smooth_hz=500, time_smooth_ms=50, max_seconds=40):
+        self.fs = fs
+        self.n_fft = n_fft
+        self.hop = n_fft // 2
+        self.prop_decrease = prop_decrease
+        self.n_std_thresh = n_std_thresh
+        self.window = np.sqrt(signal.get_window('hann', n_fft)).astype(np.float32)
+        bins = max(1, int(freq_smooth_hz / (fs / n_fft)))
+        kernel = np.concatenate([np.linspace(0, 1, bins + 1, endpoint=False)[1:], np.linspace(1, 0, bins + 2)[:-1]])
+        self.freq_kernel = kernel / kernel.sum()
+        self.time_alpha = 1 - np.exp(-self.hop / (fs * time_smooth_ms / 1000))
+        self.noise_thresh = None
+        self.output = AudioRingBuffer(int(max_seconds * fs))
+        self._timings = {stage: 0.0 for stage in STAGES}
+        self.utterances = 0
+        self.samples = 0
+        self.reset()
+
+    def calibrate(self, noise_sample):
+        noise_sample = np.asarray(noise_sample, dtype=np.float32)
+        if len(noise_sample) < self.n_fft:
+            self.noise_thresh = None
+            return
+        frames = np.lib.stride_tricks.sliding_window_view(noise_sample, self.n_fft)[::self.hop]
+        noise_db = self._db(np.fft.rfft(frames * self.window, axis=1))
+        self.noise_thresh = noise_db.mean(axis=0) + self.n_std_thresh * noise_db.std(axis=0)
+
+    def _db(self, spectrum):
+        return 20 * np.log10(np.abs(spectrum) + 1e-10)
+
+    def reset(self):
+        self._tail = np.zeros(self.hop, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._ola = np.zeros(self.hop, dtype=np.float32)
+        self._mask = None
+        self._zi = np.zeros((FILTER_SOS.shape[0], 2))
+        self._fed = 0
+        if self.output.is_capturing():
+            self.output.stop_capture()
+
+    def begin(self, pre_roll=None):
+        self.reset()
+        self.output.start_capture(0)
+        if pre_roll is not None and len(pre_roll):
+            self.feed(pre_roll)
+
+    def feed(self, samples):
+        self._fed += len(samples)
+        started = time.perf_counter()
+        data = np.concatenate([self._pending, samples])
+        count = len(data) // self.hop
+        if count == 0:
+            self._pending = data
+            return
+        buf = np.concatenate([self._tail, data[:count * self.hop]])
+        self._tail = buf[-self.hop:]
+        self._pending = data[count * self.hop:]
+        frames = np.lib.stride_tricks.sliding_window_view(buf, self.n_fft)[::self.hop]
+        spectrum = np.fft.rfft(frames * self.window, axis=1)
+        if self.noise_thresh is not None:
+            spectrum *= self._gain(spectrum)
+        frames_out = np.fft.irfft(spectrum, n=self.n_fft, axis=1) * self.window
+        halves = np.vstack([self._ola, frames_out[:-1, self.hop:]])
+        cleaned = (frames_out[:, :self.hop] + halves).reshape(-1)
+        self._ola = frames_out[-1, self.hop:].copy()
+        gated = time.perf_counter()
+        cleaned, self._zi = signal.sosfilt(FILTER_SOS, cleaned, zi=self._zi)
+        self.output.write(cleaned)
+        self._timings["gate"] += gated - started
+        self._timings["filter"] += time.perf_counter() - gated
+
+    def _gain(self, spectrum):
+        mask = (self._db(spectrum) > self.noise_thresh).astype(np.float32)
+        mask = ndimage.convolve1d(mask, self.freq_kernel, axis=1, mode='nearest')
+        # Smooth over time with state carried across blocks.
+        previous = self._mask if self._mask is not None else mask[0]
+        for i in range(len(mask)):
+            previous = previous + self.time_alpha * (mask[i] - previous)
+            mask[i] = previous
+        self._mask = previous
+        return mask * self.prop_decrease + (1.0 - self.prop_decrease)
+
+    def finish(self):
+        # Zeros push the last half frame out; the first hop of output is the STFT delay.
+        fed = self._fed
+        self.feed(np.zeros(self.hop + (-fed) % self.hop, dtype=np.float32))
+        started = time.perf_counter()
+        audio = self.output.stop_capture()[self.hop:self.hop + fed]
+        max_val = np.max(np.abs(audio)) if len(audio) else 0
+        audio = audio / max_val if max_val > 0 else audio.copy()
+        self._timings["normalize"] += time.perf_counter() - started
+        self.utterances += 1
+        self.samples += fed
+        self.reset()
+        return audio.astype(np.float32, copy=False)
+
+    def process(self, audio_np):
+        self.begin(audio_np)
+        return self.finish()
+
+    def stats(self):
+        seconds = self.samples / self.fs
+        return {
+            "utterances": self.utterances,
+            "audio_seconds": seconds,
+            "calibrated": self.noise_thresh is not None,
+            "stage_ms": {stage: total * 1000 for stage, total in self._timings.items()},
+            "stage_ms_per_audio_second": {
+                stage: (total * 1000 / seconds if seconds else 0.0) for stage, total in self._timings.items()
+            },
+        }
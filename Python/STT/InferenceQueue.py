@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from Stats import percentile
+
+
+class DroppedJob(Exception):
+    pass
+
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class _Job:
+    __slots__ = ("item", "future", "enqueued")
+
+    def __init__(self, item):
+        self.item = item
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class InferenceWorker:
+    """Single background thread that runs ``batch_fn`` over queued items.
+
+    Pending items are collected into batches of up to ``max_batch``, waiting
+    at most ``batch_wait`` seconds for a batch to fill, and ``batch_fn``
+    must return one result per item. The queue holds at most ``max_queue``
+    items. When it is full, ``drop_policy`` decides what happens:
+    ``drop_oldest`` fails the oldest pending job with ``DroppedJob``,
+    ``drop_newest`` fails the new one, and ``block`` makes ``submit`` wait.
+    """
+    def __init__(self, batch_fn, max_queue=8, max_batch=4, batch_wait=0.05,
+                 drop_policy="drop_oldest", name="inference-worker"):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy '{drop_policy}', expected one of {DROP_POLICIES}")
+        self.batch_fn = batch_fn
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.drop_policy = drop_policy
+        self._jobs = deque()
+        self._cond = threading.Condition()
+        self._running = True
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._batched_items = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=200)
+        self._busy_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        job = _Job(item)
+        dropped = None
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("Inference worker is stopped")
+            while len(self._jobs) >= self.max_queue:
+                if self.drop_policy == "drop_oldest":
+                    dropped = self._jobs.popleft()
+                    self._dropped += 1
+                    break
+                if self.drop_policy == "drop_newest":
+                    self._dropped += 1
+                    job.future.set_exception(DroppedJob("Inference queue full, dropped newest job"))
+                    return job.future
+                self._cond.wait()
+                # stop() ran while this caller waited for room; the worker is gone.
+                if not self._running:
+                    raise RuntimeError("Inference worker is stopped")
+            self._jobs.append(job)
+            self._submitted += 1
+            self._cond.notify_all()
+        if dropped is not None:
+            dropped.future.set_exception(DroppedJob("Inference queue full, dropped oldest job"))
+        return job.future
+
+    def _take_batch(self):
+        with self._cond:
+            while self._running and not self._jobs:
+                self._cond.wait()
+            if not self._jobs:
+                return []
+            deadline = time.perf_counter() + self.batch_wait
+            while self._running and len(self._jobs) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = [self._jobs.popleft() for _ in range(min(self.max_batch, len(self._jobs)))]
+            self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            started = time.perf_counter()
+            waits = [started - job.enqueued for job in batch]
+            try:
+                results = self.batch_fn([job.item for job in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+                error = None
+            except Exception as e:
+                results, error = None, e
+            elapsed = time.perf_counter() - started
+            with self._cond:
+                self._batches += 1
+                self._batched_items += len(batch)
+                self._busy_seconds += elapsed
+                self._wait_total += sum(waits)
+                self._wait_max = max(self._wait_max, max(waits))
+                self._recent_waits.extend(waits)
+                if error is None:
+                    self._completed += len(batch)
+                else:
+                    self._failed += len(batch)
+            for i, job in enumerate(batch):
+                if error is None:
+                    job.future.set_result(results[i])
+                else:
+                    job.future.set_exception(error)
+
+    def depth(self):
+        return len(self._jobs)
+
+    def stats(self):
+        with self._cond:
+            finished = self._completed + self._failed
+            return {
+                "depth": len(self._jobs),
+                "max_queue": self.max_queue,
+                "drop_policy": self.drop_policy,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "avg_batch_size": self._batched_items / self._batches if self._batches else 0.0,
+                "avg_wait_ms": self._wait_total / finished * 1000 if finished else 0.0,
+                "p95_wait_ms": percentile(list(self._recent_waits), 95) * 1000,
+                "max_wait_ms": self._wait_max * 1000,
+                "busy_seconds": self._busy_seconds,
+            }
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._running = False
+            pending = list(self._jobs)
+            self._jobs.clear()
+            self._cond.notify_all()
+        for job in pending:
+            job.future.set_exception(DroppedJob("Inference worker stopped"))
+        self._thread.join(timeout)
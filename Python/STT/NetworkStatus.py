@@ -1,4 +1,6 @@
 import socket
+import threading
+import time
 
 def check_server_connectivity(host="HOST_ADDRESS", port = 80, timeout = 3):
     try:
@@ -6,3 +8,110 @@ def check_server_connectivity(host="HOST_ADDRESS", port = 80, timeout = 3):
             return True
     except (socket.timeout, ConnectionRefusedError, OSError):
         return False
+
+
+class ConnectivityMonitor:
+    """Probes reachability in a background thread so callers never wait on a socket.
+
+    ``is_online`` returns the cached state. It is ``False`` until the first
+    probe completes. The probe runs every ``interval`` seconds while online.
+    While offline the delay doubles after each failed probe, up to
+    ``max_interval``. A result older than ``ttl`` counts as stale, and
+    reading it wakes the prober. Listeners are called with the new state
+    whenever it changes.
+    """
+    def __init__(self, host="8.8.8.8", port=53, timeout=3, interval=15, max_interval=120, ttl=30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.ttl = ttl
+        self.online = None
+        self.last_probe = 0.0
+        self.last_change = None
+        self.next_delay = interval
+        self.probes = 0
+        self._listeners = []
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return self
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="connectivity-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def is_online(self):
+        if self.is_stale():
+            self.refresh()
+        return bool(self.online)
+
+    def is_stale(self):
+        return time.time() - self.last_probe > self.ttl
+
+    def refresh(self):
+        # Ask for a probe now, e.g. after a remote call failed; never blocks.
+        self.start()
+        self._wake.set()
+
+    def probe(self):
+        online = check_server_connectivity(self.host, self.port, self.timeout)
+        self.probes += 1
+        self.last_probe = time.time()
+        changed = online != self.online
+        self.online = online
+        if online:
+            self.next_delay = self.interval
+        else:
+            self.next_delay = min(self.max_interval, self.next_delay * 2)
+        if changed:
+            self.last_change = self.last_probe
+            for callback in list(self._listeners):
+                try:
+                    callback(online)
+                except Exception as e:
+                    print(f"⚠️  Connectivity listener failed: {e}")
+        return online
+
+    def _run(self):
+        # A probe made just before start(), as main.py does for its first answer, stands in for the first one.
+        fresh_for = self.next_delay - (time.time() - self.last_probe)
+        if fresh_for > 0:
+            self._wake.wait(fresh_for)
+        while self._running:
+            self._wake.clear()
+            self.probe()
+            self._wake.wait(self.next_delay)
+
+    def status(self):
+        return {
+            "online": self.online,
+            "stale": self.is_stale(),
+            "last_probe": self.last_probe or None,
+            "last_change": self.last_change,
+            "next_probe_in": self.next_delay,
+            "probes": self.probes,
+        }
+
+
+connectivity_monitor = ConnectivityMonitor()
+
+def is_network_available():
+    return connectivity_monitor.is_online()
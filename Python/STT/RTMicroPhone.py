@@ -1,56 +1,34 @@
 import sounddevice as sd
 import numpy as np
 import queue
-import webrtcvad
+import sys
 import noisereduce as nr
 from scipy import signal
-from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from STT.VoiceActivity import SpeechDetector, ENERGY_THRESHOLD, MIN_SPEECH_DURATION
+from STT.AudioBuffer import AudioRingBuffer
+from STT.AudioPreprocessor import AudioPreprocessor, HIGHPASS_SOS, BANDPASS_SOS
 
 fs = 16000
 blocksize = 1024
-q = queue.Queue()
-vad = webrtcvad.Vad(3)  
+MAX_QUEUED_SECONDS = 10
+# Bounded so a stalled consumer cannot grow memory; the oldest audio is dropped first.
+q = queue.Queue(maxsize=int(MAX_QUEUED_SECONDS * fs / blocksize))
+audio_queue_stats = {"dropped_blocks": 0}
+# Callback blocks cycle through this pool; it outlasts anything the queue and consumer can hold.
+_block_pool = np.zeros((q.maxsize + 2, blocksize, 1), dtype=np.float32)
+_pool_index = 0
 
-ENERGY_THRESHOLD = 0.015  
-MIN_SPEECH_DURATION = 0.5  
 SILENCE_DURATION = 1.0  
-
-class SpeechDetector:
-    def __init__(self):
-        self.speech_frames = deque(maxlen=int(MIN_SPEECH_DURATION * fs / blocksize))
-        self.silence_frames = 0
-        self.is_speaking = False
-        self.noise_level = 0.01
-        
-    def calculate_energy(self, audio):
-        return np.sqrt(np.mean(audio**2))
-    
-    def update_noise_level(self, audio):
-        energy = self.calculate_energy(audio)
-        self.noise_level = 0.95 * self.noise_level + 0.05 * energy
-    
-    def is_speech_energy(self, audio):
-        energy = self.calculate_energy(audio)
-        return energy > max(ENERGY_THRESHOLD, self.noise_level * 3)
+# Longer utterances are cut here so capture memory stays bounded.
+MAX_UTTERANCE_SECONDS = 30
 
 def is_speech(audio_block, detector):
-    if not detector.is_speech_energy(audio_block):
-        return False
-    
-    pcm_data = (audio_block * 32767).astype(np.int16).tobytes()
-    frame_length = 480  
-    speech_frames = 0
-    total_frames = 0
-    
-    for i in range(0, len(pcm_data), frame_length*2):
-        frame = pcm_data[i:i+frame_length*2]
-        if len(frame) < frame_length*2:
-            break
-        total_frames += 1
-        if vad.is_speech(frame, sample_rate=fs):
-            speech_frames += 1
-    
-    return total_frames > 0 and (speech_frames / total_frames) >= 0.7
+    return detector.is_speech(audio_block)
 
 def preprocess_audio(audio_np, noise_sample=None):
     
@@ -65,11 +43,8 @@ def preprocess_audio(audio_np, noise_sample=None):
     else:
         audio_np = nr.reduce_noise(y=audio_np, sr=fs, stationary=True)
     
-    sos = signal.butter(4, 100, 'hp', fs=fs, output='sos')
-    audio_np = signal.sosfilt(sos, audio_np)
-    
-    sos_bp = signal.butter(3, [300, 3000], 'bp', fs=fs, output='sos')
-    audio_np = signal.sosfilt(sos_bp, audio_np)
+    audio_np = signal.sosfilt(HIGHPASS_SOS, audio_np)
+    audio_np = signal.sosfilt(BANDPASS_SOS, audio_np)
     
     max_val = np.max(np.abs(audio_np))
     if max_val > 0:
@@ -78,16 +53,41 @@ def preprocess_audio(audio_np, noise_sample=None):
     return audio_np.astype(np.float32)
 
 def audio_callback(indata, frames, time_info, status):
+    global _pool_index
     if status:
         print(status)
-    q.put(indata.copy())
+    if indata.shape == _block_pool.shape[1:]:
+        # Reuse a pooled block instead of allocating one per callback.
+        block = _block_pool[_pool_index]
+        _pool_index = (_pool_index + 1) % len(_block_pool)
+        np.copyto(block, indata)
+    else:
+        block = indata.copy()
+    try:
+        q.put_nowait(block)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        audio_queue_stats["dropped_blocks"] += 1
+        try:
+            q.put_nowait(block)
+        except queue.Full:
+            pass
 
-def stream_microPhone(stt_function, buffer_seconds=2, noise_profile_duration=3):
-    buffer = []
-    speech_buffer = []
-    max_buffer_len = int(buffer_seconds * fs / blocksize)
+def stream_microPhone(stt_function, buffer_seconds=2, noise_profile_duration=3, streaming_stt=None,
+                      preprocessor=None):
+    # With streaming_stt (e.g. VoskStream) every block is decoded as it
+    # arrives and stt_function only has to collect the final result.
+    # Otherwise the preprocessor cleans each block as it arrives.
+    # stt_function may also return a Future when it hands the audio to a worker.
+    if preprocessor is None and streaming_stt is None:
+        preprocessor = AudioPreprocessor(fs, max_seconds=buffer_seconds + MAX_UTTERANCE_SECONDS + 1)
+    pre_roll = int(buffer_seconds * fs / blocksize) * blocksize
+    max_capture = pre_roll + int(MAX_UTTERANCE_SECONDS * fs)
+    ring = AudioRingBuffer(max(max_capture, int(noise_profile_duration * fs) + blocksize))
     detector = SpeechDetector()
-    noise_profile = []
     
     print("\n" + "="*60)
     print("NOISE CALIBRATION")
@@ -102,14 +102,15 @@ def stream_microPhone(stt_function, buffer_seconds=2, noise_profile_duration=3):
         try:
             noise_blocks = int(noise_profile_duration * fs / blocksize)
             for i in range(noise_blocks):
-                block = q.get()
-                noise_profile.append(block)
+                ring.write(q.get().reshape(-1))
                 if (i+1) % 5 == 0:
                     print(f"Calibrating... {i+1}/{noise_blocks}")
             
-            noise_sample = np.concatenate(noise_profile, axis=0).flatten()
+            noise_sample = ring.latest(noise_blocks * blocksize).copy()
             
             detector.noise_level = detector.calculate_energy(noise_sample)
+            if preprocessor is not None:
+                preprocessor.calibrate(noise_sample)
             
             print("\n" + "="*60)
             print(f"Calibration complete!")
@@ -123,50 +124,67 @@ def stream_microPhone(stt_function, buffer_seconds=2, noise_profile_duration=3):
             max_silence_blocks = int(SILENCE_DURATION * fs / blocksize)
             
             while True:
-                audio_block = q.get()
-                audio_flat = audio_block.flatten()
+                audio_flat = q.get().reshape(-1)
+                ring.write(audio_flat)
                 
                 if not detector.is_speaking:
                     detector.update_noise_level(audio_flat)
-                
-                buffer.append(audio_block)
-                if len(buffer) > max_buffer_len:
-                    buffer.pop(0)
 
+                endpoint = False
                 if is_speech(audio_flat, detector):
                     silence_blocks = 0
                     if not detector.is_speaking:
                         detector.is_speaking = True
-                        speech_buffer = buffer.copy()
+                        ring.start_capture(pre_roll)
                         print("Speech detected...", end='', flush=True)
+                        if streaming_stt is not None:
+                            streaming_stt.reset()
+                            streaming_stt.accept_block(ring.capture())
+                        else:
+                            preprocessor.begin(ring.capture())
+                    elif streaming_stt is not None:
+                        streaming_stt.accept_block(audio_flat)
                     else:
-                        speech_buffer.append(audio_block)
-                else:
-                    if detector.is_speaking:
-                        silence_blocks += 1
-                        speech_buffer.append(audio_block)
+                        preprocessor.feed(audio_flat)
+                elif detector.is_speaking:
+                    silence_blocks += 1
+                    if streaming_stt is not None:
+                        streaming_stt.accept_block(audio_flat)
+                    else:
+                        preprocessor.feed(audio_flat)
+                    endpoint = silence_blocks >= max_silence_blocks
+
+                if detector.is_speaking and (endpoint or ring.capture_length() >= max_capture):
+                    print(" Processing...")
+                    detector.is_speaking = False
+                    silence_blocks = 0
+                    
+                    # A view into the ring, overwritten once the ring wraps; good for
+                    # the energy check here, but stt_function may keep it (a Future).
+                    audio_np = ring.stop_capture()
+                    
+                    if detector.calculate_energy(audio_np) > ENERGY_THRESHOLD:
+                        if streaming_stt is not None:
+                            # Already decoded block by block; skip the batch cleanup.
+                            audio_proc = audio_np.copy()
+                        else:
+                            # Cleaned block by block; only the tail and normalisation remain.
+                            # finish() returns a new array, not a view into the ring.
+                            audio_proc = preprocessor.finish()
                         
-                        if silence_blocks >= max_silence_blocks:
-                            print(" Processing...")
-                            detector.is_speaking = False
-                            silence_blocks = 0
-                            
-                            audio_np = np.concatenate(speech_buffer, axis=0).flatten()
-                            
-                            if detector.calculate_energy(audio_np) > ENERGY_THRESHOLD:
-                                audio_proc = preprocess_audio(audio_np, noise_sample)
-                                
-                                text = stt_function(audio_proc)
-                                if text.strip() != "" and len(text.strip()) > 2:
-                                    print(f"Transcription: {text}\n")
-                                else:
-                                    print("No clear speech detected\n")
-                            else:
-                                print("Audio too quiet\n")
-                            
-                            speech_buffer = []
+                        text = stt_function(audio_proc)
+                        if isinstance(text, Future):
+                            print("Queued for transcription\n")
+                        elif text and text.strip() != "" and len(text.strip()) > 2:
+                            print(f"Transcription: {text}\n")
+                        else:
+                            print("No clear speech detected\n")
+                    else:
+                        if preprocessor is not None:
+                            preprocessor.reset()
+                        print("Audio too quiet\n")
 
         except KeyboardInterrupt:
             print("\n\nStopped listening.")
         except Exception as e:
-            print(f"\nError: {e}")
\ No newline at end of file
+            print(f"\nError: {e}")
@@ -0,0 +1,126 @@
+import math
+import sys
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import webrtcvad
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from config import VAD_MODE
+except ImportError:
+    VAD_MODE = "webrtc"
+
+ENERGY_THRESHOLD = 0.015
+MIN_SPEECH_DURATION = 0.5
+FRAME_LENGTH = 480
+SPEECH_RATIO = 0.7
+# Frames this far below the block threshold cannot be speech; skip the VAD call for them.
+FRAME_ENERGY_GATE = 0.5
+ZCR_RANGE = (0.02, 0.35)
+VAD_MODES = ("webrtc", "energy_zcr")
+
+
+class VoiceActivityDetector:
+    """Frame-level speech decision for one microphone block.
+
+    Per-frame energies come from one NumPy pass over the block. Frames below
+    the energy gate count as silence without calling the VAD. ``webrtc``
+    mode converts the block into a preallocated int16 buffer and passes
+    zero-copy frame views to webrtcvad, stopping as soon as the outcome is
+    decided. ``energy_zcr`` mode drops webrtcvad: a frame counts as voiced
+    when it has enough energy and its zero-crossing rate falls in
+    ``ZCR_RANGE``.
+    """
+    def __init__(self, fs=16000, blocksize=1024, mode=VAD_MODE, aggressiveness=3):
+        if mode not in VAD_MODES:
+            raise ValueError(f"Unknown VAD mode '{mode}', expected one of {VAD_MODES}")
+        self.fs = fs
+        self.mode = mode
+        self.vad = webrtcvad.Vad(aggressiveness)
+        self._allocate(blocksize)
+
+    def _allocate(self, size):
+        self._scaled = np.empty(size, dtype=np.float32)
+        self._pcm = np.empty(size, dtype=np.int16)
+        self._pcm_bytes = memoryview(self._pcm).cast('B')
+
+    def _to_pcm(self, audio):
+        n = len(audio)
+        if n > len(self._pcm):
+            self._allocate(n)
+        np.multiply(audio, 32767, out=self._scaled[:n], casting='unsafe')
+        self._pcm[:n] = self._scaled[:n]
+        return self._pcm_bytes
+
+    def frames(self, audio):
+        count = len(audio) // FRAME_LENGTH
+        return audio[:count * FRAME_LENGTH].reshape(count, FRAME_LENGTH)
+
+    def frame_energies(self, frames):
+        return np.sqrt(np.einsum('ij,ij->i', frames, frames) / FRAME_LENGTH)
+
+    def is_speech(self, audio, threshold):
+        frames = self.frames(audio)
+        total = len(frames)
+        if total == 0:
+            return False
+        needed = math.ceil(SPEECH_RATIO * total - 1e-9)
+        candidates = self.frame_energies(frames) > threshold * FRAME_ENERGY_GATE
+        if np.count_nonzero(candidates) < needed:
+            return False
+        if self.mode == "energy_zcr":
+            zcr = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1) / FRAME_LENGTH
+            voiced = candidates & (zcr >= ZCR_RANGE[0]) & (zcr <= ZCR_RANGE[1])
+            return np.count_nonzero(voiced) >= needed
+        pcm = self._to_pcm(audio)
+        frame_bytes = FRAME_LENGTH * 2
+        allowed_misses = total - needed
+        speech = misses = 0
+        for i in range(total):
+            if candidates[i] and self.vad.is_speech(pcm[i * frame_bytes:(i + 1) * frame_bytes], sample_rate=self.fs):
+                speech += 1
+                if speech >= needed:
+                    return True
+            else:
+                misses += 1
+                if misses > allowed_misses:
+                    return False
+        return False
+
+
+class SpeechDetector:
+    def __init__(self, fs=16000, blocksize=1024, vad_mode=VAD_MODE):
+        self.speech_frames = deque(maxlen=int(MIN_SPEECH_DURATION * fs / blocksize))
+        self.silence_frames = 0
+        self.is_speaking = False
+        self.noise_level = 0.01
+        self.vad = VoiceActivityDetector(fs, blocksize, mode=vad_mode)
+        self._energy_block = None
+        self._energy = 0.0
+
+    def calculate_energy(self, audio):
+        # The loop asks for the same block's energy more than once; compute it once.
+        if audio is self._energy_block:
+            return self._energy
+        energy = float(np.sqrt(np.dot(audio, audio) / len(audio))) if len(audio) else 0.0
+        self._energy_block, self._energy = audio, energy
+        return energy
+
+    def update_noise_level(self, audio):
+        energy = self.calculate_energy(audio)
+        self.noise_level = 0.95 * self.noise_level + 0.05 * energy
+
+    def speech_threshold(self):
+        return max(ENERGY_THRESHOLD, self.noise_level * 3)
+
+    def is_speech_energy(self, audio):
+        energy = self.calculate_energy(audio)
+        return energy > self.speech_threshold()
+
+    def is_speech(self, audio):
+        if not self.is_speech_energy(audio):
+            return False
+        return self.vad.is_speech(audio, self.speech_threshold())
@@ -1,19 +1,138 @@
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import numpy as np
 from vosk import Model, KaldiRecognizer
 
 vosk_model_path = os.path.join(os.path.dirname(__file__), "vosk-model-en-us-0.22")
-if not os.path.exists(vosk_model_path):
-    raise Exception(f"Vosk model folder not found at {vosk_model_path}")
+# Enough to keep the cores busy; the decoder releases the GIL.
+VOSK_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
 
-model = Model(vosk_model_path)
-recognizer = KaldiRecognizer(model, 16000)
+_model = None
+_model_lock = threading.Lock()
 
-def stt_vosk(audio_np):
+def vosk_model_available():
+    return os.path.exists(vosk_model_path)
+
+def get_model():
+    # The model is large; load it on first use, once, whichever thread gets here first.
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                if not vosk_model_available():
+                    raise Exception(f"Vosk model folder not found at {vosk_model_path}")
+                _model = Model(vosk_model_path)
+    return _model
+
+
+class RecognizerPool:
+    """Hands out reset recognizers, keyed by sample rate.
+
+    A recognizer is used by one thread at a time and reset before it goes
+    back to the pool. No state carries over between utterances, and
+    concurrent callers decode on separate recognizers that share one
+    model. At most ``max_idle`` recognizers per sample rate are kept.
+    """
+    def __init__(self, max_idle=VOSK_WORKERS):
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self, sample_rate=16000):
+        with self._lock:
+            idle = self._idle.get(sample_rate)
+            if idle:
+                return idle.pop()
+            self.created += 1
+        return KaldiRecognizer(get_model(), sample_rate)
+
+    def release(self, recognizer, sample_rate=16000):
+        recognizer.Reset()
+        with self._lock:
+            idle = self._idle.setdefault(sample_rate, [])
+            if len(idle) < self.max_idle:
+                idle.append(recognizer)
+
+    @contextmanager
+    def recognizer(self, sample_rate=16000):
+        recognizer = self.acquire(sample_rate)
+        try:
+            yield recognizer
+        finally:
+            self.release(recognizer, sample_rate)
+
+
+recognizer_pool = RecognizerPool()
+_decode_executor = None
+
+def stt_vosk(audio_np, sample_rate=16000):
     data_bytes = (audio_np * 32767).astype(np.int16).tobytes()
-    if recognizer.AcceptWaveform(data_bytes):
-        result = json.loads(recognizer.Result())
-    else:
-        result = json.loads(recognizer.PartialResult())
-    return result.get("text", "").strip()
\ No newline at end of file
+    with recognizer_pool.recognizer(sample_rate) as recognizer:
+        recognizer.AcceptWaveform(data_bytes)
+        result = json.loads(recognizer.FinalResult())
+    return result.get("text", "").strip()
+
+def stt_vosk_batch(audios, sample_rate=16000):
+    global _decode_executor
+    if len(audios) == 1:
+        return [stt_vosk(audios[0], sample_rate)]
+    if _decode_executor is None:
+        _decode_executor = ThreadPoolExecutor(max_workers=VOSK_WORKERS, thread_name_prefix="vosk-decode")
+    return list(_decode_executor.map(lambda audio_np: stt_vosk(audio_np, sample_rate), audios))
+
+class VoskStream:
+    """Incremental Vosk decoding, fed one microphone block at a time.
+
+    Partial hypotheses are reported through ``on_partial`` as they change,
+    and ``finalize`` returns the utterance text as soon as endpointing fires,
+    since the audio has already been decoded by then. ``transcribe`` has the
+    ``stt_function`` signature used by ``stream_microPhone``.
+    """
+    def __init__(self, on_partial=None, sample_rate=16000):
+        self.sample_rate = sample_rate
+        self.recognizer = recognizer_pool.acquire(sample_rate)
+        self.on_partial = on_partial
+        self.last_result = ""
+        self._segments = []
+        self._last_partial = ""
+
+    def reset(self):
+        self.recognizer.Reset()
+        self._segments = []
+        self._last_partial = ""
+
+    def accept_block(self, audio_block):
+        data_bytes = (audio_block * 32767).astype(np.int16).tobytes()
+        if self.recognizer.AcceptWaveform(data_bytes):
+            # Vosk found a pause inside the utterance; keep the segment.
+            text = json.loads(self.recognizer.Result()).get("text", "").strip()
+            if text:
+                self._segments.append(text)
+            partial = ""
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+        hypothesis = " ".join(self._segments + ([partial] if partial else []))
+        if hypothesis and hypothesis != self._last_partial:
+            self._last_partial = hypothesis
+            if self.on_partial:
+                self.on_partial(hypothesis)
+
+    def finalize(self):
+        text = json.loads(self.recognizer.FinalResult()).get("text", "").strip()
+        if text:
+            self._segments.append(text)
+        self.last_result = " ".join(self._segments)
+        self.reset()
+        return self.last_result
+
+    def transcribe(self, audio_np=None):
+        return self.finalize()
+
+    def close(self):
+        if self.recognizer is not None:
+            recognizer_pool.release(self.recognizer, self.sample_rate)
+            self.recognizer = None
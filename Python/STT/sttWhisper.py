@@ -1,7 +1,9 @@
-import torch
+import importlib.util
+import os
+import threading
+import time
+from multiprocessing import AuthenticationError
 import numpy as np
-import torchaudio
-from transformers import WhisperProcessor, WhisperForConditionalGeneration
 import sys
 from pathlib import Path
 
@@ -12,49 +14,402 @@ try:
 except ImportError:
     PRIMARY_LANGUAGE = "english"
 
-if torch.cuda.is_available():
-    device = "cuda"
-elif torch.backends.mps.is_available():
-    device = "mps"
-else:
-    device = "cpu"
+try:
+    from config import WHISPER_MODEL_SIZE
+except ImportError:
+    WHISPER_MODEL_SIZE = "medium"
 
-model_name = "openai/whisper-medium"
-processor = WhisperProcessor.from_pretrained(model_name)
-model = WhisperForConditionalGeneration.from_pretrained(model_name).to(device)
+try:
+    from config import WHISPER_BACKEND
+except ImportError:
+    WHISPER_BACKEND = "auto"
 
-model.config.forced_decoder_ids = None
+try:
+    from config import WHISPER_BEAM_SIZE
+except ImportError:
+    WHISPER_BEAM_SIZE = 5
 
-print(f"✓ Whisper initialized with PRIMARY_LANGUAGE: {PRIMARY_LANGUAGE}")
+try:
+    from config import WHISPER_FAST_MODE_SECONDS
+except ImportError:
+    WHISPER_FAST_MODE_SECONDS = 4.0
 
-def stt_whisper(audio_np):
-    audio_np = audio_np / np.max(np.abs(audio_np))
-    input_features = processor(audio_np, sampling_rate=16000, return_tensors="pt").input_features.to(device)
-    predicted_ids = model.generate(
-        input_features,
-        language=PRIMARY_LANGUAGE,
-        task="transcribe",
-        max_length=448,
-        num_beams=5,
-        temperature=0.0,
-        compression_ratio_threshold=1.35,
-        logprob_threshold=-1.0,
-        no_repeat_ngram_size=3,
-    )
-    transcription = processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
+try:
+    from config import WHISPER_WORKER_ADDRESS
+except ImportError:
+    WHISPER_WORKER_ADDRESS = None
+
+try:
+    from config import WHISPER_WORKER_AUTHKEY
+except ImportError:
+    WHISPER_WORKER_AUTHKEY = None
+
+# Without a configured key, the worker makes one per launch and leaves it here for clients on this machine.
+WHISPER_WORKER_KEY_FILE = Path(__file__).parent / "whisper_worker.key"
+# Or a launcher that starts the worker itself passes it one (hex) in this variable.
+WHISPER_AUTHKEY_ENV = "ETHER_WHISPER_AUTHKEY"
+
+SUSPICIOUS_RANGES = (
+    (0x1780, 0x17FF),
+    (0x0E00, 0x0E7F),
+    (0x0600, 0x06FF),
+    (0x4E00, 0x9FFF),
+    (0x3040, 0x309F),
+    (0x30A0, 0x30FF),
+)
+
+WHISPER_MODEL_SIZES = ("tiny", "base", "small", "medium")
+WHISPER_BACKENDS = ("auto", "transformers", "int8", "onnx", "ctranslate2")
+LANGUAGE_CODES = {"english": "en", "hindi": "hi"}
+
+def _installed(*names):
+    # find_spec only looks the packages up, it does not import torch.
+    return all(importlib.util.find_spec(name) is not None for name in names)
+
+def whisper_installed():
+    return _installed("faster_whisper") or _installed("torch", "transformers")
+
+def _torch_device(torch):
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+def _filter_transcription(transcription):
     transcription = transcription.strip()
-    suspicious_ranges = [
-        (0x1780, 0x17FF),
-        (0x0E00, 0x0E7F),
-        (0x0600, 0x06FF),
-        (0x4E00, 0x9FFF),
-        (0x3040, 0x309F),
-        (0x30A0, 0x30FF),
-    ]
     for char in transcription:
         code = ord(char)
-        for start, end in suspicious_ranges:
+        for start, end in SUSPICIOUS_RANGES:
             if start <= code <= end:
                 print(f"⚠️  Detected non-Hindi/English script, likely wrong detection. Ignoring.")
                 return ""
-    return transcription
\ No newline at end of file
+    return transcription
+
+
+class TransformersBackend:
+    """Hugging Face ``generate`` on the best torch device."""
+    name = "transformers"
+
+    def __init__(self, model_size):
+        self.model_name = f"openai/whisper-{model_size}"
+        self.device = None
+
+    def load(self):
+        import torch
+        from transformers import WhisperProcessor
+        self.device = _torch_device(torch)
+        self.processor = WhisperProcessor.from_pretrained(self.model_name)
+        self.model = self._load_model(torch)
+        self.model.config.forced_decoder_ids = None
+
+    def _load_model(self, torch):
+        from transformers import WhisperForConditionalGeneration
+        return WhisperForConditionalGeneration.from_pretrained(self.model_name).to(self.device)
+
+    def transcribe(self, audio_np, num_beams):
+        return self.transcribe_batch([audio_np], num_beams)[0]
+
+    def transcribe_batch(self, audios, num_beams):
+        # The processor pads every clip to the same 30 s window, so a batch is one generate call.
+        input_features = self.processor(audios, sampling_rate=16000, return_tensors="pt").input_features.to(self.device)
+        predicted_ids = self.model.generate(
+            input_features,
+            language=PRIMARY_LANGUAGE,
+            task="transcribe",
+            max_length=448,
+            num_beams=num_beams,
+            temperature=0.0,
+            compression_ratio_threshold=1.35,
+            logprob_threshold=-1.0,
+            no_repeat_ngram_size=3,
+        )
+        return self.processor.batch_decode(predicted_ids, skip_special_tokens=True)
+
+
+class Int8Backend(TransformersBackend):
+    """Same model with its Linear layers quantised to int8 at load time (CPU only)."""
+    name = "int8"
+
+    def _load_model(self, torch):
+        from transformers import WhisperForConditionalGeneration
+        self.device = "cpu"
+        model = WhisperForConditionalGeneration.from_pretrained(self.model_name).eval()
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxBackend(TransformersBackend):
+    """ONNX Runtime export through optimum, exported on first load."""
+    name = "onnx"
+
+    def _load_model(self, torch):
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+        self.device = "cpu"
+        return ORTModelForSpeechSeq2Seq.from_pretrained(self.model_name, export=True)
+
+
+class CTranslate2Backend:
+    """CTranslate2 conversion through faster-whisper, int8 on CPU."""
+    name = "ctranslate2"
+
+    def __init__(self, model_size):
+        self.model_size = model_size
+        self.device = None
+
+    def load(self):
+        import ctranslate2
+        from faster_whisper import WhisperModel
+        self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        compute_type = "float16" if self.device == "cuda" else "int8"
+        self.model = WhisperModel(self.model_size, device=self.device, compute_type=compute_type)
+
+    def transcribe(self, audio_np, num_beams):
+        segments, _ = self.model.transcribe(
+            audio_np.astype(np.float32),
+            language=LANGUAGE_CODES.get(PRIMARY_LANGUAGE.lower(), PRIMARY_LANGUAGE),
+            task="transcribe",
+            beam_size=num_beams,
+            temperature=0.0,
+            compression_ratio_threshold=1.35,
+            log_prob_threshold=-1.0,
+            no_repeat_ngram_size=3,
+            condition_on_previous_text=False,
+        )
+        return " ".join(segment.text.strip() for segment in segments)
+
+    def transcribe_batch(self, audios, num_beams):
+        return [self.transcribe(audio_np, num_beams) for audio_np in audios]
+
+
+BACKEND_CLASSES = {
+    backend.name: backend
+    for backend in (TransformersBackend, Int8Backend, OnnxBackend, CTranslate2Backend)
+}
+
+def resolve_backend(name):
+    if name != "auto":
+        return name
+    if _installed("faster_whisper"):
+        return "ctranslate2"
+    import torch
+    return "transformers" if _torch_device(torch) != "cpu" else "int8"
+
+
+class WhisperService:
+    """Owns the Whisper model and loads it on first use.
+
+    ``start_loading`` loads the model in a background thread and returns at
+    once, so callers can warm the model up without blocking startup.
+    ``transcribe`` waits for the load if it is still running. ``state`` is
+    one of ``idle``, ``loading``, ``ready`` or ``error``. Clips up to
+    ``WHISPER_FAST_MODE_SECONDS`` long are decoded greedily.
+    """
+    def __init__(self, model_size=WHISPER_MODEL_SIZE, backend=WHISPER_BACKEND):
+        if model_size not in WHISPER_MODEL_SIZES:
+            raise ValueError(f"Unknown Whisper model size '{model_size}', expected one of {WHISPER_MODEL_SIZES}")
+        if backend not in WHISPER_BACKENDS:
+            raise ValueError(f"Unknown Whisper backend '{backend}', expected one of {WHISPER_BACKENDS}")
+        self.model_size = model_size
+        self.backend_name = backend
+        self.backend = None
+        self.state = "idle"
+        self.error = None
+        self.load_seconds = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._infer_lock = threading.Lock()
+        self._thread = None
+
+    def start_loading(self):
+        with self._lock:
+            if self.state in ("loading", "ready"):
+                return
+            self.state = "loading"
+            self.error = None
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._load, name="whisper-loader", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        started = time.time()
+        try:
+            backend = BACKEND_CLASSES[resolve_backend(self.backend_name)](self.model_size)
+            backend.load()
+            self.backend = backend
+            self.load_seconds = time.time() - started
+            self.state = "ready"
+            print(f"✓ Whisper {self.model_size} initialized with PRIMARY_LANGUAGE: {PRIMARY_LANGUAGE} "
+                  f"({backend.name} on {backend.device}, {self.load_seconds:.1f}s)")
+        except Exception as e:
+            self.error = str(e)
+            self.state = "error"
+            print(f"❌ Whisper failed to load: {e}")
+        finally:
+            self._ready.set()
+
+    def is_ready(self):
+        return self.state == "ready"
+
+    def wait_ready(self, timeout=None):
+        self.start_loading()
+        self._ready.wait(timeout)
+        return self.is_ready()
+
+    def status(self):
+        return {
+            "state": self.state,
+            "model_size": self.model_size,
+            "backend": self.backend.name if self.backend else self.backend_name,
+            "device": self.backend.device if self.backend else None,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+    def beams_for(self, audio_np):
+        if len(audio_np) <= WHISPER_FAST_MODE_SECONDS * 16000:
+            return 1
+        return WHISPER_BEAM_SIZE
+
+    def transcribe(self, audio_np, num_beams=None):
+        if not self.wait_ready():
+            raise RuntimeError(f"Whisper model unavailable: {self.error}")
+        audio_np = _peak_normalize(audio_np)
+        with self._infer_lock:
+            transcription = self.backend.transcribe(audio_np, num_beams or self.beams_for(audio_np))
+        return _filter_transcription(transcription)
+
+    def transcribe_batch(self, audios, num_beams=None):
+        if not self.wait_ready():
+            raise RuntimeError(f"Whisper model unavailable: {self.error}")
+        audios = [_peak_normalize(audio_np) for audio_np in audios]
+        if num_beams is None:
+            num_beams = max(self.beams_for(audio_np) for audio_np in audios)
+        with self._infer_lock:
+            transcriptions = self.backend.transcribe_batch(audios, num_beams)
+        return [_filter_transcription(transcription) for transcription in transcriptions]
+
+
+def _peak_normalize(audio_np):
+    # A silent (all-zero) clip would divide by zero and hand the model NaNs; it is passed through.
+    peak = np.max(np.abs(audio_np)) if len(audio_np) else 0
+    return audio_np / peak if peak > 0 else audio_np
+
+def worker_authkey():
+    # The worker's key: from its launcher, else from config, else random for this launch.
+    key = os.environ.get(WHISPER_AUTHKEY_ENV)
+    if key:
+        return bytes.fromhex(key)
+    return WHISPER_WORKER_AUTHKEY or os.urandom(32)
+
+def save_worker_authkey(key):
+    # Readable by this user only; the key is all that stands between a client and unpickling.
+    # A fresh file, since the mode only applies on creation; a leftover one may be more open.
+    WHISPER_WORKER_KEY_FILE.unlink(missing_ok=True)
+    fd = os.open(WHISPER_WORKER_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(key.hex())
+
+def load_worker_authkey():
+    if WHISPER_WORKER_AUTHKEY:
+        return WHISPER_WORKER_AUTHKEY
+    try:
+        return bytes.fromhex(WHISPER_WORKER_KEY_FILE.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+class RemoteWhisperService:
+    """Client for a model kept warm in ``STT/whisper_worker.py``.
+
+    The worker is a separate process, so the model survives restarts of
+    the API server. Same interface as ``WhisperService``. The connection
+    is authenticated with ``authkey``, by default the configured key or
+    else the one the running worker generated at launch, read again on
+    every reconnect so a restarted worker is picked up.
+    """
+    def __init__(self, address, authkey=None):
+        self.address = tuple(address) if isinstance(address, list) else address
+        self.authkey = authkey
+        self.state = "idle"
+        self.error = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._remote_status = {}
+
+    def _connect(self):
+        from multiprocessing.connection import Client
+        if self._conn is None:
+            authkey = self.authkey or load_worker_authkey()
+            if authkey is None:
+                raise OSError(f"no worker key in {WHISPER_WORKER_KEY_FILE}; is whisper_worker.py running?")
+            self._conn = Client(self.address, authkey=authkey)
+        return self._conn
+
+    def _request(self, *message):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.send(message)
+                kind, payload = conn.recv()
+            except (OSError, EOFError, AuthenticationError) as e:
+                self._close()
+                self.state = "error"
+                self.error = f"worker unreachable at {self.address}: {e}"
+                raise RuntimeError(self.error)
+        if kind == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def _close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def start_loading(self):
+        try:
+            self._remote_status = self._request("load")
+            self.state = self._remote_status.get("state", "loading")
+            self.error = self._remote_status.get("error")
+        except RuntimeError:
+            pass
+
+    def is_ready(self):
+        if self.state != "ready":
+            self.start_loading()
+        return self.state == "ready"
+
+    def wait_ready(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        while not self.is_ready():
+            if self.state == "error" or (deadline is not None and time.time() >= deadline):
+                return False
+            time.sleep(0.5)
+        return True
+
+    def status(self):
+        status = dict(self._remote_status)
+        status.update({"state": self.state, "error": self.error, "worker": str(self.address)})
+        return status
+
+    def transcribe(self, audio_np, num_beams=None):
+        return self._request("transcribe", np.asarray(audio_np, dtype=np.float32), num_beams)
+
+    def transcribe_batch(self, audios, num_beams=None):
+        return self._request("transcribe_batch", [np.asarray(a, dtype=np.float32) for a in audios], num_beams)
+
+
+if WHISPER_WORKER_ADDRESS:
+    whisper_service = RemoteWhisperService(WHISPER_WORKER_ADDRESS)
+else:
+    whisper_service = WhisperService()
+
+def whisper_available():
+    return bool(WHISPER_WORKER_ADDRESS) or whisper_installed()
+
+def stt_whisper(audio_np):
+    return whisper_service.transcribe(audio_np)
+
+def stt_whisper_batch(audios):
+    return whisper_service.transcribe_batch(audios)
@@ -0,0 +1,78 @@
+"""Long-lived Whisper worker.
+
+Keeps the model loaded in its own process so API server restarts do not pay
+the load again. Start it once:
+
+    python STT/whisper_worker.py
+
+and set WHISPER_WORKER_ADDRESS in config.py to the same address. Clients
+must present the worker's key before anything they send is unpickled: a
+random one per launch, written to STT/whisper_worker.key (readable by
+this user only), unless ETHER_WHISPER_AUTHKEY or WHISPER_WORKER_AUTHKEY
+sets it.
+"""
+import sys
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from STT.sttWhisper import (WhisperService, WHISPER_WORKER_ADDRESS, WHISPER_WORKER_KEY_FILE,
+                            worker_authkey, save_worker_authkey)
+
+DEFAULT_ADDRESS = ("127.0.0.1", 6001)
+
+
+def handle_client(conn, service):
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            command = message[0]
+            try:
+                if command == "load":
+                    service.start_loading()
+                    conn.send(("ok", service.status()))
+                elif command == "status":
+                    conn.send(("ok", service.status()))
+                elif command == "transcribe":
+                    conn.send(("ok", service.transcribe(*message[1:])))
+                elif command == "transcribe_batch":
+                    conn.send(("ok", service.transcribe_batch(*message[1:])))
+                else:
+                    conn.send(("error", f"unknown command: {command}"))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+def serve(address=None):
+    address = tuple(address or WHISPER_WORKER_ADDRESS or DEFAULT_ADDRESS)
+    service = WhisperService()
+    service.start_loading()
+    authkey = worker_authkey()
+    save_worker_authkey(authkey)
+    print(f"🎙️  Whisper worker listening on {address[0]}:{address[1]}")
+    try:
+        with Listener(address, authkey=authkey) as listener:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (OSError, AuthenticationError) as e:
+                    print(f"⚠️  Rejected connection: {e}")
+                    continue
+                threading.Thread(target=handle_client, args=(conn, service), daemon=True).start()
+    finally:
+        WHISPER_WORKER_KEY_FILE.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    try:
+        serve()
+    except KeyboardInterrupt:
+        print("\nWhisper worker stopped")
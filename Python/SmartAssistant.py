@@ -2,6 +2,8 @@
 from CommandClassifier import CommandClassifier, CommandType
 from Browser.IntelligentBrowser import EnhancedIntelligentBrowser
 from GeminiAPI import GeminiAssistant
+from IntentRouter import intent_router
+from Jobs import job_step
 from ConfirmationManager import ConfirmationManager
 from Application.ApplicationController import ApplicationController
 from Application.ContextManager import ContextManager
@@ -9,6 +11,14 @@ import platform
 import time
 from pathlib import Path
 
+# Called with each piece of a Gemini answer as it streams in (set by api_server
+# to forward them over /ws). None waits for the whole answer.
+answer_listener = None
+
+def set_answer_listener(listener):
+    global answer_listener
+    answer_listener = listener
+
 class SmartAssistant:
     def __init__(self, driver=None, system_controller=None):
         self.classifier = CommandClassifier()
@@ -27,24 +37,41 @@ class SmartAssistant:
         self.confirmation_manager = ConfirmationManager()
         self.app_controller = ApplicationController()
         self.context_manager = ContextManager()
+        # What the last command was understood as, and which parser said so.
+        self.last_action = None
+        self.last_parser = None
         print("✓ Application Controller initialized for app control")
+    def bind_driver(self, driver):
+        # A recreated (or closed) browser gets a new page-automation layer; everything else is kept.
+        if driver is self.driver:
+            return False
+        if self.confirmation_manager.has_pending():
+            self.confirmation_manager.clear()
+        self.driver = driver
+        self.browser = EnhancedIntelligentBrowser(driver, self.system_controller) if driver else None
+        return True
     def process_command(self, transcription):
         if not transcription or transcription.strip() == "":
             return False, "Empty transcription"
         transcription = transcription.strip().rstrip('.,!?;:')
         print(f"\n🎤 {transcription}")
+        self.last_action = self.last_parser = None
         
         current_context = self.context_manager.get_current_context()
         if current_context:
             print(f"📱 Current context: {current_context}")
         
         if self.confirmation_manager.has_pending():
+            self.last_action = "confirmation"
             return self._handle_confirmation(transcription)
         if self.gemini_available:
             try:
-                command_json = self.gemini.parse_command_to_json(transcription)
-                print(f"🤖 Action: {command_json.get('action', 'unknown')}")
+                installed_apps = self.system_controller.installed_apps if self.system_controller else None
+                command_json, source = intent_router.route(transcription, self.gemini, installed_apps)
+                print(f"{'⚡' if source == 'local' else '🤖'} Action: {command_json.get('action', 'unknown')}")
                 action = command_json.get('action', 'unknown')
+                self.last_action, self.last_parser = action, source
+                job_step(f"Understood as {action}")
                 
                 if action == 'web_search':
                     query = command_json.get('query', '')
@@ -178,6 +205,7 @@ class SmartAssistant:
                     return self._handle_fallback_file_commands(transcription)
                 pass
         cmd_type, confidence, reasoning = self.classifier.classify(transcription)
+        self.last_action, self.last_parser = cmd_type.value, "classifier"
         if cmd_type == CommandType.SYSTEM:
             return self._handle_system_command(transcription)
         elif cmd_type == CommandType.WEB:
@@ -523,10 +551,10 @@ class SmartAssistant:
         else:
             if self.gemini_available:
                 try:
-                    response = self.gemini.search_and_respond(query)
+                    response = self.gemini.search_and_respond(query, answer_listener)
                     print(f"🤖 {response}")
                     return True, response
-                except:
+                except Exception:
                     pass
             return False, "Browser not available"
     def _execute_platform_search(self, platform, query):
@@ -796,7 +824,7 @@ class SmartAssistant:
         if self.gemini_available and not self._is_url(text):
             try:
                 query = self._clean_search_query(text)
-                response = self.gemini.search_and_respond(query)
+                response = self.gemini.search_and_respond(query, answer_listener)
                 print(f"🤖 {response}\n")
                 return True, response
             except Exception as e:
@@ -817,7 +845,7 @@ class SmartAssistant:
     def _handle_conversation(self, text):
         if self.gemini_available:
             try:
-                success, response = self.gemini.query(f"Answer this question concisely and clearly: {text}")
+                success, response = self.gemini.query(f"Answer this question concisely and clearly: {text}", answer_listener)
                 if success:
                     print(f"🤖 {response}")
                     return True, response
@@ -888,15 +916,21 @@ class SmartAssistant:
         return "I understand. Is there anything specific you'd like me to do? I can control your system, search the web, or answer questions."
 
 
-def process_voice_command_smart(driver, system_controller, transcription):
-    assistant = SmartAssistant(driver, system_controller)
-    exit_commands = ["exit", "quit", "close", "stop", "close browser", "band karo", "bund karo"]
-    if any(cmd in transcription.lower() for cmd in exit_commands):
+EXIT_COMMANDS = ["exit", "quit", "close", "stop", "close browser", "band karo", "bund karo"]
+
+def is_exit_command(transcription):
+    return any(cmd in transcription.lower() for cmd in EXIT_COMMANDS)
+
+def process_voice_command_smart(driver, system_controller, transcription, session_id=None):
+    from AssistantSession import assistant_sessions, DEFAULT_SESSION
+    session = assistant_sessions.get(session_id or DEFAULT_SESSION, driver, system_controller)
+    if is_exit_command(transcription):
         if driver:
             try:
                 driver.quit()
             except:
                 pass
+            assistant_sessions.rebind_driver(None)
         return True, "Goodbye!"
-    success, message = assistant.process_command(transcription)
-    return success, message
\ No newline at end of file
+    success, message = session.process(transcription)
+    return success, message
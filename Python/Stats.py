@@ -0,0 +1,6 @@
+def percentile(values, pct):
+    # Nearest-rank on the sorted values; 0.0 when there are none yet.
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))]
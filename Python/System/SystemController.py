@@ -5,6 +5,96 @@ import shutil
 from pathlib import Path
 from difflib import SequenceMatcher
 
+# Spoken app names and aliases -> the executable or app name on each OS.
+APP_MAPPINGS = {
+    'chrome': {'Windows': 'chrome', 'Linux': 'google-chrome', 'Darwin': 'Google Chrome'},
+    'google chrome': {'Windows': 'chrome', 'Linux': 'google-chrome', 'Darwin': 'Google Chrome'},
+    'firefox': {'Windows': 'firefox', 'Linux': 'firefox', 'Darwin': 'Firefox'},
+    'brave': {'Windows': 'brave', 'Linux': 'brave-browser', 'Darwin': 'Brave Browser'},
+    'edge': {'Windows': 'msedge', 'Linux': 'microsoft-edge', 'Darwin': 'Microsoft Edge'},
+    'microsoft edge': {'Windows': 'msedge', 'Linux': 'microsoft-edge', 'Darwin': 'Microsoft Edge'},
+    'safari': {'Windows': 'safari', 'Linux': 'safari', 'Darwin': 'Safari'},
+    'opera': {'Windows': 'opera', 'Linux': 'opera', 'Darwin': 'Opera'},
+    'code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'vscode': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'vs code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'visual studio code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'visual studio': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'vs': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'cs code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'vc code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
+    'pycharm': {'Windows': 'pycharm', 'Linux': 'pycharm', 'Darwin': 'PyCharm'},
+    'intellij': {'Windows': 'idea', 'Linux': 'idea', 'Darwin': 'IntelliJ IDEA'},
+    'android studio': {'Windows': 'studio', 'Linux': 'studio', 'Darwin': 'Android Studio'},
+    'sublime': {'Windows': 'sublime_text', 'Linux': 'subl', 'Darwin': 'Sublime Text'},
+    'sublime text': {'Windows': 'sublime_text', 'Linux': 'subl', 'Darwin': 'Sublime Text'},
+    'atom': {'Windows': 'atom', 'Linux': 'atom', 'Darwin': 'Atom'},
+    'notepad++': {'Windows': 'notepad++', 'Linux': 'notepad++', 'Darwin': 'notepad++'},
+    'vim': {'Windows': 'vim', 'Linux': 'vim', 'Darwin': 'MacVim'},
+    'emacs': {'Windows': 'emacs', 'Linux': 'emacs', 'Darwin': 'Emacs'},
+    'slack': {'Windows': 'slack', 'Linux': 'slack', 'Darwin': 'Slack'},
+    'discord': {'Windows': 'discord', 'Linux': 'discord', 'Darwin': 'Discord'},
+    'zoom': {'Windows': 'zoom', 'Linux': 'zoom', 'Darwin': 'zoom.us'},
+    'teams': {'Windows': 'teams', 'Linux': 'teams', 'Darwin': 'Microsoft Teams'},
+    'microsoft teams': {'Windows': 'teams', 'Linux': 'teams', 'Darwin': 'Microsoft Teams'},
+    'skype': {'Windows': 'skype', 'Linux': 'skype', 'Darwin': 'Skype'},
+    'telegram': {'Windows': 'telegram', 'Linux': 'telegram', 'Darwin': 'Telegram'},
+    'whatsapp': {'Windows': 'whatsapp', 'Linux': 'whatsapp', 'Darwin': 'WhatsApp'},
+    'vlc': {'Windows': 'vlc', 'Linux': 'vlc', 'Darwin': 'VLC'},
+    'spotify': {'Windows': 'spotify', 'Linux': 'spotify', 'Darwin': 'Spotify'},
+    'itunes': {'Windows': 'itunes', 'Linux': 'rhythmbox', 'Darwin': 'Music'},
+    'music': {'Windows': 'wmplayer', 'Linux': 'rhythmbox', 'Darwin': 'Music'},
+    'media player': {'Windows': 'wmplayer', 'Linux': 'vlc', 'Darwin': 'QuickTime Player'},
+    'word': {'Windows': 'winword', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Word'},
+    'microsoft word': {'Windows': 'winword', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Word'},
+    'excel': {'Windows': 'excel', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Excel'},
+    'microsoft excel': {'Windows': 'excel', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Excel'},
+    'powerpoint': {'Windows': 'powerpnt', 'Linux': 'libreoffice', 'Darwin': 'Microsoft PowerPoint'},
+    'microsoft powerpoint': {'Windows': 'powerpnt', 'Linux': 'libreoffice', 'Darwin': 'Microsoft PowerPoint'},
+    'outlook': {'Windows': 'outlook', 'Linux': 'thunderbird', 'Darwin': 'Microsoft Outlook'},
+    'microsoft outlook': {'Windows': 'outlook', 'Linux': 'thunderbird', 'Darwin': 'Microsoft Outlook'},
+    'onenote': {'Windows': 'onenote', 'Linux': 'xournalpp', 'Darwin': 'Microsoft OneNote'},
+    'libreoffice': {'Windows': 'libreoffice', 'Linux': 'libreoffice', 'Darwin': 'LibreOffice'},
+    'libreoffice writer': {'Windows': 'libreoffice --writer', 'Linux': 'libreoffice --writer', 'Darwin': 'LibreOffice'},
+    'libreoffice calc': {'Windows': 'libreoffice --calc', 'Linux': 'libreoffice --calc', 'Darwin': 'LibreOffice'},
+    'libreoffice impress': {'Windows': 'libreoffice --impress', 'Linux': 'libreoffice --impress', 'Darwin': 'LibreOffice'},
+    'libreoffice math': {'Windows': 'libreoffice --math', 'Linux': 'libreoffice --math', 'Darwin': 'LibreOffice'},
+    'libreoffice draw': {'Windows': 'libreoffice --draw', 'Linux': 'libreoffice --draw', 'Darwin': 'LibreOffice'},
+    'writer': {'Windows': 'libreoffice --writer', 'Linux': 'libreoffice --writer', 'Darwin': 'LibreOffice'},
+    'impress': {'Windows': 'libreoffice --impress', 'Linux': 'libreoffice --impress', 'Darwin': 'LibreOffice'},
+    'draw': {'Windows': 'libreoffice --draw', 'Linux': 'libreoffice --draw', 'Darwin': 'LibreOffice'},
+    'calculator': {'Windows': 'calc', 'Linux': 'gnome-calculator', 'Darwin': 'Calculator'},
+    'notepad': {'Windows': 'notepad', 'Linux': 'gedit', 'Darwin': 'TextEdit'},
+    'paint': {'Windows': 'mspaint', 'Linux': 'gimp', 'Darwin': 'Preview'},
+    'gimp': {'Windows': 'gimp', 'Linux': 'gimp', 'Darwin': 'GIMP'},
+    'photoshop': {'Windows': 'photoshop', 'Linux': 'gimp', 'Darwin': 'Adobe Photoshop'},
+    'terminal': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
+    'command prompt': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
+    'cmd': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
+    'powershell': {'Windows': 'powershell', 'Linux': 'pwsh', 'Darwin': 'Terminal'},
+    'task manager': {'Windows': 'taskmgr', 'Linux': 'gnome-system-monitor', 'Darwin': 'Activity Monitor'},
+    'activity monitor': {'Windows': 'taskmgr', 'Linux': 'gnome-system-monitor', 'Darwin': 'Activity Monitor'},
+    'file explorer': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
+    'explorer': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
+    'files': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
+    'finder': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
+    'git': {'Windows': 'git', 'Linux': 'git-gui', 'Darwin': 'Git'},
+    'github desktop': {'Windows': 'githubdesktop', 'Linux': 'github-desktop', 'Darwin': 'GitHub Desktop'},
+    'docker': {'Windows': 'docker', 'Linux': 'docker', 'Darwin': 'Docker'},
+    'postman': {'Windows': 'postman', 'Linux': 'postman', 'Darwin': 'Postman'},
+    'steam': {'Windows': 'steam', 'Linux': 'steam', 'Darwin': 'Steam'},
+    'obs': {'Windows': 'obs', 'Linux': 'obs', 'Darwin': 'OBS'},
+    'obs studio': {'Windows': 'obs', 'Linux': 'obs', 'Darwin': 'OBS'},
+    'blender': {'Windows': 'blender', 'Linux': 'blender', 'Darwin': 'Blender'},
+    'audacity': {'Windows': 'audacity', 'Linux': 'audacity', 'Darwin': 'Audacity'},
+    'handbrake': {'Windows': 'handbrake', 'Linux': 'handbrake', 'Darwin': 'HandBrake'},
+    'virtualbox': {'Windows': 'virtualbox', 'Linux': 'virtualbox', 'Darwin': 'VirtualBox'},
+    'vmware': {'Windows': 'vmware', 'Linux': 'vmware', 'Darwin': 'VMware Fusion'},
+    'pulseaudio': {'Windows': '', 'Linux': 'pavucontrol', 'Darwin': ''},
+    'pulse audio': {'Windows': '', 'Linux': 'pavucontrol', 'Darwin': ''},
+    'volume control': {'Windows': 'sndvol', 'Linux': 'pavucontrol', 'Darwin': 'open /System/Library/PreferencePanes/Sound.prefPane'},
+}
+
 class SystemController:
     def __init__(self):
         self.system = platform.system()
@@ -314,96 +404,8 @@ class SystemController:
         app_name = app_name.strip().rstrip('.,!?;:')
         app_lower = app_name.lower()
         print(f"🔍 Looking for: {app_name}")
-        app_mappings = {
-            'chrome': {'Windows': 'chrome', 'Linux': 'google-chrome', 'Darwin': 'Google Chrome'},
-            'google chrome': {'Windows': 'chrome', 'Linux': 'google-chrome', 'Darwin': 'Google Chrome'},
-            'firefox': {'Windows': 'firefox', 'Linux': 'firefox', 'Darwin': 'Firefox'},
-            'brave': {'Windows': 'brave', 'Linux': 'brave-browser', 'Darwin': 'Brave Browser'},
-            'edge': {'Windows': 'msedge', 'Linux': 'microsoft-edge', 'Darwin': 'Microsoft Edge'},
-            'microsoft edge': {'Windows': 'msedge', 'Linux': 'microsoft-edge', 'Darwin': 'Microsoft Edge'},
-            'safari': {'Windows': 'safari', 'Linux': 'safari', 'Darwin': 'Safari'},
-            'opera': {'Windows': 'opera', 'Linux': 'opera', 'Darwin': 'Opera'},
-            'code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vscode': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vs code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'visual studio code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'visual studio': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vs': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'cs code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vc code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'pycharm': {'Windows': 'pycharm', 'Linux': 'pycharm', 'Darwin': 'PyCharm'},
-            'intellij': {'Windows': 'idea', 'Linux': 'idea', 'Darwin': 'IntelliJ IDEA'},
-            'android studio': {'Windows': 'studio', 'Linux': 'studio', 'Darwin': 'Android Studio'},
-            'sublime': {'Windows': 'sublime_text', 'Linux': 'subl', 'Darwin': 'Sublime Text'},
-            'sublime text': {'Windows': 'sublime_text', 'Linux': 'subl', 'Darwin': 'Sublime Text'},
-            'atom': {'Windows': 'atom', 'Linux': 'atom', 'Darwin': 'Atom'},
-            'notepad++': {'Windows': 'notepad++', 'Linux': 'notepad++', 'Darwin': 'notepad++'},
-            'vim': {'Windows': 'vim', 'Linux': 'vim', 'Darwin': 'MacVim'},
-            'emacs': {'Windows': 'emacs', 'Linux': 'emacs', 'Darwin': 'Emacs'},
-            'slack': {'Windows': 'slack', 'Linux': 'slack', 'Darwin': 'Slack'},
-            'discord': {'Windows': 'discord', 'Linux': 'discord', 'Darwin': 'Discord'},
-            'zoom': {'Windows': 'zoom', 'Linux': 'zoom', 'Darwin': 'zoom.us'},
-            'teams': {'Windows': 'teams', 'Linux': 'teams', 'Darwin': 'Microsoft Teams'},
-            'microsoft teams': {'Windows': 'teams', 'Linux': 'teams', 'Darwin': 'Microsoft Teams'},
-            'skype': {'Windows': 'skype', 'Linux': 'skype', 'Darwin': 'Skype'},
-            'telegram': {'Windows': 'telegram', 'Linux': 'telegram', 'Darwin': 'Telegram'},
-            'whatsapp': {'Windows': 'whatsapp', 'Linux': 'whatsapp', 'Darwin': 'WhatsApp'},
-            'vlc': {'Windows': 'vlc', 'Linux': 'vlc', 'Darwin': 'VLC'},
-            'spotify': {'Windows': 'spotify', 'Linux': 'spotify', 'Darwin': 'Spotify'},
-            'itunes': {'Windows': 'itunes', 'Linux': 'rhythmbox', 'Darwin': 'Music'},
-            'music': {'Windows': 'wmplayer', 'Linux': 'rhythmbox', 'Darwin': 'Music'},
-            'media player': {'Windows': 'wmplayer', 'Linux': 'vlc', 'Darwin': 'QuickTime Player'},
-            'word': {'Windows': 'winword', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Word'},
-            'microsoft word': {'Windows': 'winword', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Word'},
-            'excel': {'Windows': 'excel', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Excel'},
-            'microsoft excel': {'Windows': 'excel', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Excel'},
-            'powerpoint': {'Windows': 'powerpnt', 'Linux': 'libreoffice', 'Darwin': 'Microsoft PowerPoint'},
-            'microsoft powerpoint': {'Windows': 'powerpnt', 'Linux': 'libreoffice', 'Darwin': 'Microsoft PowerPoint'},
-            'outlook': {'Windows': 'outlook', 'Linux': 'thunderbird', 'Darwin': 'Microsoft Outlook'},
-            'microsoft outlook': {'Windows': 'outlook', 'Linux': 'thunderbird', 'Darwin': 'Microsoft Outlook'},
-            'onenote': {'Windows': 'onenote', 'Linux': 'xournalpp', 'Darwin': 'Microsoft OneNote'},
-            'libreoffice': {'Windows': 'libreoffice', 'Linux': 'libreoffice', 'Darwin': 'LibreOffice'},
-            'libreoffice writer': {'Windows': 'libreoffice --writer', 'Linux': 'libreoffice --writer', 'Darwin': 'LibreOffice'},
-            'libreoffice calc': {'Windows': 'libreoffice --calc', 'Linux': 'libreoffice --calc', 'Darwin': 'LibreOffice'},
-            'libreoffice impress': {'Windows': 'libreoffice --impress', 'Linux': 'libreoffice --impress', 'Darwin': 'LibreOffice'},
-            'libreoffice math': {'Windows': 'libreoffice --math', 'Linux': 'libreoffice --math', 'Darwin': 'LibreOffice'},
-            'libreoffice draw': {'Windows': 'libreoffice --draw', 'Linux': 'libreoffice --draw', 'Darwin': 'LibreOffice'},
-            'writer': {'Windows': 'libreoffice --writer', 'Linux': 'libreoffice --writer', 'Darwin': 'LibreOffice'},
-            'impress': {'Windows': 'libreoffice --impress', 'Linux': 'libreoffice --impress', 'Darwin': 'LibreOffice'},
-            'draw': {'Windows': 'libreoffice --draw', 'Linux': 'libreoffice --draw', 'Darwin': 'LibreOffice'},
-            'calculator': {'Windows': 'calc', 'Linux': 'gnome-calculator', 'Darwin': 'Calculator'},
-            'notepad': {'Windows': 'notepad', 'Linux': 'gedit', 'Darwin': 'TextEdit'},
-            'paint': {'Windows': 'mspaint', 'Linux': 'gimp', 'Darwin': 'Preview'},
-            'gimp': {'Windows': 'gimp', 'Linux': 'gimp', 'Darwin': 'GIMP'},
-            'photoshop': {'Windows': 'photoshop', 'Linux': 'gimp', 'Darwin': 'Adobe Photoshop'},
-            'terminal': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
-            'command prompt': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
-            'cmd': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
-            'powershell': {'Windows': 'powershell', 'Linux': 'pwsh', 'Darwin': 'Terminal'},
-            'task manager': {'Windows': 'taskmgr', 'Linux': 'gnome-system-monitor', 'Darwin': 'Activity Monitor'},
-            'activity monitor': {'Windows': 'taskmgr', 'Linux': 'gnome-system-monitor', 'Darwin': 'Activity Monitor'},
-            'file explorer': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'explorer': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'files': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'finder': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'git': {'Windows': 'git', 'Linux': 'git-gui', 'Darwin': 'Git'},
-            'github desktop': {'Windows': 'githubdesktop', 'Linux': 'github-desktop', 'Darwin': 'GitHub Desktop'},
-            'docker': {'Windows': 'docker', 'Linux': 'docker', 'Darwin': 'Docker'},
-            'postman': {'Windows': 'postman', 'Linux': 'postman', 'Darwin': 'Postman'},
-            'steam': {'Windows': 'steam', 'Linux': 'steam', 'Darwin': 'Steam'},
-            'obs': {'Windows': 'obs', 'Linux': 'obs', 'Darwin': 'OBS'},
-            'obs studio': {'Windows': 'obs', 'Linux': 'obs', 'Darwin': 'OBS'},
-            'blender': {'Windows': 'blender', 'Linux': 'blender', 'Darwin': 'Blender'},
-            'audacity': {'Windows': 'audacity', 'Linux': 'audacity', 'Darwin': 'Audacity'},
-            'handbrake': {'Windows': 'handbrake', 'Linux': 'handbrake', 'Darwin': 'HandBrake'},
-            'virtualbox': {'Windows': 'virtualbox', 'Linux': 'virtualbox', 'Darwin': 'VirtualBox'},
-            'vmware': {'Windows': 'vmware', 'Linux': 'vmware', 'Darwin': 'VMware Fusion'},
-            'pulseaudio': {'Windows': '', 'Linux': 'pavucontrol', 'Darwin': ''},
-            'pulse audio': {'Windows': '', 'Linux': 'pavucontrol', 'Darwin': ''},
-            'volume control': {'Windows': 'sndvol', 'Linux': 'pavucontrol', 'Darwin': 'open /System/Library/PreferencePanes/Sound.prefPane'},
-        }
-        if app_lower in app_mappings:
-            app_name = app_mappings[app_lower].get(self.system, app_name)
+        if app_lower in APP_MAPPINGS:
+            app_name = APP_MAPPINGS[app_lower].get(self.system, app_name)
             print(f"✓ Mapped to: {app_name}")
         elif app_lower in self.installed_apps:
             app_name = self.installed_apps[app_lower]
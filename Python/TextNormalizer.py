@@ -0,0 +1,92 @@
+import re
+
+# Multi-word fillers, in the priority the old removal loop applied them: greetings, bot
+# names, small talk, "i want you to" preambles, "go to the web and", politeness.
+FILLER_PHRASES_RE = re.compile(
+    r"\b(?:good morning|good afternoon|good evening)\b"
+    r"|\b(?:how are you|what's up|kaise ho|kya hal hai)\??"
+    r"|\b(?:what i want you to do is|i want you to do is|i want you to|i need you to|i would like you to"
+    r"|what i want is|i want to|i need to|i would like to"
+    r"|go to a web and|go to the web and|go to web and|on the web|on web"
+    r"|go to a|go to the|go to"
+    r"|can you|could you|would you|will you|would you please|for me|thank you)\b",
+    re.IGNORECASE)
+# Single-word fillers, dropped token by token.
+FILLER_WORDS = frozenset((
+    'hello', 'hi', 'hey', 'namaste', 'namaskar',
+    'bot', 'assistant', 'either', 'alexa', 'siri',
+    'please', 'kindly', 'thanks', 'dhanyavaad', 'shukriya', 'karo', 'kijiye',
+    'just', 'really', 'actually', 'basically', 'literally', 'so', 'what',
+))
+ARTICLES = frozenset(('the', 'a', 'an'))
+LEADING_AUXILIARY_RE = re.compile(r'^\s*(can|could|would|will|do|does|what|so)\s+', re.IGNORECASE)
+LEADING_JOINER_RE = re.compile(r'^(to|and)\s+')
+LEADING_PREPOSITION_RE = re.compile(r'^(to|for|at|in|on)\s+')
+ACTION_LEAD_RE = re.compile(r'^(open|close|start|launch)')
+FOR_BEFORE_LAST_WORD_RE = re.compile(r'\sfor\s+(?=\w+\s*$)')
+PUNCTUATION_RE = re.compile(r'[,?!]+')
+WORD_RE = re.compile(r'\w+')
+
+BROWSER_PREFIX_RE = re.compile(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', re.IGNORECASE)
+BROWSER_SEARCH_RE = re.compile(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+(go to|search|find|lookup)?\s*(.+)',
+                               re.IGNORECASE)
+COMMA_RE = re.compile(r',\s+')
+FILE_REQUEST_LEAD_RE = re.compile(r'^(i\s+want\s+you\s+to|i\s+want|please|can\s+you|could\s+you|would\s+you)\s+', re.IGNORECASE)
+GREETING_LEAD_RE = re.compile(r'^(hello|hi|hey|good morning|good afternoon|good evening|namaste)\s+', re.IGNORECASE)
+ADDRESS_RE = re.compile(r'\b(bot|chatbot|assistant|either|what i want you to do is|i want you to|i need you to|i would say)\b',
+                        re.IGNORECASE)
+LEADING_COMMAS_RE = re.compile(r'^[,\s]+')
+
+
+def drop_words(text, words):
+    """``text`` without the whole words in ``words``, as ``\\b(w1|w2|...)\\b`` removal would leave it."""
+    if words.isdisjoint(WORD_RE.findall(text)):
+        return text
+    return WORD_RE.sub(lambda match: '' if match.group() in words else match.group(), text)
+
+
+def preprocess_command(text):
+    """Strip greetings, the assistant's name and request preambles before parsing.
+
+    "open my browser and search X" becomes "search X"; anything that would
+    leave fewer than three characters returns ``text`` unchanged.
+    """
+    lowered = text.lower()
+    if 'research' in lowered and ('download' in lowered or 'fetch' in lowered):
+        if BROWSER_PREFIX_RE.search(text):
+            return BROWSER_PREFIX_RE.sub('', text).strip()
+    browser_search = BROWSER_SEARCH_RE.search(text)
+    if browser_search:
+        return f"search {browser_search.group(6).strip()}"
+    cleaned = COMMA_RE.sub(' and ', text)
+    if ('create' in lowered or 'make' in lowered) and 'file' in lowered:
+        cleaned = FILE_REQUEST_LEAD_RE.sub('', cleaned)
+    cleaned = GREETING_LEAD_RE.sub('', cleaned)
+    cleaned = ADDRESS_RE.sub('', cleaned)
+    cleaned = ' '.join(cleaned.split())
+    cleaned = LEADING_COMMAS_RE.sub('', cleaned).strip()
+    return cleaned if len(cleaned) > 2 else text
+
+
+def strip_fillers(text):
+    """Reduce conversational speech to the bare command ("hey bot, can you open chrome" -> "open chrome").
+
+    Used when Gemini cannot extract the command. Returns ``text`` unchanged
+    when less than three characters would be left or nothing was removed.
+    """
+    lowered = text.lower()
+    cleaned = lowered
+    # Removing one filler can expose another at the start ("hello can you ..."), hence two passes.
+    for _ in range(2):
+        cleaned = FILLER_PHRASES_RE.sub('', cleaned)
+        cleaned = drop_words(cleaned, FILLER_WORDS)
+        cleaned = LEADING_AUXILIARY_RE.sub('', cleaned)
+    cleaned = ' '.join(PUNCTUATION_RE.sub(' ', cleaned).split())
+    cleaned = LEADING_JOINER_RE.sub('', cleaned)
+    if not ACTION_LEAD_RE.match(cleaned):
+        cleaned = drop_words(cleaned, ARTICLES)
+    cleaned = ' '.join(FOR_BEFORE_LAST_WORD_RE.sub(' ', cleaned).split())
+    cleaned = LEADING_PREPOSITION_RE.sub('', cleaned)
+    if len(cleaned) >= 3 and cleaned != lowered:
+        return cleaned
+    return text
@@ -3,9 +3,12 @@ import sys
 import os
 import json
 import asyncio
+import itertools
 import threading
 import queue
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
@@ -15,21 +18,46 @@ logger = logging.getLogger(__name__)
 
 sys.path.append(str(Path(__file__).parent))
 
-from STT.RTMicroPhone import stream_microPhone, SpeechDetector
-from STT.sttOffline import stt_vosk
-from STT.NetworkStatus import check_server_connectivity
+from STT.RTMicroPhone import stream_microPhone, SpeechDetector, q as audio_queue, audio_queue_stats
+from STT.InferenceQueue import InferenceWorker, DroppedJob
+from STT.AudioPreprocessor import AudioPreprocessor
+from STT.sttOffline import stt_vosk_batch, VoskStream
+from STT.NetworkStatus import connectivity_monitor
 from Browser.DriverManager import setup_driver
 from Browser.IntelligentBrowser import process_voice_command, EnhancedIntelligentBrowser
 from System.SystemController import SystemController
-from SmartAssistant import SmartAssistant, process_voice_command_smart
+from SmartAssistant import process_voice_command_smart, is_exit_command, set_answer_listener
+from AssistantSession import assistant_sessions, DEFAULT_SESSION, share_driver, driver_scope
+from CommandExecutor import CommandExecutor, LaneFull, BROWSER, COMMANDS
+from Jobs import JobManager, current_job
+from ConnectionManager import ConnectionManager
+from IntentRouter import intent_router
+from GeminiAPI import AsyncGeminiAssistant, HTTPX_AVAILABLE, get_parse_cache, get_speculation_log, stream_stats, gemini_breaker
 
 try:
-    from STT.sttWhisper import stt_whisper
-    WHISPER_AVAILABLE = True
+    from config import ENABLE_STREAMING_STT
 except ImportError:
+    ENABLE_STREAMING_STT = True
+
+try:
+    from config import ENABLE_ANSWER_STREAMING
+except ImportError:
+    ENABLE_ANSWER_STREAMING = True
+
+try:
+    from config import STT_QUEUE_SIZE, STT_MAX_BATCH, STT_BATCH_WAIT, STT_DROP_POLICY
+except ImportError:
+    STT_QUEUE_SIZE, STT_MAX_BATCH, STT_BATCH_WAIT, STT_DROP_POLICY = 8, 4, 0.05, "drop_oldest"
+
+try:
+    from config import WHISPER_WARM_START
+except ImportError:
+    WHISPER_WARM_START = True
+
+from STT.sttWhisper import stt_whisper_batch, whisper_service, whisper_available
+WHISPER_AVAILABLE = whisper_available()
+if not WHISPER_AVAILABLE:
     logger.warning("Whisper STT not available - using Vosk only")
-    WHISPER_AVAILABLE = False
-    stt_whisper = None
 
 try:
     from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
@@ -51,9 +79,26 @@ voice_queue = queue.Queue()
 websocket_connections = set()
 is_listening = False
 speech_detector = None
+event_loop = None
+vosk_stream = None
+stt_worker = None
+audio_preprocessor = AudioPreprocessor(max_seconds=40)
+async_gemini = None
+# One thread so voice commands run in the order they were spoken.
+command_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice-command")
+# Where commands actually run: a pool for the rest, one thread for anything driving the browser.
+lane_executor = CommandExecutor()
+
+class DummyDriver:
+    # Stands in for the browser so system commands still run without one.
+    def get(self, url): pass
+    def quit(self): pass
+
+dummy_driver = DummyDriver()
 
 class VoiceCommand(BaseModel):
     command: str
+    session_id: str = DEFAULT_SESSION
 
 class SystemStatus(BaseModel):
     status: str
@@ -65,28 +110,78 @@ class CommandResponse(BaseModel):
     message: str
     result: Optional[Dict[str, Any]] = None
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+_request_ids = itertools.count(1)
+
+def next_request_id():
+    return f"req-{next(_request_ids)}"
+
+@dataclass
+class CommandResult:
+    # One run of a command: what it was understood as, how it went and where the time went.
+    text: str
+    session_id: str = DEFAULT_SESSION
+    request_id: str = field(default_factory=next_request_id)
+    action: Optional[str] = None
+    parser: Optional[str] = None
+    success: bool = False
+    message: str = ""
+    display: str = ""
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def finish(self, started):
+        self.timings["total_ms"] = (time.perf_counter() - started) * 1000
+        return self
+
+    def to_dict(self):
+        return dict(asdict(self), output=self.display if self.success else f"Error: {self.message}")
+
+    def event(self):
+        return {
+            "type": "command_result",
+            "request_id": self.request_id,
+            "session_id": self.session_id,
+            "text": self.text,
+            "result": self.display,
+            "action": self.action,
+            "success": self.success,
+            "timings": self.timings,
+            "timestamp": time.time()
+        }
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+manager = ConnectionManager()
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+def broadcast_from_thread(payload):
+    # The microphone loop runs in its own thread; hand the send to the server loop.
+    if event_loop is None or event_loop.is_closed():
+        return
+    manager.publish_threadsafe(event_loop, payload)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                self.active_connections.remove(connection)
+# Long commands run as jobs; their state changes and steps go out over /ws.
+job_manager = JobManager(listener=broadcast_from_thread)
 
-manager = ConnectionManager()
+def _broadcast_partial_transcription(text):
+    broadcast_from_thread({
+        "type": "voice_partial",
+        "text": text,
+        "timestamp": time.time()
+    })
+
+# The command running on this thread, so answer chunks can say which request they belong to.
+_running = threading.local()
+
+def _broadcast_answer_chunk(chunk):
+    # Pieces of a Gemini answer as they are generated; command_result still follows with the whole text.
+    result = getattr(_running, "result", None)
+    job = current_job()
+    broadcast_from_thread({
+        "type": "answer_chunk",
+        "request_id": result.request_id if result else None,
+        "session_id": result.session_id if result else None,
+        "job_id": job.id if job else None,
+        "text": chunk,
+        "timestamp": time.time()
+    })
 
 def _clean_response_message(message):
     if not message:
@@ -140,7 +235,7 @@ def ensure_browser_driver():
     global browser_driver
     try:
         if browser_driver is None:
-            browser_driver = setup_driver()
+            browser_driver = share_driver(setup_driver())
             if browser_driver:
                 logger.info("Browser driver initialized on demand")
                 return True
@@ -156,7 +251,7 @@ def ensure_browser_driver():
             except:
                 pass
             browser_driver = None
-            browser_driver = setup_driver()
+            browser_driver = share_driver(setup_driver())
             if browser_driver:
                 logger.info("Browser driver reopened successfully")
                 return True
@@ -167,133 +262,207 @@ def ensure_browser_driver():
         return False
 
 def initialize_system():
-    global system_controller, browser_driver, speech_detector
+    global system_controller, browser_driver, speech_detector, stt_worker
     logger.info("Initializing system components...")
     system_controller = SystemController()
     logger.info("System controller initialized")
+    stt_worker = InferenceWorker(transcribe_voice_batch, max_queue=STT_QUEUE_SIZE, max_batch=STT_MAX_BATCH,
+                                 batch_wait=STT_BATCH_WAIT, drop_policy=STT_DROP_POLICY, name="stt-worker")
+    logger.info("STT worker started")
     speech_detector = SpeechDetector()
     logger.info("Speech detector initialized")
     browser_driver = None
     logger.info("Browser driver: Lazy loading enabled (will open on demand)")
-    if WHISPER_AVAILABLE:
-        network_available = check_server_connectivity("8.8.8.8", 53, 3)
-        if network_available:
-            logger.info("Network available - Whisper STT enabled")
-        else:
-            logger.info("Network unavailable - Vosk STT enabled")
-    else:
+    assistant_sessions.get(DEFAULT_SESSION, dummy_driver, system_controller)
+    logger.info("Assistant session warmed up")
+    if not WHISPER_AVAILABLE:
         logger.info("Whisper not available - Using Vosk STT only")
+    connectivity_monitor.add_listener(_on_connectivity_change)
+    connectivity_monitor.start()
+    logger.info("Connectivity monitor started")
     system_controller.get_system_info()
     logger.info("System initialization complete")
 
+def _on_connectivity_change(online):
+    if online and WHISPER_AVAILABLE:
+        logger.info("Network available - Whisper STT enabled")
+        if WHISPER_WARM_START:
+            whisper_service.start_loading()
+            logger.info("Whisper model loading in background")
+    elif WHISPER_AVAILABLE:
+        logger.info("Network unavailable - Vosk STT enabled")
+    broadcast_from_thread({
+        "type": "network_status",
+        "online": online,
+        "timestamp": time.time()
+    })
+
+def transcribe_voice_batch(audios):
+    # Runs on the STT worker thread, one call per batch of queued utterances.
+    network_available = WHISPER_AVAILABLE and connectivity_monitor.is_online()
+    if network_available and whisper_service.is_ready():
+        return stt_whisper_batch(audios)
+    if network_available:
+        # Vosk covers the utterances that arrive while Whisper warms up.
+        whisper_service.start_loading()
+    return stt_vosk_batch(audios)
+
 def process_voice_input(audio_np):
-    global browser_driver, system_controller, speech_detector
+    # Called from the microphone thread: hand the utterance off and return at once.
+    if vosk_stream is not None:
+        transcription = vosk_stream.finalize()
+        command_executor.submit(handle_transcription, transcription)
+        return transcription
+    future = stt_worker.submit(audio_np)
+    future.add_done_callback(_on_transcribed)
+    return future
+
+def _on_transcribed(future):
     try:
-        network_available = check_server_connectivity("8.8.8.8", 53, 3) if WHISPER_AVAILABLE else False
-        if network_available and WHISPER_AVAILABLE:
-            transcription = stt_whisper(audio_np)
-        else:
-            transcription = stt_vosk(audio_np)
-        if transcription and transcription.strip():
-            logger.info(f"Voice input: {transcription}")
-            asyncio.create_task(manager.broadcast(json.dumps({
-                "type": "voice_transcription",
-                "text": transcription,
+        transcription = future.result()
+    except DroppedJob as e:
+        logger.warning(f"Voice input dropped: {e}")
+        return
+    except Exception as e:
+        logger.error(f"Error transcribing voice input: {e}")
+        broadcast_from_thread({
+            "type": "error",
+            "message": str(e),
+            "timestamp": time.time()
+        })
+        return
+    command_executor.submit(handle_transcription, transcription)
+
+def handle_transcription(transcription):
+    try:
+        if not transcription or not transcription.strip():
+            return transcription
+        logger.info(f"Voice input: {transcription}")
+        broadcast_from_thread({
+            "type": "voice_transcription",
+            "text": transcription,
+            "timestamp": time.time()
+        })
+        result = dispatch_command(transcription).result()
+        if result.error:
+            logger.error(f"Error processing voice input: {result.error}")
+            broadcast_from_thread({
+                "type": "error",
+                "message": result.error,
                 "timestamp": time.time()
-            })))
-            needs_browser = any(keyword in transcription.lower() for keyword in 
-                              ['search', 'browser', 'web', 'google', 'youtube', 'website', 'download', 'open website'])
-            
-            if needs_browser:
-                if not ensure_browser_driver():
-                    logger.warning("Browser not available for web command")
-            
-            if browser_driver and system_controller:
-                try:
-                    result = process_voice_command_smart(browser_driver, system_controller, transcription)
-                    if result == "EXIT":
-                        browser_driver = None
-                except Exception as e:
-                    if "closed window" in str(e).lower() or "window_handles" in str(e).lower():
-                        logger.info("Browser closed, attempting to reopen...")
-                        if ensure_browser_driver():
-                            result = process_voice_command_smart(browser_driver, system_controller, transcription)
-                        else:
-                            class DummyDriver:
-                                def get(self, url): pass
-                                def quit(self): pass
-                            dummy = DummyDriver()
-                            assistant = SmartAssistant(dummy, system_controller)
-                            assistant.process_command(transcription)
-                    else:
-                        raise
-            elif system_controller:
-                class DummyDriver:
-                    def get(self, url): pass
-                    def quit(self): pass
-                dummy = DummyDriver()
-                assistant = SmartAssistant(dummy, system_controller)
-                assistant.process_command(transcription)
-            if browser_driver and system_controller:
-                try:
-                    success, message = process_voice_command_smart(browser_driver, system_controller, transcription)
-                    if success and message and message not in ["Command processed", "CONTINUE", "EXIT"]:
-                        clean_message = _clean_response_message(message)
-                        if clean_message:
-                            asyncio.create_task(manager.broadcast(json.dumps({
-                                "type": "command_result",
-                                "text": transcription,
-                                "result": clean_message,
-                                "timestamp": time.time()
-                            })))
-                except Exception as e:
-                    if "closed window" in str(e).lower() or "window_handles" in str(e).lower():
-                        try:
-                            if ensure_browser_driver():
-                                success, message = process_voice_command_smart(browser_driver, system_controller, transcription)
-                                if success and message and message not in ["Command processed", "CONTINUE", "EXIT"]:
-                                    clean_message = _clean_response_message(message)
-                                    if clean_message:
-                                        asyncio.create_task(manager.broadcast(json.dumps({
-                                            "type": "command_result",
-                                            "text": transcription,
-                                            "result": clean_message,
-                                            "timestamp": time.time()
-                                        })))
-                        except:
-                            pass
-            elif system_controller:
-                dummy = type('DummyDriver', (), {'get': lambda self, url: None, 'quit': lambda self: None})()
-                assistant = SmartAssistant(dummy, system_controller)
-                success, message = assistant.process_command(transcription)
-                if success and message and message not in ["Command processed", "CONTINUE", "EXIT"]:
-                    clean_message = _clean_response_message(message)
-                    if clean_message:
-                        asyncio.create_task(manager.broadcast(json.dumps({
-                            "type": "command_result",
-                            "text": transcription,
-                            "result": clean_message,
-                            "timestamp": time.time()
-                        })))
+            })
+        elif result.success and result.display:
+            broadcast_from_thread(result.event())
         return transcription
     except Exception as e:
         logger.error(f"Error processing voice input: {e}")
-        asyncio.create_task(manager.broadcast(json.dumps({
+        broadcast_from_thread({
             "type": "error",
             "message": str(e),
             "timestamp": time.time()
-        })))
+        })
         return None
 
+BROWSER_KEYWORDS = ['search', 'browser', 'web', 'google', 'youtube', 'website', 'download', 'open website']
+
+def _is_closed_window_error(error):
+    return "closed window" in str(error).lower() or "window_handles" in str(error).lower()
+
+def _run_in_session(transcription, session_id):
+    global browser_driver
+    driver = browser_driver
+    if driver and is_exit_command(transcription):
+        # process_voice_command_smart's exit handling: the browser goes, the session stays.
+        with driver_scope():
+            process_voice_command_smart(driver, system_controller, transcription, session_id=session_id)
+        browser_driver = None
+        return True, "Goodbye!", "exit", None
+    session = assistant_sessions.get(session_id, driver or dummy_driver, system_controller)
+    return session.execute(transcription)
+
+def execute_command(transcription, session_id=DEFAULT_SESSION, require_browser=False):
+    """Runs one command, once, and reports what happened.
+
+    Voice input and /command both come through here. A browser is opened
+    for commands that look like they need one; with ``require_browser``
+    the command fails if it cannot be. A browser closed under the command
+    is reopened and the command retried once.
+    """
+    result = CommandResult(text=transcription, session_id=session_id)
+    started = time.perf_counter()
+    if not system_controller:
+        result.message = "System controller not initialized"
+        return result.finish(started)
+    if any(keyword in transcription.lower() for keyword in BROWSER_KEYWORDS):
+        browser_started = time.perf_counter()
+        browser_ready = ensure_browser_driver()
+        result.timings["browser_ms"] = (time.perf_counter() - browser_started) * 1000
+        if not browser_ready:
+            if require_browser:
+                result.message = "Failed to initialize browser. Please check browser installation."
+                return result.finish(started)
+            logger.warning("Browser not available for web command")
+    execute_started = time.perf_counter()
+    _running.result = result
+    try:
+        try:
+            outcome = _run_in_session(transcription, session_id)
+        except Exception as e:
+            if not (browser_driver and _is_closed_window_error(e)):
+                raise
+            logger.info("Browser closed, attempting to reopen...")
+            ensure_browser_driver()
+            outcome = _run_in_session(transcription, session_id)
+        result.success, result.message, result.action, result.parser = outcome
+    except Exception as e:
+        result.error = result.message = str(e)
+    finally:
+        _running.result = None
+    result.timings["execute_ms"] = (time.perf_counter() - execute_started) * 1000
+    if result.success and result.message not in ["Command processed", "CONTINUE", "EXIT"]:
+        result.display = _clean_response_message(result.message)
+    result.finish(started)
+    logger.info(f"Command '{transcription}' -> {result.action or 'unknown'} "
+                f"({'ok' if result.success else 'failed'}) in {result.timings['total_ms']:.0f} ms")
+    return result
+
+# Commands that may drive the browser, on top of those that open it.
+BROWSER_LANE_KEYWORDS = BROWSER_KEYWORDS + ['scroll', 'tab', 'page', 'click', 'play', 'pause', 'back', 'forward',
+                                            'refresh', 'reload', 'read', 'whatsapp', 'url', 'link']
+
+def command_lane(transcription, session_id=DEFAULT_SESSION):
+    # A yes/no to a highlighted element clicks it in the browser.
+    session = assistant_sessions.peek(session_id)
+    if session is not None and session.assistant.confirmation_manager.has_pending():
+        return BROWSER
+    text = transcription.lower()
+    if is_exit_command(text) or any(keyword in text for keyword in BROWSER_LANE_KEYWORDS):
+        return BROWSER
+    return COMMANDS
+
+def dispatch_command(transcription, session_id=DEFAULT_SESSION, require_browser=False):
+    # execute_command in its lane; raises LaneFull when that lane is at its limit.
+    return lane_executor.submit(command_lane(transcription, session_id), execute_command,
+                                transcription, session_id, require_browser)
+
 def start_voice_listening():
-    global is_listening
+    global is_listening, vosk_stream
     if is_listening:
         return
     is_listening = True
     logger.info("Starting voice recognition...")
+    if vosk_stream is not None:
+        vosk_stream.close()
+    vosk_stream = None
+    if ENABLE_STREAMING_STT:
+        whisper_online = WHISPER_AVAILABLE and connectivity_monitor.is_online()
+        if not whisper_online:
+            vosk_stream = VoskStream(on_partial=_broadcast_partial_transcription)
+            logger.info("Streaming Vosk STT enabled (partial results over /ws)")
     def voice_thread():
         try:
-            stream_microPhone(process_voice_input, buffer_seconds=3)
+            stream_microPhone(process_voice_input, buffer_seconds=3, streaming_stt=vosk_stream,
+                              preprocessor=None if vosk_stream is not None else audio_preprocessor)
         except Exception as e:
             logger.error(f"Voice recognition error: {e}")
         finally:
@@ -303,8 +472,20 @@ def start_voice_listening():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global event_loop, async_gemini
+    event_loop = asyncio.get_running_loop()
     initialize_system()
+    if ENABLE_ANSWER_STREAMING:
+        set_answer_listener(_broadcast_answer_chunk)
+    if HTTPX_AVAILABLE:
+        async_gemini = AsyncGeminiAssistant()
     yield
+    if async_gemini:
+        await async_gemini.aclose()
+    connectivity_monitor.stop()
+    if stt_worker:
+        stt_worker.stop(timeout=1)
+    lane_executor.shutdown()
     if browser_driver:
         try:
             browser_driver.quit()
@@ -337,6 +518,30 @@ async def get_status():
         "voice_listening": is_listening,
         "browser_enabled": browser_driver is not None,
         "system_controller": system_controller is not None,
+        "whisper": whisper_service.status() if WHISPER_AVAILABLE else {"state": "unavailable"},
+        "network": connectivity_monitor.status(),
+        "timestamp": time.time()
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        "stt_queue": stt_worker.stats() if stt_worker else None,
+        "preprocessing": audio_preprocessor.stats(),
+        "parse_cache": get_parse_cache().stats() if get_parse_cache() else None,
+        "parse_speculation": get_speculation_log().stats(),
+        "gemini_stream": stream_stats.stats(),
+        "gemini_breaker": gemini_breaker.stats(),
+        "intent_router": intent_router.stats(),
+        "assistant_sessions": assistant_sessions.stats(),
+        "command_lanes": lane_executor.stats(),
+        "jobs": job_manager.stats(),
+        "websocket": manager.stats(),
+        "audio_queue": {
+            "depth": audio_queue.qsize(),
+            "max_blocks": audio_queue.maxsize,
+            "dropped_blocks": audio_queue_stats["dropped_blocks"],
+        },
         "timestamp": time.time()
     }
 
@@ -357,59 +562,20 @@ async def stop_voice():
 
 @app.post("/command")
 async def process_command(command: VoiceCommand):
-    global browser_driver, system_controller
     try:
-        if system_controller:
-            needs_browser = any(keyword in command.command.lower() for keyword in 
-                              ['search', 'browser', 'web', 'google', 'youtube', 'website', 'download', 'open website'])
-            
-            if needs_browser:
-                if not ensure_browser_driver():
-                    return CommandResponse(
-                        success=False,
-                        message="Failed to initialize browser. Please check browser installation."
-                    )
-            
-            if browser_driver:
-                try:
-                    success, message = process_voice_command_smart(browser_driver, system_controller, command.command)
-                    result_message = _clean_response_message(message) if success else f"Error: {message}"
-                except Exception as e:
-                    if "closed window" in str(e).lower() or "window_handles" in str(e).lower():
-                        logger.info("Browser closed, attempting to reopen...")
-                        if ensure_browser_driver():
-                            success, message = process_voice_command_smart(browser_driver, system_controller, command.command)
-                            result_message = _clean_response_message(message) if success else f"Error: {message}"
-                        else:
-                            class DummyDriver:
-                                def get(self, url): pass
-                                def quit(self): pass
-                            dummy = DummyDriver()
-                            assistant = SmartAssistant(dummy, system_controller)
-                            success, message = assistant.process_command(command.command)
-                            result_message = _clean_response_message(message) if success else f"Error: {message}"
-                    else:
-                        result_message = f"Error: {str(e)}"
-                        success = False
-            else:
-                class DummyDriver:
-                    def get(self, url): pass
-                    def quit(self): pass
-                dummy = DummyDriver()
-                assistant = SmartAssistant(dummy, system_controller)
-                success, message = assistant.process_command(command.command)
-                result_message = _clean_response_message(message) if success else f"Error: {message}"
-            
-            return CommandResponse(
-                success=success,
-                message=result_message,
-                result={"output": result_message}
-            )
-        else:
-            return CommandResponse(
-                success=False,
-                message="System controller not initialized"
-            )
+        try:
+            future = dispatch_command(command.command, command.session_id, require_browser=True)
+        except LaneFull as e:
+            return CommandResponse(success=False, message=f"Busy: {e}")
+        # The event loop keeps serving /status and /ws while the command runs.
+        result = await asyncio.wrap_future(future)
+        if result.error:
+            logger.error(f"Error processing command: {result.error}")
+        return CommandResponse(
+            success=result.success,
+            message=result.display if result.success else f"Error: {result.message}",
+            result=result.to_dict()
+        )
     except Exception as e:
         logger.error(f"Error processing command: {e}")
         return CommandResponse(
@@ -417,12 +583,80 @@ async def process_command(command: VoiceCommand):
             message=f"Error: {str(e)}"
         )
 
+@app.post("/jobs")
+async def create_job(command: VoiceCommand):
+    # Returns at once; follow the job over /ws (job_update, job_progress) or GET /jobs/{id}.
+    try:
+        job = job_manager.submit(
+            command.command, command.session_id,
+            work=lambda: execute_command(command.command, command.session_id, require_browser=True).to_dict(),
+            schedule=lambda run: lane_executor.submit(command_lane(command.command, command.session_id), run))
+    except LaneFull as e:
+        return {"success": False, "message": f"Busy: {e}"}
+    return {"success": True, "job_id": job.id, "state": job.state}
+
+@app.get("/jobs")
+async def list_jobs():
+    return {
+        "jobs": [job.to_dict(steps=False) for job in job_manager.jobs()],
+        "stats": job_manager.stats(),
+        "timestamp": time.time()
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job {job_id}")
+    return job.to_dict()
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job {job_id}")
+    # A running job stops at its next step or wait.
+    return {"success": True, "job_id": job.id, "state": job.state,
+            "cancel_requested": job.cancel_requested.is_set()}
+
+@app.post("/query")
+async def query_assistant(command: VoiceCommand):
+    if async_gemini is None:
+        return CommandResponse(success=False, message="Async Gemini client not available - install httpx")
+    success, response = await async_gemini.query(command.command)
+    return CommandResponse(
+        success=success,
+        message=response,
+        result={"output": response}
+    )
+
+@app.post("/query/stream")
+async def query_assistant_stream(command: VoiceCommand):
+    if async_gemini is None:
+        return CommandResponse(success=False, message="Async Gemini client not available - install httpx")
+    started = time.perf_counter()
+    first = []
+    request_id = next_request_id()
+
+    async def forward(chunk):
+        if not first:
+            first.append(time.perf_counter() - started)
+        await manager.broadcast({"type": "answer_chunk", "request_id": request_id, "session_id": command.session_id,
+                                 "job_id": None, "text": chunk, "timestamp": time.time()})
+
+    success, response = await async_gemini.query(command.command, on_chunk=forward)
+    return CommandResponse(
+        success=success,
+        message=response,
+        result={"output": response, "request_id": request_id, "ttft_ms": first[0] * 1000 if first else None}
+    )
+
 @app.post("/browser/enable")
 async def enable_browser():
     global browser_driver
     try:
         if not browser_driver:
-            browser_driver = setup_driver()
+            browser_driver = share_driver(setup_driver())
             if browser_driver:
                 return {"success": True, "message": "Browser automation enabled"}
             else:
@@ -440,6 +674,7 @@ async def disable_browser():
         if browser_driver:
             browser_driver.quit()
             browser_driver = None
+            assistant_sessions.rebind_driver(None)
             return {"success": True, "message": "Browser automation disabled"}
         else:
             return {"success": True, "message": "Browser already disabled"}
@@ -447,6 +682,27 @@ async def disable_browser():
         logger.error(f"Error disabling browser: {e}")
         return {"success": False, "message": f"Error: {str(e)}"}
 
+@app.get("/sessions")
+async def list_sessions():
+    return {
+        "sessions": [session.state() for session in assistant_sessions.sessions()],
+        "stats": assistant_sessions.stats(),
+        "timestamp": time.time()
+    }
+
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    session = assistant_sessions.peek(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"No session {session_id}")
+    return session.state()
+
+@app.delete("/sessions/{session_id}")
+async def close_session(session_id: str):
+    if not assistant_sessions.close(session_id):
+        raise HTTPException(status_code=404, detail=f"No session {session_id}")
+    return {"success": True, "message": f"Session {session_id} closed"}
+
 @app.get("/system/info")
 async def get_system_info():
     if system_controller:
@@ -458,14 +714,24 @@ async def get_system_info():
         return {"success": False, "message": "System controller not initialized"}
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, topics: Optional[str] = None):
+    # ?topics=command_result,job_progress (or a subscribe message) limits what this client is sent.
+    await manager.connect(websocket, topics.split(",") if topics else None)
     try:
         while True:
             data = await websocket.receive_text()
             message = json.loads(data)
             if message.get("type") == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+                await manager.send_personal_message({"type": "pong"}, websocket)
+            elif message.get("type") in ("subscribe", "unsubscribe"):
+                change = manager.subscribe if message["type"] == "subscribe" else manager.unsubscribe
+                try:
+                    change(websocket, message.get("topics") or [])
+                except ValueError as e:
+                    await manager.send_personal_message({"type": "error", "message": str(e)}, websocket)
+                    continue
+                await manager.send_personal_message({"type": "subscribed", "topics": manager.topics(websocket),
+                                                     "excluded": manager.excluded_topics(websocket)}, websocket)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
@@ -5,4 +5,82 @@ PRIMARY_LANGUAGE = "english"
 
 USE_DEFAULT_PROFILE = True
 
-ENABLE_VOICE_FEEDBACK = True
\ No newline at end of file
+ENABLE_VOICE_FEEDBACK = True
+
+# Decode offline (Vosk) speech block by block and push partial results over /ws
+ENABLE_STREAMING_STT = True
+
+# Stream Gemini answers over /ws as "answer_chunk" messages while they are generated
+ENABLE_ANSWER_STREAMING = True
+
+# Whisper loads in the background on first use; warm start begins loading at startup when online
+WHISPER_MODEL_SIZE = "medium"  # tiny, base, small or medium
+WHISPER_WARM_START = True
+
+# auto picks ctranslate2 (faster-whisper) when installed, otherwise int8 on CPU
+# and transformers on CUDA/MPS; or set transformers, int8, onnx, ctranslate2
+WHISPER_BACKEND = "auto"
+WHISPER_BEAM_SIZE = 5
+# Clips up to this many seconds (typical commands) decode greedily
+WHISPER_FAST_MODE_SECONDS = 4.0
+
+# Set to ("127.0.0.1", 6001) to use the model kept warm by STT/whisper_worker.py
+WHISPER_WORKER_ADDRESS = None
+# Leave None: the worker then makes a random key per launch and shares it through STT/whisper_worker.key.
+# Set bytes here only when the worker runs where that file cannot be read (both sides must match)
+WHISPER_WORKER_AUTHKEY = None
+
+# Utterances waiting for speech-to-text; batched into one decode when they pile up
+STT_QUEUE_SIZE = 8
+STT_MAX_BATCH = 4
+STT_BATCH_WAIT = 0.05
+STT_DROP_POLICY = "drop_oldest"  # drop_oldest, drop_newest or block
+
+# Frame-level speech decision: "webrtc" (webrtcvad) or "energy_zcr" (energy + zero-crossing rate, lightest)
+VAD_MODE = "webrtc"
+
+# Remembered Gemini command parses (memory/data); "search cats on youtube" also answers "search dogs on youtube"
+PARSE_CACHE_ENABLED = True
+PARSE_CACHE_SIZE = 512
+PARSE_CACHE_TTL = 7 * 24 * 3600
+
+# Clear-cut commands ("open chrome", "scroll down") are parsed locally; the rest go to Gemini
+LOCAL_INTENT_ENABLED = True
+LOCAL_INTENT_THRESHOLD = 0.8
+
+# Gemini command prompt: "compact" action catalogue, or "full" for the long example catalogue
+COMMAND_PROMPT_STYLE = "compact"
+
+# Race Gemini against the local parsers; past this many seconds the local answer is used
+SPECULATIVE_PARSE = True
+SPECULATIVE_PARSE_BUDGET = 1.5
+
+# Gemini circuit breaker: open after this many failures in a row, probe again after this many seconds;
+# timeouts shrink to multiplier x p95 latency (never below the minimum) once enough calls are seen
+GEMINI_BREAKER_FAILURES = 3
+GEMINI_BREAKER_RESET = 30.0
+GEMINI_TIMEOUT_MULTIPLIER = 3.0
+GEMINI_MIN_TIMEOUT = 2.0
+
+# Record every Gemini exchange to this file (gzip JSON, saved at exit) for offline replay; None disables
+GEMINI_RECORD_PATH = None
+
+# Warm assistants kept per session (app context and confirmations survive between commands);
+# a session unused for this many seconds is dropped
+ASSISTANT_SESSION_IDLE_TIMEOUT = 3600
+ASSISTANT_MAX_SESSIONS = 16
+
+# /command runs off the event loop: this many threads for commands, plus one for the browser;
+# each lane turns commands away (busy) once this many are waiting or running.
+# A session runs one command at a time, so this is how many sessions (session_id) can run at once
+COMMAND_WORKERS = 4
+COMMAND_QUEUE_SIZE = 16
+
+# Finished jobs (POST /jobs) kept for GET /jobs/{id}
+JOB_HISTORY_SIZE = 100
+
+# /ws fan-out: messages queued per client; a client this far behind is "coalesce"d (superseded partials,
+# then the oldest message, dropped) or "disconnect"ed; a send slower than the timeout always disconnects
+WS_CLIENT_QUEUE_SIZE = 256
+WS_SEND_TIMEOUT = 5.0
+WS_SLOW_CLIENT_POLICY = "coalesce"
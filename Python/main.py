@@ -84,27 +84,37 @@ if __name__ == "__main__":
 
 from STT.RTMicroPhone import stream_microPhone
 try:
-    from STT.sttOffline import stt_vosk
-    VOSK_AVAILABLE = True
+    from STT.sttOffline import stt_vosk, vosk_model_available
+    VOSK_AVAILABLE = vosk_model_available()
+    if not VOSK_AVAILABLE:
+        print("⚠ Vosk offline STT not available: model folder not found")
 except Exception as e:
     print(f"⚠ Vosk offline STT not available: {e}")
     VOSK_AVAILABLE = False
     stt_vosk = None
-from STT.sttWhisper import stt_whisper
-from STT.NetworkStatus import check_server_connectivity
+from STT.sttWhisper import stt_whisper, whisper_service
+from STT.NetworkStatus import connectivity_monitor
 from Browser.DriverManager import setup_driver
 from Browser.IntelligentBrowser import process_voice_command
 from System.SystemController import SystemController
-from SmartAssistant import SmartAssistant, process_voice_command_smart
+from SmartAssistant import process_voice_command_smart
+from AssistantSession import assistant_sessions, DEFAULT_SESSION
 import queue
 
 browser_driver = None
 system_controller = None
 command_queue = queue.Queue()
 
+class DummyDriver:
+    # Stands in for the browser so system commands still run without one.
+    def get(self, url): pass
+    def quit(self): pass
+
+dummy_driver = DummyDriver()
+
 def stt_with_actions(audio_np):
     global browser_driver, system_controller
-    network_available = check_server_connectivity("8.8.8.8", 53, 3)
+    network_available = connectivity_monitor.is_online()
     if network_available and browser_driver:
         transcription = stt_whisper(audio_np)
     elif network_available:
@@ -117,13 +127,7 @@ def stt_with_actions(audio_np):
             if result == "EXIT":
                 browser_driver = None
         elif system_controller:
-            from Browser.IntelligentBrowser import EnhancedIntelligentBrowser
-            class DummyDriver:
-                def get(self, url): pass
-                def quit(self): pass
-            dummy = DummyDriver()
-            assistant = SmartAssistant(dummy, system_controller)
-            assistant.process_command(transcription)
+            assistant_sessions.get(DEFAULT_SESSION, dummy_driver, system_controller).process(transcription)
     return transcription
 
 def print_help():
@@ -159,9 +163,11 @@ def main():
     print("\nInitializing system...")
     system_controller = SystemController()
     print("System controller initialized")
-    network_available = check_server_connectivity("8.8.8.8", 53, 3)
+    network_available = connectivity_monitor.probe()
+    connectivity_monitor.start()
     if network_available:
         print("Network available - Using Whisper (GPU)")
+        whisper_service.start_loading()
         stt_function = stt_whisper
     elif VOSK_AVAILABLE:
         print("Network unavailable - Using Vosk (offline)")
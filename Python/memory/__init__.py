@@ -3,12 +3,14 @@ from .command_cache import CommandCache
 from .persistence import MemoryPersistence
 from .context_summary import ContextSummarizer
 from .memory_manager import MemoryManager
+from .parse_cache import ParseCache
 
 __all__ = [
     'CommandRingBuffer',
     'CommandCache', 
     'MemoryPersistence',
     'ContextSummarizer',
-    'MemoryManager'
+    'MemoryManager',
+    'ParseCache'
 ]
 
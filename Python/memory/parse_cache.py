@@ -0,0 +1,203 @@
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+SLOT_FIELDS = ('query', 'topic', 'text')
+SLOT_PLACEHOLDER = '{slot}'
+_PUNCTUATION = re.compile(r'[.,!?;:"]+')
+_SPACES = re.compile(r'\s+')
+# A slot containing these likely carries a second command or a platform ("cats on youtube"),
+# which the template would swallow, so it goes to Gemini instead.
+_STRUCTURE = re.compile(r'\b(and|then|also|aur|phir|fir|on|in|pe|par|for|to|from|with|using|at)\b')
+# "play video cats", "play next", "close tab": a slot led by one of these is a browser control,
+# a different action from the one the template was learned for.
+_CONTROL_WORDS = frozenset(('video', 'next', 'previous', 'pause', 'resume', 'stop', 'page', 'tab'))
+
+
+def normalize_key(text: str) -> str:
+    return _SPACES.sub(' ', _PUNCTUATION.sub(' ', text.lower())).strip()
+
+
+def _slot_paths(parse: Dict) -> List[Tuple[str, ...]]:
+    paths = [(field,) for field in SLOT_FIELDS if isinstance(parse.get(field), str)]
+    params = parse.get('params')
+    if isinstance(params, dict):
+        paths += [('params', field) for field in SLOT_FIELDS if isinstance(params.get(field), str)]
+    return paths
+
+
+def _get_path(parse: Dict, path: Tuple[str, ...]) -> Any:
+    for part in path:
+        parse = parse[part]
+    return parse
+
+
+def _set_path(parse: Dict, path: Tuple[str, ...], value: Any) -> None:
+    for part in path[:-1]:
+        parse = parse[part]
+    parse[path[-1]] = value
+
+
+class ParseCache:
+    def __init__(self, max_entries: int = 512, max_templates: int = 128, ttl_seconds: int = 86400,
+                 version: Optional[str] = None):
+        # Identifies the prompt and schema the parses came from; a saved cache from another is dropped.
+        self.version = version
+        self._max_entries = max_entries
+        self._max_templates = max_templates
+        self._ttl = ttl_seconds
+        # key -> (parse, stored_at)
+        self._entries: 'OrderedDict[str, Tuple[Dict, float]]' = OrderedDict()
+        # (prefix, suffix) -> (parse with placeholder, slot path, stored_at)
+        self._templates: 'OrderedDict[Tuple[str, str], Tuple[Dict, Tuple[str, ...], float]]' = OrderedDict()
+        self._templates_by_prefix: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.template_hits = 0
+        self.misses = 0
+        self._remote_seconds = 0.0
+        self._remote_calls = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[1] <= self._ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(entry[0])
+                del self._entries[key]
+            parse = self._from_template(key, now)
+            if parse is not None:
+                self.template_hits += 1
+                return parse
+            self.misses += 1
+            return None
+
+    def put(self, key: str, parse: Dict, latency: Optional[float] = None) -> None:
+        if not isinstance(parse, dict) or not key:
+            return
+        now = time.time()
+        with self._lock:
+            if latency is not None:
+                self._remote_seconds += latency
+                self._remote_calls += 1
+            self._entries[key] = (copy.deepcopy(parse), now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._learn_template(key, parse, now)
+
+    def _learn_template(self, key: str, parse: Dict, now: float) -> None:
+        # "search cats on youtube" -> {query: cats} gives the template "search {slot} on youtube".
+        padded = f' {key} '
+        for path in _slot_paths(parse):
+            slot = normalize_key(_get_path(parse, path))
+            if not slot or slot == key or slot.split(' ', 1)[0] in _CONTROL_WORDS:
+                continue
+            start = padded.find(f' {slot} ')
+            if start < 0 or padded.find(f' {slot} ', start + 1) >= 0:
+                continue
+            prefix = padded[:start].strip()
+            suffix = padded[start + len(slot) + 2:].strip()
+            if not prefix:
+                continue
+            template = copy.deepcopy(parse)
+            _set_path(template, path, SLOT_PLACEHOLDER)
+            self._templates[(prefix, suffix)] = (template, path, now)
+            self._templates.move_to_end((prefix, suffix))
+            self._templates_by_prefix.setdefault(prefix.split(' ', 1)[0], set()).add((prefix, suffix))
+            while len(self._templates) > self._max_templates:
+                self._drop_template(next(iter(self._templates)))
+            return
+
+    def _from_template(self, key: str, now: float) -> Optional[Dict]:
+        candidates = self._templates_by_prefix.get(key.split(' ', 1)[0])
+        if not candidates:
+            return None
+        best = None
+        for prefix, suffix in candidates:
+            if not key.startswith(prefix + ' '):
+                continue
+            rest = key[len(prefix) + 1:]
+            if suffix:
+                if not rest.endswith(' ' + suffix):
+                    continue
+                rest = rest[:-len(suffix) - 1]
+            # Prefer the most specific template that matches.
+            if rest and not _STRUCTURE.search(rest) and rest.split(' ', 1)[0] not in _CONTROL_WORDS and (best is None or len(prefix) + len(suffix) > len(best[0]) + len(best[1])):
+                best = (prefix, suffix, rest)
+        if best is None:
+            return None
+        template, path, stored_at = self._templates[best[:2]]
+        if now - stored_at > self._ttl:
+            self._drop_template(best[:2])
+            return None
+        self._templates.move_to_end(best[:2])
+        parse = copy.deepcopy(template)
+        _set_path(parse, path, best[2])
+        return parse
+
+    def _drop_template(self, template_key: Tuple[str, str]) -> None:
+        self._templates.pop(template_key, None)
+        first = template_key[0].split(' ', 1)[0]
+        bucket = self._templates_by_prefix.get(first)
+        if bucket is not None:
+            bucket.discard(template_key)
+            if not bucket:
+                del self._templates_by_prefix[first]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.template_hits + self.misses
+            mean_remote = self._remote_seconds / self._remote_calls if self._remote_calls else 0.0
+            return {
+                'version': self.version,
+                'entries': len(self._entries),
+                'templates': len(self._templates),
+                'hits': self.hits,
+                'template_hits': self.template_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.template_hits) / lookups if lookups else 0.0,
+                'mean_remote_ms': mean_remote * 1000,
+                'seconds_saved': (self.hits + self.template_hits) * mean_remote,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._templates.clear()
+            self._templates_by_prefix.clear()
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'version': self.version,
+                'entries': [[k, parse, ts] for k, (parse, ts) in self._entries.items()],
+                'templates': [[prefix, suffix, template, list(path), ts]
+                              for (prefix, suffix), (template, path, ts) in self._templates.items()],
+                'remote': [self._remote_seconds, self._remote_calls],
+            }
+
+    def from_dict(self, data: Dict) -> None:
+        self.clear()
+        if data.get('version') != self.version:
+            return
+        now = time.time()
+        with self._lock:
+            for key, parse, ts in data.get('entries', []):
+                if now - ts <= self._ttl:
+                    self._entries[key] = (parse, ts)
+            for prefix, suffix, template, path, ts in data.get('templates', []):
+                if now - ts <= self._ttl:
+                    self._templates[(prefix, suffix)] = (template, tuple(path), ts)
+                    self._templates_by_prefix.setdefault(prefix.split(' ', 1)[0], set()).add((prefix, suffix))
+            self._remote_seconds, self._remote_calls = data.get('remote', [0.0, 0])
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            while len(self._templates) > self._max_templates:
+                self._drop_template(next(iter(self._templates)))
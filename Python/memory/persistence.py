@@ -15,11 +15,15 @@ class MemoryPersistence:
         self._commands_file = self._storage_dir / "commands.json"
         self._cache_file = self._storage_dir / "cache.json"
         self._summary_file = self._storage_dir / "summary.json"
+        self._parse_cache_file = self._storage_dir / "parse_cache.json"
+        self._disagreements_file = self._storage_dir / "parse_disagreements.json"
         self._compress = compress
         if compress:
             self._commands_file = self._storage_dir / "commands.json.gz"
             self._cache_file = self._storage_dir / "cache.json.gz"
             self._summary_file = self._storage_dir / "summary.json.gz"
+            self._parse_cache_file = self._storage_dir / "parse_cache.json.gz"
+            self._disagreements_file = self._storage_dir / "parse_disagreements.json.gz"
     
     def save_commands(self, commands_data: list) -> bool:
         return self._write_json(self._commands_file, commands_data)
@@ -42,6 +46,20 @@ class MemoryPersistence:
         data = self._read_json(self._summary_file)
         return data if isinstance(data, dict) else {}
     
+    def save_parse_cache(self, parse_cache_data: Dict) -> bool:
+        return self._write_json(self._parse_cache_file, parse_cache_data)
+    
+    def load_parse_cache(self) -> Dict:
+        data = self._read_json(self._parse_cache_file)
+        return data if isinstance(data, dict) else {}
+    
+    def save_parse_disagreements(self, disagreements: list) -> bool:
+        return self._write_json(self._disagreements_file, disagreements)
+    
+    def load_parse_disagreements(self) -> list:
+        data = self._read_json(self._disagreements_file)
+        return data if isinstance(data, list) else []
+    
     def _write_json(self, filepath: Path, data: Any) -> bool:
         try:
             temp_file = filepath.with_suffix('.tmp')
@@ -73,7 +91,7 @@ class MemoryPersistence:
             return None
     
     def clear_all(self) -> None:
-        for f in [self._commands_file, self._cache_file, self._summary_file]:
+        for f in [self._commands_file, self._cache_file, self._summary_file, self._parse_cache_file, self._disagreements_file]:
             if f.exists():
                 f.unlink()
     
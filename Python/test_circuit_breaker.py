@@ -0,0 +1,20 @@
+from CircuitBreaker import CircuitBreaker, OPEN
+
+
+def test_only_2xx_latencies_size_the_timeout():
+    breaker = CircuitBreaker("test", min_samples=5, multiplier=2.0, min_timeout=0.1)
+    for _ in range(5):
+        breaker.record_status("command", 200, 1.0)
+    for _ in range(50):
+        breaker.record_status("command", 400, 0.01)
+        breaker.record_status("command", 403, 0.01)
+    assert breaker.timeout("command", 10) == 2.0
+    assert breaker.consecutive_failures == 0
+
+
+def test_rate_limits_open_the_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=3)
+    for _ in range(3):
+        breaker.record_status("command", 429, 0.01)
+    assert breaker.state == OPEN
+    assert breaker.stats()["latency"] == {}
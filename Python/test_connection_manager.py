@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from ConnectionManager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+    async def accept(self):
+        pass
+    async def send_text(self, text):
+        self.received.append(text)
+    async def close(self, code=1000):
+        pass
+
+
+def received_types(topics_change):
+    async def run():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket)
+        topics_change(manager, websocket)
+        for kind in ("voice_partial", "answer_chunk", "command_result"):
+            manager.publish({"type": kind})
+        await asyncio.sleep(0.01)
+        return websocket.received
+    return asyncio.run(run())
+
+
+def test_unsubscribe_while_subscribed_to_all_excludes_topic():
+    received = received_types(lambda manager, websocket: manager.unsubscribe(websocket, ["voice_partial"]))
+    assert received == ['{"type": "answer_chunk"}', '{"type": "command_result"}']
+
+
+def test_subscribe_all_clears_exclusions():
+    def change(manager, websocket):
+        manager.unsubscribe(websocket, ["voice_partial"])
+        manager.subscribe(websocket, ["*"])
+    assert len(received_types(change)) == 3
+
+
+def test_topics_must_be_a_list_of_strings():
+    for topics in ("voice_partial", [1, 2], {"type": "voice_partial"}):
+        with pytest.raises(ValueError):
+            received_types(lambda manager, websocket: manager.subscribe(websocket, topics))
@@ -0,0 +1,17 @@
+from FallbackParser import fallback_parser
+from TextNormalizer import preprocess_command
+
+
+def parse(text):
+    return fallback_parser.parse(text, preprocess_command(text))
+
+
+def test_hinglish_play_takes_platform_from_pe_prefix():
+    assert parse("youtube pe gaane chalao") == {"action": "play_media", "query": "gaane", "platform": "youtube"}
+    assert parse("spotify pe music bajao") == {"action": "play_media", "query": "music", "platform": "spotify"}
+
+
+def test_hinglish_play_defaults_to_youtube():
+    assert parse("kesariya bajao") == {"action": "play_media", "query": "kesariya", "platform": "youtube"}
+    # Only a known platform is taken out of the query.
+    assert parse("ghar pe music chalao")["query"] == "ghar pe music"
@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+
+from STT.InferenceQueue import InferenceWorker
+
+
+def test_blocked_submit_fails_when_worker_stops():
+    release = threading.Event()
+    worker = InferenceWorker(lambda items: release.wait(5) and items, max_queue=1, max_batch=1,
+                             batch_wait=0, drop_policy="block")
+    worker.submit("running")
+    worker.submit("queued")
+    errors = []
+
+    def blocked():
+        try:
+            worker.submit("blocked")
+        except RuntimeError as e:
+            errors.append(e)
+
+    caller = threading.Thread(target=blocked, daemon=True)
+    caller.start()
+    caller.join(0.1)
+    assert caller.is_alive()
+    worker.stop(timeout=0)
+    caller.join(1)
+    release.set()
+    assert not caller.is_alive()
+    assert len(errors) == 1
+
+
+def test_submit_after_stop_raises():
+    worker = InferenceWorker(lambda items: items)
+    worker.stop(timeout=1)
+    with pytest.raises(RuntimeError):
+        worker.submit("late")
@@ -0,0 +1,30 @@
+import pytest
+
+from GeminiAPI import GeminiAssistant
+from IntentRouter import IntentRouter
+
+
+@pytest.fixture(scope="module")
+def local_parse():
+    router, assistant = IntentRouter(enabled=True), GeminiAssistant()
+    return lambda text, installed_apps=None: router.local_parse(text, assistant, installed_apps)[0]
+
+
+@pytest.mark.parametrize("text", ["open notepad please", "open the door", "start recording", "what is python",
+                                  "play video cats", "play pause", "play next video"])
+def test_unclear_commands_go_to_gemini(local_parse, text):
+    assert local_parse(text) is None
+
+
+def test_known_apps_stay_local(local_parse):
+    assert local_parse("open notepad") == {"action": "open_app", "app_name": "notepad"}
+    assert local_parse("launch calculator")["app_name"] == "calculator"
+
+
+def test_installed_app_stays_local(local_parse):
+    assert local_parse("open obsidian") is None
+    assert local_parse("open obsidian", installed_apps={"obsidian": "obsidian"})["app_name"] == "obsidian"
+
+
+def test_play_media_still_local(local_parse):
+    assert local_parse("play kesariya")["action"] == "play_media"
@@ -0,0 +1,66 @@
+import ast
+import threading
+import time
+from pathlib import Path
+
+from Jobs import JobManager, CANCELLED, job_step, job_sleep
+
+JOB_HELPER_MODULES = ["Browser/IntelligentBrowser.py", "Browser/MediaPlayer.py",
+                      "Browser/ResearchDownloader.py", "SmartAssistant.py"]
+
+
+def run_inline(run):
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_cancel_inside_try_except_step():
+    manager = JobManager()
+    started = threading.Event()
+    reached = []
+
+    def work():
+        # Like the browser flows: waits and steps inside ``except Exception`` handlers.
+        started.set()
+        try:
+            job_sleep(5)
+        except Exception:
+            pass
+        reached.append("after sleep")
+        for url in ["https://example.com"]:
+            try:
+                job_step(f"Opening {url}")
+            except Exception:
+                continue
+            break
+        else:
+            reached.append("for-else fallback")
+        return {"success": True}
+
+    threads = []
+    job = manager.submit("download steam", "default", work, lambda run: threads.append(run_inline(run)))
+    assert started.wait(2)
+    cancelled_at = time.perf_counter()
+    manager.cancel(job.id)
+    threads[0].join(2)
+    assert job.state == CANCELLED
+    assert time.perf_counter() - cancelled_at < 1
+    assert reached == []
+
+
+def test_no_bare_except_around_job_helpers():
+    # A bare except catches JobCancelled (a BaseException) and carries on after a cancel.
+    root = Path(__file__).parent
+    for name in JOB_HELPER_MODULES:
+        tree = ast.parse((root / name).read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Try) or not any(handler.type is None for handler in node.handlers):
+                continue
+            calls = {call.func.id for statement in node.body for call in ast.walk(statement)
+                     if isinstance(call, ast.Call) and isinstance(call.func, ast.Name)}
+            methods = {call.func.attr for statement in node.body for call in ast.walk(statement)
+                       if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)}
+            assert not calls & {"job_step", "job_sleep"}, f"{name}:{node.lineno} bare except around a job helper"
+            assert not methods & {"search_and_respond", "open_website", "search_google", "click_first_result"}, \
+                f"{name}:{node.lineno} bare except around a call that can be cancelled"
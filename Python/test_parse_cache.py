@@ -0,0 +1,20 @@
+from memory import ParseCache
+
+
+def test_template_answers_same_shape():
+    cache = ParseCache()
+    cache.put("play kesariya", {"action": "play_media", "query": "kesariya", "platform": "youtube"})
+    assert cache.get("play tum hi ho") == {"action": "play_media", "query": "tum hi ho", "platform": "youtube"}
+
+
+def test_template_leaves_browser_controls_to_gemini():
+    cache = ParseCache()
+    cache.put("play kesariya", {"action": "play_media", "query": "kesariya", "platform": "youtube"})
+    for key in ("play video cats", "play next", "play next video", "play pause"):
+        assert cache.get(key) is None
+
+
+def test_no_template_learned_from_control_slot():
+    cache = ParseCache()
+    cache.put("play video cats", {"action": "play_media", "query": "video cats", "platform": "youtube"})
+    assert cache.get("play video dogs") is None